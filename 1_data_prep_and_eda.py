@@ -8,22 +8,38 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from aggregations import aggregate
+from chart_assets import (
+    CHART_ASSETS_DIR, DASHBOARD_WIDTH, PIL_AVAILABLE, WEB_WIDTHS, export_chart, pick_web_variant, write_chart_manifest,
+)
+from dataset import DATASET_DIR, PARTITION_COLUMNS, write_partitioned
+from outliers import MIN_GROUP_ROWS, OUTLIER_METHODS, fit_fences
+from profiling import StepProfiler, profiling_requested
+from sketches import build_grouped_sketches
+from title_normalization import TITLE_MAP_PATH, build_title_map, load_aliases, save_title_map
+
 
 sns.set_theme(style="whitegrid", palette="muted")
 plt.rcParams["figure.dpi"] = 120
 
+# Opt-in per-step time / memory report:  python 1_data_prep_and_eda.py --profile
+profiler = StepProfiler("1_data_prep_and_eda", enabled=profiling_requested())
+
 
 # ==============================================================================
 # SECTION 1 – LOAD
 # ==============================================================================
 
-RAW_DATA_PATH   = "DataScience_salaries_2025.csv"
-CLEAN_DATA_PATH = "clean_salary_dataset.csv"
+RAW_DATA_PATH       = "DataScience_salaries_2025.csv"
+CLEAN_DATA_PATH     = "clean_salary_dataset.csv"
+SKETCHES_PATH       = "salary_sketches.pkl"
+OUTLIER_REPORT_PATH = "outlier_report.csv"
 
 print("=" * 70)
 print(" CareerScout | Data Preparation & EDA")
 print("=" * 70)
 
+profiler.start("1 load")
 print(f"\n[1/5] Loading raw data from '{RAW_DATA_PATH}' ...")
 df = pd.read_csv(RAW_DATA_PATH)
 
@@ -34,6 +50,7 @@ print(f"      Raw dataset shape : {df.shape[0]:,} rows × {df.shape[1]} columns"
 # SECTION 2 – INITIAL INSPECTION
 # ==============================================================================
 
+profiler.start("2 inspection")
 print("\n[2/5] Running initial dataset inspection ...")
 
 
@@ -66,76 +83,111 @@ print(df["salary_in_usd"].describe())
 # SECTION 3 – DATA CLEANING  (Outlier Removal)
 # ==============================================================================
 
+profiler.start("3 cleaning")
 print("\n[3/5] Cleaning data ...")
 
-SALARY_CAP = 500_000   # USD – removes extreme outliers at the upper tail
+# Per-group fences (experience level × job title) instead of one global cap:
+# low-paid groups lose their implausible highs, executive salaries are kept.
+# Groups under MIN_GROUP_ROWS fall back to experience level, then to all rows.
+OUTLIER_METHOD = "iqr"   # or "mad"
+
+rows_before    = len(df)
+fences         = fit_fences(df, "salary_in_usd", method=OUTLIER_METHOD, min_rows=MIN_GROUP_ROWS)
+keep           = fences.keep(df, "salary_in_usd")
+outlier_report = fences.report(df, keep)
+df = df[keep].reset_index(drop=True)
+rows_after     = len(df)
+
+print(f"      Outlier fences                          : {OUTLIER_METHOD.upper()} × {OUTLIER_METHODS[OUTLIER_METHOD]} "
+      f"per experience level × job title (min {MIN_GROUP_ROWS} rows)")
+print(f"      Rows removed (outside group fences)     : {rows_before - rows_after:,}")
+print(f"      Clean dataset shape                     : {df.shape[0]:,} rows × {df.shape[1]} columns")
+print(f"      Salary range after cleaning             : ${df['salary_in_usd'].min():,} – ${df['salary_in_usd'].max():,}")
 
-rows_before = len(df)
-df = df[df["salary_in_usd"] <= SALARY_CAP].reset_index(drop=True)
-rows_after  = len(df)
+print("      Fence basis (groups):  " + "  ·  ".join(
+    f"{basis} {count:,}" for basis, count in outlier_report["basis"].value_counts().items()
+))
+print("      Most rows removed per group:")
+for (level, title), row in outlier_report[outlier_report["removed"] > 0].head(5).iterrows():
+    print(f"        • {level} · {title:<36} {row['removed']:>5,} of {row['rows']:>6,}  "
+          f"(${row['lower']:>9,.0f} – ${row['upper']:>9,.0f})")
 
-print(f"      Rows removed (salary > ${SALARY_CAP:,}) : {rows_before - rows_after:,}")
-print(f"      Clean dataset shape                     : {df.shape[0]:,} rows × {df.shape[1]} columns")
-print(f"      Max salary after cleaning               : ${df['salary_in_usd'].max():,}")
+
+# --- 3b. Job-title canonicalisation ------------------------------------------
+# Normalise spelling, apply the alias map (built-in + optional title_aliases.json)
+# and cluster rare titles, so the model's one-hot job_title block stays narrow.
+profiler.start("3b title canonicalisation")
+title_counts = df["job_title"].value_counts()
+title_map    = build_title_map(title_counts, aliases=load_aliases())
+canonical    = pd.Series(title_map).reindex(title_counts.index)
+
+n_raw, n_canonical = len(title_counts), canonical.nunique()
+print(f"\n      Job titles (raw → canonical)            : {n_raw:,} → {n_canonical:,}")
+print(f"      job_title one-hot width                 : {n_raw - 1:,} → {n_canonical - 1:,} columns "
+      f"({(1 - (n_canonical - 1) / max(n_raw - 1, 1)) * 100:.0f}% narrower)")
+
+merged = title_counts.groupby(canonical).agg(["size", "sum"]).sort_values("size", ascending=False)
+print("      Largest merged groups (raw titles · records):")
+for title, row in merged[merged["size"] > 1].head(5).iterrows():
+    print(f"        • {title:<40} {row['size']:>3} titles · {row['sum']:>6,} records")
 
 
 # ==============================================================================
 # SECTION 4 – EXPLORATORY DATA ANALYSIS  (GroupBy Summaries)
 # ==============================================================================
 
+profiler.start("4 groupby aggregates")
 print("\n[4/5] Running EDA groupby analyses ...")
 
+# One factorise + one vectorised pass for every grouping below
+GROUP_COLUMNS = ["job_title", "experience_level", "remote_ratio", "company_location"]
+salary_aggs   = aggregate(df, "salary_in_usd", GROUP_COLUMNS)
+
 # --- 4a. Average salary by job title (Top 10) --------------------------------
-top_jobs_by_salary = (
-    df.groupby("job_title")["salary_in_usd"]
-    .mean()
-    .sort_values(ascending=False)
-    .head(10)
-    .round(0)
-)
+top_jobs_by_salary = salary_aggs.top("job_title", "mean", n=10).round(0)
 print("\n── Top 10 Highest-Paying Job Titles (Average USD) ──────────────────────")
 print(top_jobs_by_salary.to_string())
 
 # --- 4b. Average salary by experience level ----------------------------------
-salary_by_experience = (
-    df.groupby("experience_level")["salary_in_usd"]
-    .mean()
-    .sort_values(ascending=False)
-    .round(0)
-)
+salary_by_experience = salary_aggs.top("experience_level", "mean", n=None).round(0)
 print("\n── Average Salary by Experience Level ──────────────────────────────────")
 print(salary_by_experience.to_string())
 print("  (EN = Entry, MI = Mid, SE = Senior, EX = Executive)")
 
 # --- 4c. Average salary by remote ratio --------------------------------------
-salary_by_remote = (
-    df.groupby("remote_ratio")["salary_in_usd"]
-    .mean()
-    .sort_values(ascending=False)
-    .round(0)
-)
+salary_by_remote = salary_aggs.top("remote_ratio", "mean", n=None).round(0)
 print("\n── Average Salary by Remote Ratio ──────────────────────────────────────")
 print(salary_by_remote.to_string())
 print("  (0 = On-site, 50 = Hybrid, 100 = Fully Remote)")
 
 # --- 4d. Average salary by company location (Top 10) -------------------------
-salary_by_location = (
-    df.groupby("company_location")["salary_in_usd"]
-    .mean()
-    .sort_values(ascending=False)
-    .head(10)
-    .round(0)
-)
+salary_by_location = salary_aggs.top("company_location", "mean", n=10).round(0)
 print("\n── Top 10 Highest-Paying Company Locations (Average USD) ───────────────")
 print(salary_by_location.to_string())
 
+# --- 4e. Salary quantile sketches (experience level × remote ratio) ----------
+# Medians / quartiles for the app and Figure 4 are served from these mergeable
+# sketches instead of full sorts of the salary column.
+profiler.start("4e quantile sketches")
+SKETCH_GROUPS   = ["experience_level", "remote_ratio"]
+salary_sketches = build_grouped_sketches(df, "salary_in_usd", SKETCH_GROUPS)
+
+print("\n── Salary Quartiles by Experience Level (sketch estimates) ─────────────")
+for level in ["EN", "MI", "SE", "EX"]:
+    q1, med, q3 = salary_sketches.merged(experience_level=[level]).quantile([0.25, 0.5, 0.75])
+    print(f"  {level}   Q1 ${q1:>10,.0f}   Median ${med:>10,.0f}   Q3 ${q3:>10,.0f}")
+
 
 # ==============================================================================
 # SECTION 5 – VISUALIZATIONS  (4 Figures)
 # ==============================================================================
 
+profiler.start("5 visualisations")
 print("\n[5/5] Generating visualisations (4 plots) ...")
 
+# Every figure is also exported as web (several widths) and print variants
+chart_variants = {}
+
 # ── Figure 1 : Salary Distribution Histogram ─────────────────────────────────
 fig1, ax1 = plt.subplots(figsize=(10, 5))
 
@@ -149,13 +201,14 @@ ax1.xaxis.set_major_formatter(
 
 plt.tight_layout()
 plt.savefig("fig1_salary_distribution.png")
+chart_variants["fig1_salary_distribution.png"] = export_chart(fig1, "fig1_salary_distribution.png")
 plt.show()
 print("      ✓ Figure 1 saved → fig1_salary_distribution.png")
 
 # ── Figure 2 : Experience Level Count (Bar Chart) ────────────────────────────
 fig2, ax2 = plt.subplots(figsize=(8, 5))
 
-exp_counts = df["experience_level"].value_counts()
+exp_counts = salary_aggs.top("experience_level", "count", n=None)
 exp_counts.plot(kind="bar", ax=ax2, color="coral", edgecolor="white")
 
 # Annotate bars with raw counts for quick reading
@@ -174,6 +227,7 @@ ax2.tick_params(axis="x", rotation=0)
 
 plt.tight_layout()
 plt.savefig("fig2_experience_level_count.png")
+chart_variants["fig2_experience_level_count.png"] = export_chart(fig2, "fig2_experience_level_count.png")
 plt.show()
 print("      ✓ Figure 2 saved → fig2_experience_level_count.png")
 
@@ -193,6 +247,7 @@ ax3.xaxis.set_major_formatter(
 
 plt.tight_layout()
 plt.savefig("fig3_top10_jobs.png")
+chart_variants["fig3_top10_jobs.png"] = export_chart(fig3, "fig3_top10_jobs.png")
 plt.show()
 print("      ✓ Figure 3 saved → fig3_top10_jobs.png")
 
@@ -202,16 +257,14 @@ exp_order = ["EN", "MI", "SE", "EX"]
 
 fig4, ax4 = plt.subplots(figsize=(10, 6))
 
-sns.boxplot(
-    data=df,
-    x="experience_level",
-    y="salary_in_usd",
-    order=exp_order,
-    hue="experience_level",
-    palette="Set2",
-    legend=False,
-    ax=ax4
-)
+# Box statistics come from the quantile sketches – no full sort per level
+box_stats = [
+    salary_sketches.merged(experience_level=[level]).box_stats(label=level)
+    for level in exp_order
+]
+boxes = ax4.bxp(box_stats, patch_artist=True, showfliers=True)
+for patch, color in zip(boxes["boxes"], sns.color_palette("Set2", len(exp_order))):
+    patch.set_facecolor(color)
 
 ax4.set_title("Salary vs. Experience Level", fontsize=14, fontweight="bold")
 ax4.set_xlabel("Experience Level  (EN=Entry · MI=Mid · SE=Senior · EX=Executive)")
@@ -222,17 +275,43 @@ ax4.yaxis.set_major_formatter(
 
 plt.tight_layout()
 plt.savefig("fig4_salary_vs_experience.png")
+chart_variants["fig4_salary_vs_experience.png"] = export_chart(fig4, "fig4_salary_vs_experience.png")
 plt.show()
 print("      ✓ Figure 4 saved → fig4_salary_vs_experience.png")
 
+write_chart_manifest(chart_variants)
+source_bytes = sum(entry.get("source_bytes", 0) for entry in chart_variants.values())
+web_bytes    = sum(pick_web_variant(entry["web"])["bytes"] for entry in chart_variants.values())
+print_bytes  = sum(entry["print"]["bytes"] for entry in chart_variants.values())
+print(f"      ✓ Chart variants → '{CHART_ASSETS_DIR}/'  (web widths {', '.join(map(str, WEB_WIDTHS))}"
+      f"{'' if PIL_AVAILABLE else ', uncompressed – pip install pillow'})")
+print(f"        dashboard {DASHBOARD_WIDTH} px : {web_bytes / 1024:,.0f} KB  ·  print : {print_bytes / 1024:,.0f} KB  "
+      f"·  original PNGs : {source_bytes / 1024:,.0f} KB")
+
 
 # ==============================================================================
 # SECTION 6 – EXPORT CLEANED DATASET
 # ==============================================================================
 
+profiler.start("6 export")
 df.to_csv(CLEAN_DATA_PATH, index=False)
 print(f"\n✅ Clean dataset exported → '{CLEAN_DATA_PATH}'")
+
+# Same rows partitioned by work_year: year-window reads touch only their files
+partitions = write_partitioned(df, DATASET_DIR, PARTITION_COLUMNS)
+print(f"✅ Partitioned dataset exported → '{DATASET_DIR}/'  ({len(partitions)} partitions by {', '.join(PARTITION_COLUMNS)})")
+
+save_title_map(title_map)
+print(f"✅ Title map exported → '{TITLE_MAP_PATH}'  ({n_raw:,} raw → {n_canonical:,} canonical)")
+
+outlier_report.to_csv(OUTLIER_REPORT_PATH)
+print(f"✅ Outlier report exported → '{OUTLIER_REPORT_PATH}'  ({rows_before - rows_after:,} rows removed "
+      f"across {(outlier_report['removed'] > 0).sum():,} groups)")
+
+pd.to_pickle(salary_sketches, SKETCHES_PATH)
+print(f"✅ Salary sketches exported → '{SKETCHES_PATH}'  ({len(salary_sketches.sketches)} group cells)")
 print(f"   Final shape : {df.shape[0]:,} rows × {df.shape[1]} columns")
+profiler.finish()
 print("\n" + "=" * 70)
 print(" EDA complete. Next step → run 2_model_training.py")
 print("=" * 70)
\ No newline at end of file
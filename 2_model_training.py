@@ -1,26 +1,60 @@
 
 
+import argparse
 import sys
 import time
 
+import numpy as np
 import pandas as pd
-import joblib
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, r2_score
 
+from artifacts import ARTIFACTS_DIR, MANIFEST_PATH, prune_bundles, publish_bundle, read_manifest
+from chunked_training import (
+    DEFAULT_CHUNK_ROWS,
+    evaluate_holdout,
+    fit_chunked,
+    holdout_mask,
+    scan_schema,
+    schema_columns,
+)
+from model_utils import (
+    CONTRIBUTION_PREFIX,
+    DEFAULT_HASH_BUCKETS,
+    FEATURE_COLUMNS,
+    LOCATION_COLUMNS,
+    LOCATION_ENCODINGS,
+    MIN_SEGMENT_ROWS,
+    SEGMENT_DIMENSIONS,
+    build_prediction_table,
+    encode_profiles,
+    fit_target_maps,
+    hash_location_features,
+    out_of_fold_target_features,
+    segment_name,
+    segment_values,
+    target_location_features,
+)
+from dataset import DATASET_DIR, read_dataset
+from disk_cache import cache_key
+from profiling import StepProfiler, profiling_requested
+from sampling import sample_size_for_budget, stratified_sample
+from title_normalization import canonicalize, load_title_map
 
 
 CLEAN_DATA_PATH   = "clean_salary_dataset.csv"
-MODEL_OUTPUT_PATH = "salary_predictor.pkl"
-COLS_OUTPUT_PATH  = "model_columns.pkl"
 
-FEATURE_COLUMNS   = ["experience_level", "job_title", "remote_ratio"]
 TARGET_COLUMN     = "salary_in_usd"
 
 TEST_SIZE         = 0.20
 RANDOM_STATE      = 42
 
+TOTAL_STEPS       = 7
+
+# Per-step time / memory recorder; enabled by --profile (no-op otherwise)
+profiler          = StepProfiler("2_model_training")
+
 
 # ==============================================================================
 # HELPERS
@@ -28,6 +62,7 @@ RANDOM_STATE      = 42
 
 def section(title: str) -> None:
     """Print a clearly visible section header to the terminal."""
+    profiler.start(title)
     print(f"\n{'=' * 70}")
     print(f"  {title}")
     print(f"{'=' * 70}")
@@ -35,28 +70,175 @@ def section(title: str) -> None:
 
 def step(number: int, message: str) -> None:
     """Print a numbered progress step."""
-    print(f"\n[{number}/6] {message}")
+    profiler.start(f"{number} {message.rstrip(' .')}")
+    print(f"\n[{number}/{TOTAL_STEPS}] {message}")
+
+
+def year_window(text: str) -> tuple:
+    """'2024' → (2024, 2024), '2022-2024' → (2022, 2024)."""
+    first, _, last = text.partition("-")
+    try:
+        window = (int(first), int(last or first))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YEAR or FROM-TO, got '{text}'")
+    if window[0] > window[1]:
+        raise argparse.ArgumentTypeError(f"empty year window '{text}'")
+    return window
+
+
+def positive(kind):
+    """argparse type: `kind` (int / float) that must be > 0."""
+    def parse(text: str):
+        try:
+            value = kind(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected a number, got '{text}'")
+        if not value > 0:               # also rejects nan
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got '{text}'")
+        return value
+    return parse
+
+
+def parse_args() -> argparse.Namespace:
+    """Command-line options for the optional training modes."""
+    parser = argparse.ArgumentParser(description="CareerScout model training pipeline")
+    parser.add_argument(
+        "--compare-raw-titles", action="store_true",
+        help="also fit a model on raw (non-canonical) job titles and report width / MAE / latency",
+    )
+    parser.add_argument(
+        "--location-encoding", choices=LOCATION_ENCODINGS, default="none",
+        help="add company_location / employee_residence as hashed buckets or out-of-fold target means",
+    )
+    parser.add_argument(
+        "--hash-buckets", type=int, default=DEFAULT_HASH_BUCKETS,
+        help=f"buckets per location column for --location-encoding hash (default {DEFAULT_HASH_BUCKETS})",
+    )
+    parser.add_argument(
+        "--segments", nargs="+", choices=SEGMENT_DIMENSIONS, default=[],
+        help=f"also fit one forest per segment value with ≥ {MIN_SEGMENT_ROWS:,} rows (e.g. --segments region work_year)",
+    )
+    parser.add_argument(
+        "--years", type=year_window, metavar="FROM[-TO]",
+        help=f"train on these work_year values only, reading just their partitions from '{DATASET_DIR}/'",
+    )
+    fast = parser.add_mutually_exclusive_group()
+    fast.add_argument(
+        "--sample-size", type=positive(int),
+        help="fast retrain: fit on a stratified sample of this many training rows (not published)",
+    )
+    fast.add_argument(
+        "--time-budget", type=positive(float), metavar="SECONDS",
+        help="fast retrain: pick the largest stratified sample that fits in about this many seconds",
+    )
+    parser.add_argument(
+        "--chunked", action="store_true",
+        help="stream the clean CSV in partitions and grow the forest incrementally (bounded memory)",
+    )
+    parser.add_argument(
+        "--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+        help=f"rows per partition for --chunked (default {DEFAULT_CHUNK_ROWS:,})",
+    )
+    parser.add_argument(
+        "--compare-in-memory", action="store_true",
+        help="with --chunked: also fit the usual in-memory forest and score both on the same holdout",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="record wall / CPU time and tracemalloc / RSS memory per step and write a JSON report to profiles/",
+    )
+    parser.add_argument(
+        "--keep-bundles", type=int, default=3,
+        help="number of published model bundles to keep on disk (default 3)",
+    )
+    args = parser.parse_args()
+    if args.chunked and (args.location_encoding == "target" or args.segments or args.compare_raw_titles):
+        parser.error("--chunked supports --location-encoding none/hash only, without --segments / --compare-raw-titles")
+    if args.chunked and args.years:
+        parser.error("--years reads whole partitions into memory; it cannot be combined with --chunked")
+    if args.chunked and (args.sample_size is not None or args.time_budget is not None):
+        parser.error("--chunked trains on every row and publishes; it cannot be combined with --sample-size / --time-budget")
+    if args.segments and (args.sample_size is not None or args.time_budget is not None):
+        parser.error("fast retrains are not published; --segments cannot be combined with --sample-size / --time-budget")
+    return args
+
+
+def make_forest() -> RandomForestRegressor:
+    """The production forest configuration."""
+    return RandomForestRegressor(
+        n_estimators=100,       # 100 decision trees in the forest
+        random_state=RANDOM_STATE,
+        n_jobs=-1               # use all available CPU cores
+    )
+
+
+def training_fingerprint(feature_config: dict, title_map: dict) -> str:
+    """Hash of the training configuration besides the rows: encoding, title map, forest, split."""
+    return cache_key(
+        feature_config["location_encoding"],
+        feature_config.get("hash_buckets"),
+        tuple(sorted(title_map.items())),
+        tuple(sorted(make_forest().get_params().items())),
+        TEST_SIZE,
+        RANDOM_STATE,
+    )
+
+
+def full_model_scores(rows: int, years: tuple, fingerprint: str):
+    """MAE / R² of the newest published full-data bundle with the same rows and configuration, or None."""
+    years = list(years) if years else None
+    for entry in reversed(read_manifest().get("history", [])):
+        if (entry.get("rows") == rows and entry.get("years") == years
+                and entry.get("config") == fingerprint and "mae" in entry):
+            return entry["mae"], entry["r2"]
+    return None
+
+
+def single_prediction_latency(
+    model,
+    model_columns: list,
+    profile: pd.DataFrame,
+    feature_config: dict = None,
+    repeats: int = 50,
+) -> float:
+    """Average seconds to encode + predict one profile, as the app does per request."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(encode_profiles(profile, model_columns, feature_config))
+    return (time.perf_counter() - start) / repeats
 
 
 # ==============================================================================
 # MAIN PIPELINE
 # ==============================================================================
 
-def main() -> None:
+def main(args: argparse.Namespace) -> None:
+    profiler.enabled = args.profile or profiling_requested([])
+    if args.chunked:
+        main_chunked(args)
+        return
 
     print("\n" + "=" * 70)
     print("  CareerScout | Model Training Pipeline")
     print("=" * 70)
 
     # ── STEP 1 : Loading Data ────────────────────────────────────────────────────
-    step(1, f"Loading clean dataset from '{CLEAN_DATA_PATH}' ...")
+    source = f"'{DATASET_DIR}/' (work_year {args.years[0]}–{args.years[1]})" if args.years else f"'{CLEAN_DATA_PATH}'"
+    step(1, f"Loading clean dataset from {source} ...")
 
     try:
-        df = pd.read_csv(CLEAN_DATA_PATH)
+        if args.years:
+            # Only the partitions inside the window are read
+            df = read_dataset({"work_year": range(args.years[0], args.years[1] + 1)}, fallback_csv=CLEAN_DATA_PATH)
+        else:
+            df = pd.read_csv(CLEAN_DATA_PATH)
     except FileNotFoundError:
         print(f"\n  ❌  ERROR: '{CLEAN_DATA_PATH}' not found.")
         print("       Run 1_data_prep_and_eda.py first to generate it.")
         sys.exit(1)
+    if df.empty:
+        print(f"\n  ❌  ERROR: no rows with work_year {args.years[0]}–{args.years[1]}.")
+        sys.exit(1)
 
     print(f"     Rows loaded : {len(df):,}")
     print(f"     Columns     : {list(df.columns)}")
@@ -68,6 +250,17 @@ def main() -> None:
     X = df[FEATURE_COLUMNS].copy()
     y = df[TARGET_COLUMN].copy()
 
+    # Canonical job titles (title_map.json from 1_data_prep_and_eda.py)
+    title_map = load_title_map()
+    X_raw     = X.copy()
+    if title_map:
+        X["job_title"] = canonicalize(X["job_title"], title_map)
+        print(f"     Job titles canonicalised : {X_raw['job_title'].nunique()} → {X['job_title'].nunique()}")
+    else:
+        print("     ⚠  title_map.json not found – training on raw job titles.")
+    job_titles = sorted(X["job_title"].unique().tolist())
+    profiles   = X[["experience_level", "job_title"]].copy()     # strata for --sample-size
+
     print(f"     Features (X) : {FEATURE_COLUMNS}")
     print(f"     Target   (y) : '{TARGET_COLUMN}'")
     print(f"     X shape      : {X.shape}")
@@ -81,31 +274,53 @@ def main() -> None:
     step(3, "Encoding categorical features with pd.get_dummies ...")
 
     X = pd.get_dummies(X, drop_first=True)
+    base_width = X.shape[1]
+
+    # Train / test rows are fixed before any target-dependent encoding, so the
+    # test rows never inform the features they are scored on (split in step 5)
+    train_index, test_index = train_test_split(df.index, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+    # Location columns get a fixed-width encoding instead of one column per country
+    feature_config = {"location_encoding": args.location_encoding}
+    if args.location_encoding == "hash":
+        feature_config["hash_buckets"] = args.hash_buckets
+        X = pd.concat([X, hash_location_features(df[LOCATION_COLUMNS], args.hash_buckets)], axis=1)
+    elif args.location_encoding == "target":
+        # Training rows: out-of-fold means; test rows: the train-only maps that get published
+        train_locations = df.loc[train_index, LOCATION_COLUMNS]
+        maps, prior = fit_target_maps(train_locations, y.loc[train_index])
+        feature_config.update(target_maps=maps, target_prior=prior)
+        target_block = pd.concat([
+            out_of_fold_target_features(train_locations, y.loc[train_index], random_state=RANDOM_STATE),
+            target_location_features(df.loc[test_index, LOCATION_COLUMNS], maps, prior),
+        ]).loc[df.index]
+        X = pd.concat([X, target_block], axis=1)
+
+    if args.location_encoding != "none":
+        n_countries = sum(df[column].nunique() for column in LOCATION_COLUMNS)
+        print(f"     Location encoding            : {args.location_encoding} "
+              f"({n_countries} location values → {X.shape[1] - base_width} columns)")
 
     print(f"     Encoded feature matrix shape : {X.shape}")
     print(f"     Total columns after encoding : {X.shape[1]}")
    
 
 
-    # ── STEP 4 : Save Encoded Column Names ───────────────────────────────────
-    step(4, f"Saving encoded column names → '{COLS_OUTPUT_PATH}' ...")
+    # ── STEP 4 : Encoded Column Names ────────────────────────────────────────
+    step(4, "Recording encoded column names (published with the model bundle) ...")
 
     model_columns = list(X.columns)
-    joblib.dump(model_columns, COLS_OUTPUT_PATH)
 
     
-    print(f"     ✓ {len(model_columns)} column names saved.")
+    print(f"     ✓ {len(model_columns)} column names recorded.")
     print(f"       Sample columns : {model_columns[:5]} ...")
 
 
     # ── STEP 5 : Train / Test Split ───────────────────────────────────────────
     step(5, f"Splitting data  ({int((1-TEST_SIZE)*100)}% train / {int(TEST_SIZE*100)}% test, random_state={RANDOM_STATE}) ...")
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y,
-        test_size=TEST_SIZE,
-        random_state=RANDOM_STATE
-    )
+    X_train, X_test = X.loc[train_index], X.loc[test_index]
+    y_train, y_test = y.loc[train_index], y.loc[test_index]
 
     print(f"     Training samples : {len(X_train):,}")
     print(f"     Testing  samples : {len(X_test):,}")
@@ -114,17 +329,50 @@ def main() -> None:
     # ── STEP 6 : Training Model ──────────────────────────────────────────────────
     step(6, "Training RandomForestRegressor  (this may take 30–60 seconds) ...")
 
-    model = RandomForestRegressor(
-        n_estimators=100,       # 100 decision trees in the forest
-        random_state=RANDOM_STATE,
-        n_jobs=-1               # use all available CPU cores
-    )
+    # Fast-retrain mode: stratified sample of the training rows, every title kept
+    fast_retrain = args.sample_size is not None or args.time_budget is not None
+    fit_index    = X_train.index
+    if fast_retrain:
+        sample_size = args.sample_size if args.sample_size is not None else sample_size_for_budget(
+            make_forest, X_train, y_train, args.time_budget, profiles.loc[X_train.index], RANDOM_STATE,
+        )
+        fit_index = stratified_sample(profiles.loc[X_train.index], sample_size, random_state=RANDOM_STATE)
+        print(f"     Fast retrain on a stratified sample : {len(fit_index):,} of {len(X_train):,} rows "
+              f"({profiles.loc[fit_index].groupby(['experience_level', 'job_title']).ngroups:,} strata)")
 
-    start = time.time()
-    model.fit(X_train, y_train)
-    elapsed = time.time() - start
+    model = make_forest()
 
-    print(f"     ✓ Training complete in {elapsed:.1f}s")
+    start = time.time()
+    model.fit(X_train.loc[fit_index], y_train.loc[fit_index])
+    elapsed_fit = time.time() - start
+
+    print(f"     ✓ Training complete in {elapsed_fit:.1f}s")
+
+
+    # ── STEP 7 : Precomputing Prediction Intervals + Explanations ───────────────
+    step(7, "Precomputing p10/p50/p90 and feature contributions for every (experience, title, remote) profile ...")
+
+    prediction_table = None
+    if fast_retrain:
+        print("     ⚠  Skipped – fast-retrain models are not published.")
+    elif args.location_encoding != "none":
+        # Locations are open-ended inputs, so the app computes intervals live instead
+        print("     ⚠  Skipped – location features are enabled; intervals are computed per request.")
+    else:
+        start = time.time()
+        prediction_table = build_prediction_table(
+            model,
+            model_columns,
+            job_titles=job_titles,
+        )
+        elapsed = time.time() - start
+
+        print(f"     ✓ {len(prediction_table):,} profiles precomputed in {elapsed:.1f}s")
+        print(f"       Median p10–p90 width : ${(prediction_table['p90'] - prediction_table['p10']).median():,.0f}")
+        contributions = prediction_table.filter(like=CONTRIBUTION_PREFIX)
+        print("       Mean |contribution| per feature:")
+        for column, value in contributions.abs().mean().sort_values(ascending=False).items():
+            print(f"         • {column[len(CONTRIBUTION_PREFIX):]:<20} ${value:>10,.0f}")
 
 
     # ── EVALUATING : MAE & R² ───────────────────────────────────────────────────
@@ -155,23 +403,231 @@ def main() -> None:
         print(f"    {feat:<45} {score:.4f}  {bar}")
 
 
+    # ── OPTIONAL : Canonical vs. Raw Job Titles ─────────────────────────────────
+    if args.compare_raw_titles:
+        section("Title Canonicalisation Impact")
+
+        X_raw_encoded = pd.get_dummies(X_raw, drop_first=True)
+        raw_model = make_forest()
+
+        start = time.time()
+        raw_model.fit(X_raw_encoded.loc[X_train.index], y_train)
+        raw_elapsed = time.time() - start
+        raw_mae = mean_absolute_error(y_test, raw_model.predict(X_raw_encoded.loc[X_test.index]))
+
+        profile = X_raw.iloc[[0]].copy()
+        raw_latency = single_prediction_latency(raw_model, list(X_raw_encoded.columns), profile)
+        profile["job_title"] = canonicalize(profile["job_title"], title_map)
+        profile[LOCATION_COLUMNS] = df[LOCATION_COLUMNS].iloc[[0]].to_numpy()
+        latency = single_prediction_latency(model, model_columns, profile, feature_config)
+
+        print(f"\n  {'':<24}{'Raw titles':>14}{'Canonical':>14}")
+        print(f"  {'Feature width':<24}{X_raw_encoded.shape[1]:>14,}{len(model_columns):>14,}")
+        print(f"  {'Fit time (s)':<24}{raw_elapsed:>14.1f}{elapsed_fit:>14.1f}")
+        print(f"  {'MAE (USD)':<24}{raw_mae:>14,.0f}{mae:>14,.0f}")
+        print(f"  {'Predict latency (ms)':<24}{raw_latency * 1000:>14.2f}{latency * 1000:>14.2f}")
+
+
+    # ── FAST RETRAIN : Accuracy Gap vs. Full Model ──────────────────────────────
+    if fast_retrain:
+        section("Fast-Retrain Gap  (same test split)")
+
+        # Newest published full-data bundle with the same rows and configuration, else fit one now
+        full_scores = full_model_scores(int(len(df)), args.years, training_fingerprint(feature_config, title_map))
+        if full_scores is not None:
+            full_mae, full_r2 = full_scores
+            full_fit, source  = None, "published bundle"
+        else:
+            full_model = make_forest()
+            start = time.time()
+            full_model.fit(X_train, y_train)
+            full_fit = time.time() - start
+            full_pred = full_model.predict(X_test)
+            full_mae, full_r2 = mean_absolute_error(y_test, full_pred), r2_score(y_test, full_pred)
+            source = "fitted now"
+            del full_model
+
+        print(f"\n  {'':<24}{'Sample':>14}{'Full':>14}{'Gap':>14}")
+        print(f"  {'Training rows':<24}{len(fit_index):>14,}{len(X_train):>14,}")
+        print(f"  {'Fit time (s)':<24}{elapsed_fit:>14.1f}" + (f"{full_fit:>14.1f}" if full_fit is not None else f"{'–':>14}"))
+        print(f"  {'MAE (USD)':<24}{mae:>14,.0f}{full_mae:>14,.0f}{mae - full_mae:>+14,.0f}")
+        print(f"  {'R²':<24}{r2:>14.4f}{full_r2:>14.4f}{r2 - full_r2:>+14.4f}")
+        print(f"\n  Full-model scores: {source}")
+
+
+    # ── OPTIONAL : Segment-Specific Models ──────────────────────────────────────
+    segment_models = {}
+    if args.segments:
+        section("Segment Models")
+
+        # Same encoded columns and train/test split as the global model, so a
+        # segment model is a drop-in replacement for its rows.
+        global_pred = pd.Series(y_pred, index=X_test.index)
+        print(f"\n  {'Segment':<36}{'Train':>8}{'Fit (s)':>9}{'MAE':>11}{'Global MAE':>12}")
+        for dimension in args.segments:
+            values = segment_values(df, dimension)
+            for value, count in values.value_counts().sort_index().items():
+                name = segment_name(dimension, value)
+                if count < MIN_SEGMENT_ROWS:
+                    print(f"  {name:<36}{count:>8,}  skipped (< {MIN_SEGMENT_ROWS:,} rows)")
+                    continue
+
+                train_idx = X_train.index[values.loc[X_train.index] == value]
+                test_idx  = X_test.index[values.loc[X_test.index] == value]
+
+                segment_model = make_forest()
+                start = time.time()
+                segment_model.fit(X_train.loc[train_idx], y_train.loc[train_idx])
+                seg_elapsed = time.time() - start
+
+                seg_mae    = mean_absolute_error(y_test.loc[test_idx], segment_model.predict(X_test.loc[test_idx]))
+                global_mae = mean_absolute_error(y_test.loc[test_idx], global_pred.loc[test_idx])
+                segment_models[name] = segment_model
+                print(f"  {name:<36}{len(train_idx):>8,}{seg_elapsed:>9.1f}{seg_mae:>11,.0f}{global_mae:>12,.0f}")
+
+        print(f"\n  ✓ {len(segment_models)} segment model(s) trained")
+
+
     # ── SAVING MODEL ────────────────────────────────────────────────────────────
+    if fast_retrain:
+        print("\n  Fast retrain – nothing published. Rerun without --sample-size / --time-budget to publish.")
+        profiler.finish()
+        return
+
+    save_artefacts(
+        args, model, model_columns, feature_config, prediction_table, title_map,
+        metadata={
+            "mae": round(float(mae), 2), "r2": round(float(r2), 4), "rows": int(len(df)),
+            "train_rows": int(len(fit_index)),
+            "config": training_fingerprint(feature_config, title_map),
+            **({"years": list(args.years)} if args.years else {}),
+        },
+        segment_models=segment_models,
+    )
+    profiler.finish()
+
+
+def save_artefacts(
+    args: argparse.Namespace,
+    model,
+    model_columns: list,
+    feature_config: dict,
+    prediction_table,
+    title_map: dict,
+    metadata: dict,
+    segment_models: dict = None,
+) -> str:
+    """Publish a new bundle, prune old ones and print the summary; returns the version."""
     section("Saving Artefacts")
 
-    joblib.dump(model, MODEL_OUTPUT_PATH)
-    print(f"\n  ✓ Trained model saved  → '{MODEL_OUTPUT_PATH}'")
-    print(f"  ✓ Column names saved   → '{COLS_OUTPUT_PATH}'")
+    # Immutable, versioned bundle + atomic manifest update → the running app
+    # picks it up and hot-swaps without a restart.
+    version = publish_bundle(
+        {
+            "model":            model,
+            "model_columns":    model_columns,
+            "feature_config":   feature_config,
+            "prediction_table": prediction_table,
+            "title_map":        title_map,
+        },
+        metadata=metadata,
+        segments=segment_models,
+    )
+    removed = prune_bundles(keep=args.keep_bundles)
+
+    print(f"\n  ✓ Model bundle published → '{ARTIFACTS_DIR}/{version}/'")
+    print(f"  ✓ Manifest updated       → '{MANIFEST_PATH}'  (location encoding: {args.location_encoding})")
+    if prediction_table is None:
+        print("  ✓ No prediction table   → intervals are computed live by the app")
+    if segment_models:
+        print(f"  ✓ Segment models         → {len(segment_models)} in '{ARTIFACTS_DIR}/{version}/segments/'")
+    if removed:
+        print(f"  ✓ Pruned old bundles     → {', '.join(removed)}")
 
     print(f"""
   ┌─────────────────────────────────────────────────────────────┐
-  │  Pipeline complete! Two files are ready for the app:        │
+  │  Pipeline complete! New model version published:            │
   │                                                             │
-  │    📦  {MODEL_OUTPUT_PATH:<51}│
-  │    📋  {COLS_OUTPUT_PATH:<51}│
+  │    📦  {version:<51}│
+  │    📋  {MANIFEST_PATH:<51}│
   │                                                             │
-  │  Next step → build the Streamlit app (app.py)               │
+  │  A running app (app.py) swaps to it automatically.          │
   └─────────────────────────────────────────────────────────────┘
 """)
+    return version
+
+
+# ==============================================================================
+# CHUNKED (OUT-OF-CORE) PIPELINE
+# ==============================================================================
+
+def main_chunked(args: argparse.Namespace) -> None:
+    """Same artefacts as main(), but the dataset is only ever read one partition at a time."""
+    title_map      = load_title_map()
+    feature_config = {"location_encoding": args.location_encoding}
+    if args.location_encoding == "hash":
+        feature_config["hash_buckets"] = args.hash_buckets
+
+    section("Chunked Training  –  pass 1: schema scan")
+    schema        = scan_schema(CLEAN_DATA_PATH, args.chunk_rows, title_map)
+    model_columns = schema_columns(schema)
+    if args.location_encoding == "hash":
+        model_columns += [f"{column}_hash_{b}" for column in LOCATION_COLUMNS for b in range(args.hash_buckets)]
+    print(f"     Rows / partitions : {schema['rows']:,} / {schema['chunks']} × ≤{args.chunk_rows:,}")
+    print(f"     Encoded columns   : {len(model_columns):,}")
+
+    section("Chunked Training  –  pass 2: incremental forest")
+    start = time.time()
+    model = fit_chunked(
+        CLEAN_DATA_PATH, TARGET_COLUMN, model_columns, schema,
+        feature_config=feature_config, title_map=title_map, chunk_rows=args.chunk_rows,
+        test_size=TEST_SIZE, random_state=RANDOM_STATE,
+    )
+    elapsed_fit = time.time() - start
+    print(f"     ✓ {len(model.estimators_)} trees in {elapsed_fit:.1f}s")
+
+    models = {"Chunked": model}
+    if args.compare_in_memory:
+        # Baseline: the usual all-in-memory fit, on exactly the same training rows
+        df = pd.read_csv(CLEAN_DATA_PATH)
+        if title_map:
+            df["job_title"] = canonicalize(df["job_title"], title_map)
+        train = df[~holdout_mask(np.arange(len(df)), TEST_SIZE)]
+        baseline = make_forest()
+        start = time.time()
+        baseline.fit(encode_profiles(train, model_columns, feature_config), train[TARGET_COLUMN])
+        elapsed_baseline = time.time() - start
+        models["In-memory"] = baseline
+        del df, train
+
+    section("Chunked Training  –  pass 3: holdout evaluation")
+    metrics = evaluate_holdout(
+        models, CLEAN_DATA_PATH, TARGET_COLUMN, model_columns,
+        feature_config=feature_config, title_map=title_map,
+        chunk_rows=args.chunk_rows, test_size=TEST_SIZE,
+    )
+    print(f"\n  {'':<24}" + "".join(f"{name:>14}" for name in models))
+    print(f"  {'Fit time (s)':<24}{elapsed_fit:>14.1f}" + (f"{elapsed_baseline:>14.1f}" if args.compare_in_memory else ""))
+    print(f"  {'Holdout MAE (USD)':<24}" + "".join(f"{metrics[name].mae:>14,.0f}" for name in models))
+    print(f"  {'Holdout R²':<24}" + "".join(f"{metrics[name].r2:>14.4f}" for name in models))
+    print(f"  {'Holdout rows':<24}{metrics['Chunked'].n:>14,}")
+
+    prediction_table = None
+    if args.location_encoding == "none":
+        prediction_table = build_prediction_table(model, model_columns, job_titles=schema["job_titles"])
+        print(f"\n     ✓ {len(prediction_table):,} profiles precomputed")
+
+    save_artefacts(
+        args, model, model_columns, feature_config, prediction_table, title_map,
+        metadata={
+            "mae":        round(metrics["Chunked"].mae, 2),
+            "r2":         round(metrics["Chunked"].r2, 4),
+            "rows":       schema["rows"],
+            "train_rows": schema["rows"] - metrics["Chunked"].n,
+            "chunked":    True,
+        },
+    )
+    profiler.finish()
 
 
 # ==============================================================================
@@ -179,4 +635,4 @@ def main() -> None:
 # ==============================================================================
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(parse_args())
\ No newline at end of file
@@ -0,0 +1,96 @@
+
+import numpy as np
+import pandas as pd
+
+
+# ==============================================================================
+# SINGLE-PASS GROUPBY ENGINE
+# ==============================================================================
+#
+# Every grouping dimension is factorised once into integer codes. The codes of
+# all dimensions are then shifted into one shared id space, so count / sum /
+# min / max for every requested grouping come out of a single bincount-style
+# pass over the stacked codes instead of one pandas groupby per dimension.
+
+STATS = ["count", "sum", "mean", "min", "max"]
+
+
+def factorize_columns(df: pd.DataFrame, columns: list) -> dict:
+    """Return {column: (codes, uniques)} with categories in sorted order."""
+    return {column: pd.factorize(df[column], sort=True) for column in columns}
+
+
+class GroupAggregates:
+    """count / sum / mean / min / max of one value column for several groupings."""
+
+    def __init__(self, tables: dict, overall: dict):
+        self.tables  = tables     # {column: DataFrame indexed by category, columns = STATS}
+        self.overall = overall    # same statistics over the whole value column
+
+    def __getitem__(self, column: str) -> pd.DataFrame:
+        return self.tables[column]
+
+    def top(self, column: str, stat: str = "mean", n: int = 10, ascending: bool = False) -> pd.Series:
+        """The `n` categories of `column` with the highest (or lowest) `stat`; all of them if n is None."""
+        ranked = self.tables[column][stat].sort_values(ascending=ascending)
+        return ranked if n is None else ranked.head(n)
+
+    def value(self, column: str, category, stat: str = "mean") -> float:
+        """Single statistic for one category, NaN if the category is absent."""
+        table = self.tables[column]
+        return float(table.at[category, stat]) if category in table.index else float("nan")
+
+
+def aggregate(df: pd.DataFrame, value_column: str, group_columns: list, codes: dict = None) -> GroupAggregates:
+    """
+    Compute count, sum, mean, min and max of `value_column` for each column in
+    `group_columns` in one vectorised pass. Pre-computed `codes` from
+    factorize_columns() can be passed in to avoid factorising again.
+    """
+    codes   = codes or factorize_columns(df, group_columns)
+    values  = df[value_column].to_numpy(dtype=np.float64)
+
+    # Shift every dimension into its own slice of a shared id space; rows with
+    # a missing category (code -1) are left out of that dimension only
+    offsets, stacked, weights, start = {}, [], [], 0
+    for column in group_columns:
+        column_codes, uniques = codes[column]
+        valid = column_codes >= 0
+        offsets[column] = (start, len(uniques))
+        stacked.append(column_codes[valid] + start)
+        weights.append(values[valid])
+        start += len(uniques)
+
+    ids        = np.concatenate(stacked)
+    all_values = np.concatenate(weights)
+
+    count   = np.bincount(ids, minlength=start)
+    total   = np.bincount(ids, weights=all_values, minlength=start)
+    minimum = np.full(start, np.inf)
+    maximum = np.full(start, -np.inf)
+    np.minimum.at(minimum, ids, all_values)
+    np.maximum.at(maximum, ids, all_values)
+
+    tables = {}
+    for column in group_columns:
+        lo, size = offsets[column]
+        window   = slice(lo, lo + size)
+        tables[column] = pd.DataFrame(
+            {
+                "count": count[window],
+                "sum":   total[window],
+                "mean":  total[window] / np.maximum(count[window], 1),
+                "min":   minimum[window],
+                "max":   maximum[window],
+            },
+            index=pd.Index(codes[column][1], name=column),
+        )
+
+    overall = {
+        "count": len(values),
+        "sum":   float(values.sum()),
+        "mean":  float(values.mean()) if len(values) else float("nan"),
+        "min":   float(values.min()) if len(values) else float("nan"),
+        "max":   float(values.max()) if len(values) else float("nan"),
+    }
+    return GroupAggregates(tables, overall)
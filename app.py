@@ -1,16 +1,50 @@
-
-
 import os
-import io
-import joblib
+import tempfile
+from functools import partial
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from aggregations import GroupAggregates, aggregate
+from artifacts import ArtifactStore, ModelBundle
+from caching import PredictionMemo
+from chart_assets import print_chart, web_chart
+from dataset import partition_values, read_dataset
+from disk_cache import DiskCache, cache_key, file_digest
+from pdf_jobs import PdfJobPool, job_result
+from peer_index import PeerIndex
+from report import CHARTS, FPDF_AVAILABLE, generate_pdf_report
+from sketches import GroupedSketches, build_grouped_sketches
+from title_search import TitleSearchIndex
+from model_utils import (
+    EXPERIENCE_LEVELS,
+    FEATURE_LABELS,
+    LOCATION_COLUMNS,
+    REMOTE_RATIOS,
+    lookup_prediction,
+    predict_profiles,
+    predict_with_interval,
+    split_contributions,
+    uses_locations,
+)
+
+PREDICTION_MEMO_SIZE = 4096   # profiles kept in the process-wide memo
+TITLE_SEARCH_LIMIT   = 30     # candidates shipped to the job-title selectbox
+MANIFEST_POLL_SECONDS = 5     # how often a request may stat the model manifest
+SEGMENT_MEMORY_BUDGET_MB = 512  # resident segment forests before LRU eviction
+PDF_WORKERS          = 2      # background threads rendering PDF reports
+PDF_MAX_PENDING      = 16     # queued + running reports before new ones are refused
+PDF_POLL_SECONDS     = 0.5    # how often the PDF fragment checks a pending report
+WHAT_IF_TOP_TITLES   = 10     # highest-predicted titles listed in the what-if panel
+WHAT_IF_CACHE_SIZE   = 256    # what-if panels kept per process
+DISK_CACHE_MAX_MB    = 1024   # persistent cache shared by every worker process on the host
+
 try:
-    from fpdf import FPDF
-    FPDF_AVAILABLE = True
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
 except ImportError:
-    FPDF_AVAILABLE = False
+    PYARROW_AVAILABLE = False
 
 # ==============================================================================
 # PAGE CONFIG  –  must be the very first Streamlit call
@@ -229,23 +263,238 @@ def load_data() -> pd.DataFrame:
 
 
 @st.cache_resource
-def load_model():
-    """Load and return the trained RandomForest model."""
-    return joblib.load("salary_predictor.pkl")
+def artifact_store() -> ArtifactStore:
+    """
+    Process-wide model registry. Serves the bundle named in artifacts/manifest.json
+    (or the legacy top-level .pkl files) and hot-swaps to newly published versions.
+    """
+    return ArtifactStore(
+        poll_interval=MANIFEST_POLL_SECONDS,
+        segment_budget_bytes=SEGMENT_MEMORY_BUDGET_MB * 1024 ** 2,
+    )
+
+
+@st.cache_resource
+def get_prediction_memo() -> PredictionMemo:
+    """Process-wide prediction memo shared by every session."""
+    return PredictionMemo(maxsize=PREDICTION_MEMO_SIZE)
+
+
+@st.cache_resource
+def get_disk_cache() -> DiskCache:
+    """Persistent cache of aggregates, forest predictions and PDFs; survives restarts."""
+    return DiskCache(max_bytes=DISK_CACHE_MAX_MB * 1024 ** 2)
+
+
+@st.cache_resource
+def get_pdf_pool() -> PdfJobPool:
+    """Process-wide PDF worker pool shared by every session."""
+    return PdfJobPool(workers=PDF_WORKERS, max_pending=PDF_MAX_PENDING)
+
+
+def pdf_cache_key(report_args: dict) -> str:
+    """Disk-cache key of a PDF report: its arguments plus the content of the chart pages."""
+    contributions = tuple(sorted((report_args.get("contributions") or {}).items()))
+    fields        = tuple((name, value) for name, value in sorted(report_args.items()) if name != "contributions")
+    return cache_key("pdf", file_digest(*(print_chart(chart) for chart, _, _ in CHARTS)), fields, contributions)
+
+
+def render_cached_pdf(cache: DiskCache, key: str, **report_args) -> bytes:
+    """generate_pdf_report on a pool thread, storing the bytes for every other worker."""
+    pdf_bytes = generate_pdf_report(**report_args)
+    cache.put("pdf", key, pdf_bytes)
+    return pdf_bytes
+
+
+def predict_profile(
+    experience: str,
+    job_title: str,
+    remote_ratio: int,
+    locations: dict = None,
+    segment: str = None,
+) -> dict:
+    """
+    Return mean + p10/p50/p90 for a profile, served from the memo whenever
+    possible. `segment` selects a segment-specific forest (e.g. 'region=Europe')
+    instead of the global model.
+    """
+    # One bundle reference per request: a hot swap mid-request cannot mix versions
+    bundle = artifact_store().current()
+
+    # The model only knows canonical titles ("AI Developer" → "AI Engineer")
+    job_title = bundle.title_map.get(job_title, job_title)
+    locations = locations if uses_locations(bundle.feature_config) else None
+    segment   = segment if segment in bundle.segments.names else None
+
+    def compute() -> dict:
+        # 1. Precomputed profile → O(1) lookup of mean + p10/p50/p90 (global model only)
+        prediction = None
+        if bundle.prediction_table is not None and locations is None and segment is None:
+            prediction = lookup_prediction(bundle.prediction_table, experience, job_title, remote_ratio)
+
+        # 2. Fallback: encode the profile and read every tree directly – persisted
+        #    on disk under the bundle version, so restarted workers come up warm
+        if prediction is None:
+            def forest() -> dict:
+                model = bundle.segments.get(segment) if segment else bundle.model
+                return predict_with_interval(
+                    model, bundle.model_columns, experience, job_title, remote_ratio,
+                    locations=locations, feature_config=bundle.feature_config,
+                )
+            prediction = get_disk_cache().get_or_compute("predictions", cache_key(*key), forest)
+        return prediction
+
+    location_key = tuple(locations[column] for column in LOCATION_COLUMNS) if locations else ()
+    key = (experience, job_title, remote_ratio, *location_key, segment, bundle.version)
+    return {
+        **get_prediction_memo().get_or_compute(key, compute),
+        "model_version": bundle.version,
+        "training_rows": bundle.metadata.get("train_rows"),
+        "segment":       segment,
+    }
+
+
+@st.cache_resource
+def dashboard_aggregates() -> GroupAggregates:
+    """count / sum / mean / min / max of salary per dashboard dimension, one pass for all."""
+    columns = ["job_title", "experience_level", "remote_ratio", "company_location"]
+    key     = cache_key("dashboard", file_digest("clean_salary_dataset.csv"), *columns)
+    return get_disk_cache().get_or_compute("aggregates", key, lambda: aggregate(df, "salary_in_usd", columns))
+
+
+@st.cache_resource
+def available_years() -> list:
+    """work_year values of the partitioned dataset (or of df if it has not been written)."""
+    return list(partition_values("work_year")) or sorted(df["work_year"].unique().tolist())
+
+
+@st.cache_resource(max_entries=16)
+def year_slice(years: tuple = None) -> pd.DataFrame:
+    """
+    Rows of the selected work years. Only the matching partition files are
+    read; None (every year) is the already loaded df.
+    """
+    if years is None:
+        return df
+    if not partition_values("work_year"):
+        return df[df["work_year"].isin(years)].reset_index(drop=True)
+    return read_dataset({"work_year": years})
+
+
+@st.cache_resource(max_entries=16)
+def year_aggregates(years: tuple = None) -> GroupAggregates:
+    """Dashboard aggregates of one year selection (the cached full ones for every year)."""
+    if years is None:
+        return dashboard_aggregates()
+    return aggregate(year_slice(years), "salary_in_usd", ["experience_level", "remote_ratio"])
+
+
+def year_key(selected: list):
+    """Cache key of a year multiselect: None when every year is selected."""
+    return None if set(selected) >= set(available_years()) else tuple(sorted(selected))
+
+
+@st.cache_resource
+def load_sketches() -> GroupedSketches:
+    """Salary quantile sketches from 1_data_prep_and_eda.py; built from df if the file is missing."""
+    if os.path.exists("salary_sketches.pkl"):
+        return pd.read_pickle("salary_sketches.pkl")
+    return build_grouped_sketches(df, "salary_in_usd", ["experience_level", "remote_ratio"])
+
+
+@st.cache_resource
+def overall_median() -> float:
+    """Dataset-wide median served from the merged sketches."""
+    return load_sketches().merged().median()
+
+
+@st.cache_resource(max_entries=64)
+def filtered_median(filter_exp: tuple, filter_remote: tuple, salary_range: tuple) -> float:
+    """Median of the explorer selection, merged from the matching sketch cells."""
+    sketch = load_sketches().merged(experience_level=filter_exp, remote_ratio=filter_remote)
+    return sketch.quantile(0.5, between=salary_range)
+
+
+@st.cache_resource
+def location_options() -> list:
+    """Sorted country codes seen as company location or employee residence."""
+    return sorted(set(df["company_location"].unique()) | set(df["employee_residence"].unique()))
 
 
 @st.cache_resource
-def load_model_columns() -> list:
-    """Load and return the list of encoded feature columns the model expects."""
-    return joblib.load("model_columns.pkl")
+def title_index() -> TitleSearchIndex:
+    """Typeahead index over job titles, ranked by record count."""
+    return TitleSearchIndex(dashboard_aggregates()["job_title"]["count"])
 
 
-df            = load_data()
-model         = load_model()
-model_columns = load_model_columns()
+@st.cache_resource
+def peer_index() -> PeerIndex:
+    """Sorted salary runs per (experience, title, remote) and coarser groupings, built once."""
+    return PeerIndex(df, "salary_in_usd")
+
+
+@st.cache_resource(max_entries=4)
+def model_titles(model_version: str, _title_map: dict) -> list:
+    """Canonical job titles of one model version (its bundled title map applied to the dataset)."""
+    return sorted({_title_map.get(title, title) for title in df["job_title"].unique()})
+
+
+@st.cache_data(max_entries=WHAT_IF_CACHE_SIZE, show_spinner=False)
+def what_if_panel(
+    experience: str,
+    job_title: str,
+    remote_ratio: int,
+    location_key: tuple,
+    segment: str,
+    model_version: str,
+    _bundle: ModelBundle,
+):
+    """
+    Sensitivity of one prediction: the predicted salary of `job_title` for every
+    experience level × remote ratio, plus the highest-predicted titles at the
+    chosen experience / remote setting. Everything is one predict_profiles
+    call (table lookups where possible); `model_version` (the version of
+    `_bundle`, which is not hashed) keys the cache.
+    """
+    job_title = _bundle.title_map.get(job_title, job_title)
+    titles    = model_titles(_bundle.version, _bundle.title_map)
+
+    grid = pd.MultiIndex.from_product(
+        [EXPERIENCE_LEVELS, [job_title], REMOTE_RATIOS],
+        names=["experience_level", "job_title", "remote_ratio"],
+    ).to_frame(index=False)
+    peers = pd.DataFrame({"experience_level": experience, "job_title": titles, "remote_ratio": remote_ratio})
+    profiles = pd.concat([grid, peers], ignore_index=True)
+    for column, value in zip(LOCATION_COLUMNS, location_key):
+        profiles[column] = value
+
+    segment = segment if segment in _bundle.segments.names else None
+    model   = _bundle.segments.get(segment) if segment else _bundle.model
+    predicted = predict_profiles(
+        model, _bundle.model_columns, profiles,
+        feature_config=_bundle.feature_config,
+        table=None if segment else _bundle.prediction_table,
+        explain=False,
+    )["predicted"]
+
+    sensitivity = (
+        predicted.iloc[:len(grid)]
+        .set_axis(pd.MultiIndex.from_frame(grid[["experience_level", "remote_ratio"]]))
+        .unstack("remote_ratio")
+        .reindex(EXPERIENCE_LEVELS)
+    )
+    top_titles = (
+        predicted.iloc[len(grid):]
+        .set_axis(titles)
+        .nlargest(WHAT_IF_TOP_TITLES)
+    )
+    return sensitivity, top_titles
+
+
+df               = load_data()
+aggs             = dashboard_aggregates()
 
 # Pre-compute reusable values
-JOB_TITLES     = sorted(df["job_title"].unique().tolist())
 EXP_LEVEL_MAP  = {
     "EN - Entry Level":    "EN",
     "MI - Mid Level":      "MI",
@@ -257,236 +506,87 @@ REMOTE_MAP_EMOJI = {0: "On-Site (0%)", 50: "Hybrid (50%)", 100: "Fully Remote (1
 
 
 # ==============================================================================
-# PDF GENERATION
+# DATA EXPLORER  –  server-side paging over cached sort permutations
 # ==============================================================================
 
-def generate_pdf_report(
-    job_title: str,
-    experience: str,
-    remote_ratio: int,
-    predicted_salary: float,
-) -> bytes:
+EXPLORER_COLUMNS = ["job_title", "experience_level", "remote_ratio", "salary_in_usd", "company_location", "work_year"]
+PAGE_SIZES       = [25, 50, 100, 200, 500]
+EXPORT_FORMATS   = ["CSV", "Parquet"] if PYARROW_AVAILABLE else ["CSV"]
+EXPORT_CHUNK_ROWS = 50_000
+
+
+@st.cache_resource(max_entries=32)
+def sort_permutation(column: str, ascending: bool, years: tuple = None) -> np.ndarray:
+    """Row positions of the year slice ordered by `column`; computed once per column and direction."""
+    order = np.argsort(year_slice(years)[column].to_numpy(), kind="stable")
+    return order if ascending else order[::-1]
+
+
+@st.cache_resource(max_entries=32)
+def filtered_positions(
+    filter_exp: tuple,
+    filter_remote: tuple,
+    salary_range: tuple,
+    sort_column: str,
+    ascending: bool,
+    years: tuple = None,
+) -> np.ndarray:
     """
-    Build a multi-page PDF report with the user's salary prediction on page 1
-    and the four market analysis charts on the subsequent pages.
-    Returns the PDF as raw bytes for st.download_button.
+    Sorted row positions (into year_slice(years)) that pass the explorer
+    filters. One O(rows in the slice) mask per filter combination; every
+    page afterwards is a slice of this array.
     """
+    frame = year_slice(years)
+    mask = (
+        frame["experience_level"].isin(filter_exp) &
+        frame["remote_ratio"].isin(filter_remote) &
+        frame["salary_in_usd"].between(salary_range[0], salary_range[1])
+    ).to_numpy()
+    order = sort_permutation(sort_column, ascending, years)
+    return order[mask[order]]
 
-    if not FPDF_AVAILABLE:
-        return b"PDF generation requires fpdf2. Run: pip install fpdf2"
-
-    def safe_text(text: str) -> str:
-        """Strip/replace any character outside latin-1 so Helvetica never throws."""
-        replacements = {
-            "–": "-",   # en dash  –
-            "—": "-",   # em dash  —
-            "’": "'",   # right single quote
-            "‘": "'",   # left single quote
-            "“": '"',   # left double quote
-            "”": '"',   # right double quote
-            "•": "*",   # bullet
-            "·": "*",   # middle dot
-            "→": "->",  # arrow right
-            "←": "<-",  # arrow left
-            "×": "x",   # multiplication sign
-            "…": "...", # ellipsis
-        }
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-        # Final safety net: encode to latin-1, drop anything that still fails
-        return text.encode("latin-1", errors="replace").decode("latin-1")
-
-    class PDF(FPDF):
-        def header(self):
-            # Dark top bar
-            self.set_fill_color(7, 11, 20)
-            self.rect(0, 0, 210, 18, "F")
-            self.set_font("Helvetica", "B", 9)
-            self.set_text_color(0, 212, 180)
-            self.set_xy(10, 5)
-            self.cell(0, 8, "CAREERSCOUT  -  DATA SCIENCE SALARY INTELLIGENCE", ln=0)
-            self.set_text_color(100, 116, 139)
-            self.set_font("Helvetica", "", 8)
-            self.set_xy(0, 5)
-            self.cell(200, 8, "carerescout.ai", ln=0, align="R")
-
-        def footer(self):
-            self.set_y(-14)
-            self.set_fill_color(7, 11, 20)
-            self.rect(0, self.get_y(), 210, 20, "F")
-            self.set_font("Helvetica", "", 8)
-            self.set_text_color(100, 116, 139)
-            self.cell(0, 8, f"Page {self.page_no()}  -  Generated by CareerScout  -  Powered by RandomForest ML", align="C")
-
-    pdf = PDF()
-    pdf.set_auto_page_break(auto=True, margin=20)
-    pdf.set_margins(left=15, top=22, right=15)
-
-    # ── PAGE 1 : Prediction Report ────────────────────────────────────────────
-    pdf.add_page()
-
-    # Hero title block
-    pdf.set_fill_color(14, 21, 37)
-    pdf.rect(15, 24, 180, 42, "F")
-    pdf.set_draw_color(0, 212, 180)
-    pdf.set_line_width(0.5)
-    pdf.rect(15, 24, 180, 42)
-    pdf.set_font("Helvetica", "B", 22)
-    pdf.set_text_color(0, 212, 180)
-    pdf.set_xy(15, 31)
-    pdf.cell(180, 10, safe_text("CareerScout Salary Report"), ln=1, align="C")
-    pdf.set_font("Helvetica", "", 10)
-    pdf.set_text_color(100, 116, 139)
-    pdf.set_xy(15, 45)
-    pdf.cell(180, 8, safe_text("Data Science Market Intelligence  -  2025 Dataset"), ln=1, align="C")
-
-    # Section: Your Profile
-    pdf.set_xy(15, 74)
-    pdf.set_font("Helvetica", "B", 11)
-    pdf.set_text_color(0, 212, 180)
-    pdf.cell(0, 8, safe_text("YOUR INPUT PROFILE"), ln=1)
-    pdf.set_draw_color(0, 212, 180)
-    pdf.set_line_width(0.3)
-    pdf.line(15, pdf.get_y(), 195, pdf.get_y())
-    pdf.ln(4)
-
-    # Render profile rows properly
-    exp_labels = {'EN':'Entry Level','MI':'Mid Level','SE':'Senior Level','EX':'Executive / Director'}
-    profile_data = [
-        ("Job Title",        safe_text(job_title)),
-        ("Experience Level", f"{experience}  -  {exp_labels.get(experience, experience)}"),
-        ("Remote Ratio",     f"{remote_ratio}%  -  {REMOTE_MAP.get(remote_ratio, str(remote_ratio))}"),
-    ]
-    for label, value in profile_data:
-        x = pdf.get_x()
-        y = pdf.get_y()
-        pdf.set_fill_color(11, 17, 30)
-        pdf.rect(15, y, 180, 11, "F")
-        pdf.set_font("Helvetica", "B", 9)
-        pdf.set_text_color(100, 116, 139)
-        pdf.set_xy(20, y + 1.5)
-        pdf.cell(50, 8, label.upper())
-        pdf.set_font("Helvetica", "", 10)
-        pdf.set_text_color(226, 232, 240)
-        pdf.set_xy(70, y + 1.5)
-        pdf.cell(120, 8, value)
-        pdf.set_xy(15, y + 12)
-
-    # Predicted Salary hero box
-    pdf.ln(10)
-    y_salary = pdf.get_y()
-    pdf.set_fill_color(7, 11, 20)
-    pdf.rect(15, y_salary, 180, 48, "F")
-    pdf.set_draw_color(245, 158, 11)
-    pdf.set_line_width(1.0)
-    pdf.rect(15, y_salary, 180, 48)
-
-    pdf.set_font("Helvetica", "B", 10)
-    pdf.set_text_color(100, 116, 139)
-    pdf.set_xy(15, y_salary + 8)
-    pdf.cell(180, 8, safe_text("PREDICTED ANNUAL SALARY (USD)"), ln=1, align="C")
-
-    pdf.set_font("Helvetica", "B", 34)
-    pdf.set_text_color(245, 158, 11)
-    pdf.set_xy(15, y_salary + 17)
-    pdf.cell(180, 18, safe_text(f"${predicted_salary:,.0f}"), ln=1, align="C")
-
-    pdf.set_font("Helvetica", "", 9)
-    pdf.set_text_color(100, 116, 139)
-    pdf.set_xy(15, y_salary + 37)
-    pdf.cell(180, 8, safe_text("Estimated by RandomForestRegressor trained on 93,392 real-world records"), ln=1, align="C")
-
-    # Confidence range
-    pdf.ln(8)
-    low  = predicted_salary * 0.85
-    high = predicted_salary * 1.15
-    pdf.set_font("Helvetica", "B", 10)
-    pdf.set_text_color(0, 212, 180)
-    pdf.cell(0, 8, safe_text("ESTIMATED MARKET RANGE  (± 15%)"), ln=1)
-    pdf.set_line_width(0.3)
-    pdf.line(15, pdf.get_y(), 195, pdf.get_y())
-    pdf.ln(4)
-
-    range_data = [
-        ("Conservative (Low)",  f"${low:,.0f}"),
-        ("Predicted (Mid)",     f"${predicted_salary:,.0f}"),
-        ("Optimistic (High)",   f"${high:,.0f}"),
-    ]
-    col_w = 57
-    x_start = 18
-    for i, (label, val) in enumerate(range_data):
-        bx = x_start + i * (col_w + 3)
-        by = pdf.get_y()
-        fill = (14, 21, 37) if i != 1 else (7, 11, 20)
-        border_c = (0, 212, 180) if i == 1 else (30, 45, 69)
-        pdf.set_fill_color(*fill)
-        pdf.rect(bx, by, col_w, 22, "F")
-        pdf.set_draw_color(*border_c)
-        pdf.set_line_width(0.5 if i != 1 else 1.0)
-        pdf.rect(bx, by, col_w, 22)
-        pdf.set_font("Helvetica", "", 7)
-        pdf.set_text_color(100, 116, 139)
-        pdf.set_xy(bx, by + 3)
-        pdf.cell(col_w, 6, safe_text(label), align="C")
-        c = (245, 158, 11) if i == 1 else (0, 212, 180)
-        pdf.set_font("Helvetica", "B", 11)
-        pdf.set_text_color(*c)
-        pdf.set_xy(bx, by + 10)
-        pdf.cell(col_w, 8, val, align="C")
-
-    # Disclaimer
-    pdf.ln(32)
-    pdf.set_font("Helvetica", "I", 8)
-    pdf.set_text_color(51, 65, 85)
-    pdf.multi_cell(
-        0, 5,
-        safe_text("Disclaimer: This prediction is generated by a machine learning"
-                  " model trained on historical data. Actual salaries vary based"
-                  " on company, location, negotiation, and individual factors."
-                  " Use this as a market reference, not a guarantee."),
-    )
 
-    # ── PAGES 2–5 : Market Analysis Charts ───────────────────────────────────
-    charts = [
-        ("fig1_salary_distribution.png",  "Salary Distribution",           "Distribution of salaries across the dataset after removing outliers (>$500K)."),
-        ("fig2_experience_level_count.png","Experience Level Distribution", "Breakdown of the number of professionals at each experience level."),
-        ("fig3_top10_jobs.png",            "Top 10 Highest-Paying Roles",   "Average salary by job title - top 10 earners in the data science field."),
-        ("fig4_salary_vs_experience.png",  "Salary vs. Experience Level",   "Salary spread by experience level, showing medians, IQR, and outliers."),
-    ]
-
-    for img_path, chart_title, chart_desc in charts:
-        pdf.add_page()
-        pdf.set_font("Helvetica", "B", 14)
-        pdf.set_text_color(0, 212, 180)
-        pdf.set_xy(15, 26)
-        pdf.cell(0, 10, safe_text(f"MARKET ANALYSIS  -  {chart_title.upper()}"), ln=1)
-        pdf.set_draw_color(0, 212, 180)
-        pdf.set_line_width(0.3)
-        pdf.line(15, pdf.get_y(), 195, pdf.get_y())
-        pdf.ln(3)
-        pdf.set_font("Helvetica", "", 9)
-        pdf.set_text_color(100, 116, 139)
-        pdf.cell(0, 6, safe_text(chart_desc), ln=1)
-        pdf.ln(4)
-
-        if os.path.exists(img_path):
-            pdf.image(img_path, x=15, y=pdf.get_y(), w=180)
-        else:
-            pdf.set_fill_color(14, 21, 37)
-            pdf.rect(15, pdf.get_y(), 180, 80, "F")
-            pdf.set_font("Helvetica", "I", 10)
-            pdf.set_text_color(100, 116, 139)
-            pdf.set_xy(15, pdf.get_y() + 36)
-            pdf.cell(180, 8, safe_text(f"[Chart file '{img_path}' not found in working directory]"), align="C")
+def explorer_page(frame: pd.DataFrame, positions: np.ndarray, page: int, page_size: int) -> pd.DataFrame:
+    """Materialise only the rows of one page."""
+    start = (page - 1) * page_size
+    return frame.iloc[positions[start:start + page_size]][EXPLORER_COLUMNS]
 
-    return bytes(pdf.output())
+
+def export_filtered(frame: pd.DataFrame, positions: np.ndarray, export_format: str):
+    """
+    Write the filtered rows as CSV or Parquet to an anonymous temporary file,
+    EXPORT_CHUNK_ROWS at a time, straight from the row positions – neither a
+    second full-size DataFrame nor the encoded file is held in memory.
+    Returns the file rewound to its start; it is deleted once closed.
+    """
+    export = tempfile.TemporaryFile()
+    starts = range(0, max(len(positions), 1), EXPORT_CHUNK_ROWS)
+
+    if export_format == "Parquet":
+        writer = None
+        for start in starts:
+            chunk = frame.iloc[positions[start:start + EXPORT_CHUNK_ROWS]][EXPLORER_COLUMNS]
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(export, table.schema)
+            writer.write_table(table)
+        writer.close()
+    else:
+        for start in starts:
+            chunk = frame.iloc[positions[start:start + EXPORT_CHUNK_ROWS]][EXPLORER_COLUMNS]
+            chunk.to_csv(export, header=(start == 0), index=False)
+
+    export.seek(0)
+    return export
 
 
 # ==============================================================================
 # SIDEBAR
 # ==============================================================================
 
-with st.sidebar:
+@st.fragment
+def render_sidebar() -> None:
+    """Sidebar fragment: static dataset summary, only rebuilt on a full app run."""
     # Brand
     st.markdown("""
     <div style="padding: 4px 0 20px 0;">
@@ -507,10 +607,10 @@ with st.sidebar:
     col_a, col_b = st.columns(2)
     with col_a:
         st.metric("Records",    f"{len(df):,}")
-        st.metric("Job Titles", f"{df['job_title'].nunique()}")
+        st.metric("Job Titles", f"{len(aggs['job_title'])}")
     with col_b:
-        st.metric("Avg Salary", f"${df['salary_in_usd'].mean():,.0f}")
-        st.metric("Countries",  f"{df['company_location'].nunique()}")
+        st.metric("Avg Salary", f"${aggs.overall['mean']:,.0f}")
+        st.metric("Countries",  f"{len(aggs['company_location'])}")
 
     st.markdown('<hr style="border: none; border-top: 1px solid #21262d; margin: 16px 0;">', unsafe_allow_html=True)
 
@@ -530,12 +630,7 @@ with st.sidebar:
 
     # Top 5 roles
     st.markdown('<p style="font-size:0.7rem; font-weight:600; color:#484f58; letter-spacing:0.05em; margin-bottom:10px; text-transform:uppercase;">Top Paying Roles</p>', unsafe_allow_html=True)
-    top5 = (
-        df.groupby("job_title")["salary_in_usd"]
-        .mean()
-        .sort_values(ascending=False)
-        .head(5)
-    )
+    top5 = aggs.top("job_title", "mean", n=5)
     for title, sal in top5.items():
         short = title if len(title) <= 24 else title[:22] + "..."
         st.markdown(f"""
@@ -548,21 +643,30 @@ with st.sidebar:
         """, unsafe_allow_html=True)
 
     st.markdown('<br>', unsafe_allow_html=True)
-    st.markdown("""
+    bundle        = artifact_store().current()
+    training_rows = bundle.metadata.get("train_rows")
+    st.markdown(f"""
     <div style="font-size:0.7rem; color:#484f58; line-height:1.7;">
         Model: RandomForestRegressor<br>
-        Features: 320 encoded columns<br>
-        Training set: 74,713 records
+        Version: {bundle.version}<br>
+        Features: {len(bundle.model_columns)} encoded columns<br>
+        Training set: {f"{training_rows:,} records" if training_rows else "n/a"}
     </div>
     """, unsafe_allow_html=True)
 
 
+with st.sidebar:
+    render_sidebar()
+
+
 # ==============================================================================
 # MAIN CONTENT
 # ==============================================================================
 
 # ── Page Header ───────────────────────────────────────────────────────────────
-st.markdown("""
+header_bundle = artifact_store().current()
+header_titles = model_titles(header_bundle.version, header_bundle.title_map)
+st.markdown(f"""
 <div style="padding: 8px 0 24px 0; border-bottom: 1px solid #21262d; margin-bottom: 24px;">
     <h1 style="font-family: 'Inter', system-ui, sans-serif; font-size: 1.5rem;
                font-weight: 700; color: #e6edf3; margin: 0; line-height: 1.3;
@@ -571,7 +675,7 @@ st.markdown("""
     </h1>
     <p style="font-family: 'Inter', system-ui, sans-serif; font-size: 0.8rem;
               color: #8b949e; margin: 6px 0 0 0; font-weight: 400;">
-        93,392 records &nbsp;&middot;&nbsp; 317 job titles &nbsp;&middot;&nbsp; RandomForest model
+        {len(df):,} records &nbsp;&middot;&nbsp; {len(header_titles):,} job titles &nbsp;&middot;&nbsp; RandomForest model
     </p>
 </div>
 """, unsafe_allow_html=True)
@@ -584,26 +688,40 @@ tab_dashboard, tab_predictor = st.tabs(["Market Dashboard", "Salary Predictor"])
 # TAB 1 : MARKET DASHBOARD
 # ==============================================================================
 
-with tab_dashboard:
-
+@st.fragment
+def render_kpis() -> None:
+    """KPI row fragment."""
     st.markdown('<p style="font-size:0.72rem; font-weight:600; color:#484f58; letter-spacing:0.06em; text-transform:uppercase; margin:0 0 12px 0; padding-bottom:8px; border-bottom:1px solid #21262d;">Market Overview</p>', unsafe_allow_html=True)
 
+    # Year selection – a subset reads only those work_year partitions
+    kpi_years = st.multiselect("Work year", options=available_years(), default=available_years(), key="kpi_years")
+    if not kpi_years:
+        st.info("Select at least one work year.")
+        return
+    years     = year_key(kpi_years)
+    kpi_aggs  = year_aggregates(years)
+    median    = overall_median() if years is None else float(year_slice(years)["salary_in_usd"].median())
+
     # KPI row
     kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns(5)
     with kpi1:
-        st.metric("Median Salary",   f"${df['salary_in_usd'].median():,.0f}")
+        st.metric("Median Salary",   f"${median:,.0f}")
     with kpi2:
-        st.metric("Average Salary",  f"${df['salary_in_usd'].mean():,.0f}")
+        st.metric("Average Salary",  f"${kpi_aggs.overall['mean']:,.0f}")
     with kpi3:
-        st.metric("Max Salary",      f"${df['salary_in_usd'].max():,.0f}")
+        st.metric("Max Salary",      f"${kpi_aggs.overall['max']:,.0f}")
     with kpi4:
-        st.metric("Min Salary",      f"${df['salary_in_usd'].min():,.0f}")
+        st.metric("Min Salary",      f"${kpi_aggs.overall['min']:,.0f}")
     with kpi5:
-        remote_pct = (df["remote_ratio"] == 100).mean() * 100
+        remote_pct = kpi_aggs.value("remote_ratio", 100, "count") / kpi_aggs.overall["count"] * 100
         st.metric("Fully Remote",    f"{remote_pct:.1f}%")
 
     st.markdown("<br>", unsafe_allow_html=True)
 
+
+@st.fragment
+def render_charts() -> None:
+    """Static chart grid fragment – never rerun by the Data Explorer widgets."""
     # Charts row 1
     st.markdown('<p style="font-size:0.72rem; font-weight:600; color:#484f58; letter-spacing:0.06em; text-transform:uppercase; margin:0 0 12px 0; padding-bottom:8px; border-bottom:1px solid #21262d;">Salary & Workforce Distribution</p>', unsafe_allow_html=True)
 
@@ -611,15 +729,15 @@ with tab_dashboard:
 
     with chart_col1:
         st.markdown('<p style="font-size:0.72rem; font-weight:500; color:#484f58; margin-bottom:6px;">Fig 1 - Salary Distribution</p>', unsafe_allow_html=True)
-        if os.path.exists("fig1_salary_distribution.png"):
-            st.image("fig1_salary_distribution.png", use_container_width=True)
+        if os.path.exists(web_chart("fig1_salary_distribution.png")):
+            st.image(web_chart("fig1_salary_distribution.png"), use_container_width=True)
         else:
             st.warning("fig1_salary_distribution.png not found")
 
     with chart_col2:
         st.markdown('<p style="font-size:0.72rem; font-weight:500; color:#484f58; margin-bottom:6px;">Fig 2 - Experience Level Distribution</p>', unsafe_allow_html=True)
-        if os.path.exists("fig2_experience_level_count.png"):
-            st.image("fig2_experience_level_count.png", use_container_width=True)
+        if os.path.exists(web_chart("fig2_experience_level_count.png")):
+            st.image(web_chart("fig2_experience_level_count.png"), use_container_width=True)
         else:
             st.warning("fig2_experience_level_count.png not found")
 
@@ -632,54 +750,102 @@ with tab_dashboard:
 
     with chart_col3:
         st.markdown('<p style="font-size:0.72rem; font-weight:500; color:#484f58; margin-bottom:6px;">Fig 3 - Top 10 Highest-Paying Job Titles</p>', unsafe_allow_html=True)
-        if os.path.exists("fig3_top10_jobs.png"):
-            st.image("fig3_top10_jobs.png", use_container_width=True)
+        if os.path.exists(web_chart("fig3_top10_jobs.png")):
+            st.image(web_chart("fig3_top10_jobs.png"), use_container_width=True)
         else:
             st.warning("fig3_top10_jobs.png not found")
 
     with chart_col4:
         st.markdown('<p style="font-size:0.72rem; font-weight:500; color:#484f58; margin-bottom:6px;">Fig 4 - Salary Range by Experience Level</p>', unsafe_allow_html=True)
-        if os.path.exists("fig4_salary_vs_experience.png"):
-            st.image("fig4_salary_vs_experience.png", use_container_width=True)
+        if os.path.exists(web_chart("fig4_salary_vs_experience.png")):
+            st.image(web_chart("fig4_salary_vs_experience.png"), use_container_width=True)
         else:
             st.warning("fig4_salary_vs_experience.png not found")
 
+
+@st.fragment
+def render_data_explorer() -> None:
+    """Data Explorer fragment: filter changes rerun only this block."""
     # Bonus: live data table with filters
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown('<p style="font-size:0.72rem; font-weight:600; color:#484f58; letter-spacing:0.06em; text-transform:uppercase; margin:0 0 12px 0; padding-bottom:8px; border-bottom:1px solid #21262d;">Data Explorer</p>', unsafe_allow_html=True)
 
-    filter_col1, filter_col2, filter_col3 = st.columns(3)
+    filter_col0, filter_col1, filter_col2, filter_col3 = st.columns([2, 3, 3, 4])
+    with filter_col0:
+        filter_year = st.multiselect(
+            "Filter by Work Year",
+            options=available_years(),
+            default=available_years(),
+        )
     with filter_col1:
         filter_exp = st.multiselect(
             "Filter by Experience Level",
-            options=sorted(df["experience_level"].unique()),
-            default=sorted(df["experience_level"].unique()),
+            options=aggs["experience_level"].index.tolist(),
+            default=aggs["experience_level"].index.tolist(),
         )
     with filter_col2:
         filter_remote = st.multiselect(
             "Filter by Remote Ratio",
-            options=sorted(df["remote_ratio"].unique()),
-            default=sorted(df["remote_ratio"].unique()),
+            options=aggs["remote_ratio"].index.tolist(),
+            default=aggs["remote_ratio"].index.tolist(),
         )
     with filter_col3:
         salary_range = st.slider(
             "Salary Range (USD)",
-            min_value=int(df["salary_in_usd"].min()),
-            max_value=int(df["salary_in_usd"].max()),
-            value=(int(df["salary_in_usd"].min()), int(df["salary_in_usd"].max())),
+            min_value=int(aggs.overall["min"]),
+            max_value=int(aggs.overall["max"]),
+            value=(int(aggs.overall["min"]), int(aggs.overall["max"])),
             step=5000,
         )
 
-    filtered_df = df[
-        df["experience_level"].isin(filter_exp) &
-        df["remote_ratio"].isin(filter_remote) &
-        df["salary_in_usd"].between(salary_range[0], salary_range[1])
-    ][["job_title", "experience_level", "remote_ratio", "salary_in_usd", "company_location", "work_year"]]
-
-    st.caption(f"{len(filtered_df):,} records matching filters")
+    sort_col1, sort_col2, sort_col3 = st.columns(3)
+    with sort_col1:
+        sort_column = st.selectbox(
+            "Sort by",
+            options=EXPLORER_COLUMNS,
+            index=EXPLORER_COLUMNS.index("salary_in_usd"),
+        )
+    with sort_col2:
+        sort_order = st.radio("Order", options=["Descending", "Ascending"], horizontal=True)
+    with sort_col3:
+        page_size = st.selectbox("Rows per page", options=PAGE_SIZES, index=1)
+
+    years     = year_key(filter_year)
+    frame     = year_slice(years)
+    positions = filtered_positions(
+        tuple(filter_exp),
+        tuple(filter_remote),
+        tuple(salary_range),
+        sort_column,
+        sort_order == "Ascending",
+        years,
+    )
+    n_pages = max(1, -(-len(positions) // page_size))
+
+    # Clamp a page number left over from a wider filter before the widget is built
+    if st.session_state.get("explorer_page", 1) > n_pages:
+        st.session_state["explorer_page"] = n_pages
+
+    page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key="explorer_page")
+    first_row = (page - 1) * page_size
+
+    # Sketch median across all years; exact median of the (smaller) slice otherwise
+    if not len(positions):
+        median_text = "–"
+    elif years is None:
+        median_text = f"${filtered_median(tuple(filter_exp), tuple(filter_remote), tuple(salary_range)):,.0f}"
+    else:
+        median_text = f"${float(np.median(frame['salary_in_usd'].to_numpy()[positions])):,.0f}"
+
+    st.caption(
+        f"{len(positions):,} records matching filters  ·  "
+        f"median {median_text}  ·  "
+        f"showing {min(first_row + 1, len(positions)):,}–{min(first_row + page_size, len(positions)):,}  ·  "
+        f"page {page:,} of {n_pages:,}"
+    )
 
     st.dataframe(
-        filtered_df.sort_values("salary_in_usd", ascending=False).head(200),
+        explorer_page(frame, positions, page, page_size),
         use_container_width=True,
         hide_index=True,
         column_config={
@@ -688,222 +854,487 @@ with tab_dashboard:
         },
     )
 
+    # Export of the full filtered subset – written only when the button is
+    # clicked (deferred download), streamed through a temporary file
+    export_col1, export_col2 = st.columns([1, 2])
+    with export_col1:
+        export_format = st.selectbox("Export format", options=EXPORT_FORMATS)
+
+    with export_col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        extension = "parquet" if export_format == "Parquet" else "csv"
+        st.download_button(
+            label=f"Download {export_format} ({len(positions):,} rows)",
+            data=partial(export_filtered, frame, positions, export_format),
+            file_name=f"CareerScout_Explorer.{extension}",
+            mime="application/octet-stream" if export_format == "Parquet" else "text/csv",
+            on_click="ignore",
+            use_container_width=True,
+        )
+
+
+with tab_dashboard:
+    render_kpis()
+    render_charts()
+    render_data_explorer()
+
 
 # ==============================================================================
 # TAB 2 : SALARY PREDICTOR
 # ==============================================================================
 
-with tab_predictor:
+@st.fragment
+def render_prediction_result() -> None:
+    """
+    Prediction result fragment (right column). Reads the last result from
+    session state; the PDF download area below it is a separate fragment.
+    """
+    st.markdown('<p style="font-size:0.72rem; font-weight:600; color:#484f58; letter-spacing:0.06em; text-transform:uppercase; margin:0 0 14px 0;">Prediction Result</p>', unsafe_allow_html=True)
+
+    result = st.session_state.get("prediction")
+
+    if result is None:
+        # Placeholder state
+        st.markdown("""
+        <div style="background:#161b22; border:1px solid #21262d; border-radius:8px;
+                    padding:48px 24px; text-align:center; margin-top:8px;">
+            <div style="font-size:1.5rem; color:#30363d; margin-bottom:12px; font-weight:300;">&#11835;</div>
+            <div style="font-family:'Inter',system-ui,sans-serif; font-size:0.9rem;
+                        font-weight:500; color:#484f58; margin-bottom:6px;">
+                No prediction yet
+            </div>
+            <div style="font-family:'Inter',system-ui,sans-serif; font-size:0.8rem; color:#30363d;">
+                Select your profile and click Predict Salary
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
 
-    pred_left, pred_right = st.columns([1, 1], gap="large")
+    else:
+        # ── RESULT DISPLAY ─────────────────────────────────────────────────
+        predicted_salary = result["predicted"]
+        low   = result["p10"]
+        high  = result["p90"]
 
-    # ── LEFT : Input Form ─────────────────────────────────────────────────────
-    with pred_left:
-        st.markdown('<p style="font-size:0.72rem; font-weight:600; color:#484f58; letter-spacing:0.06em; text-transform:uppercase; margin:0 0 14px 0;">Input Profile</p>', unsafe_allow_html=True)
-
-        # Experience level
-        exp_label = st.selectbox(
-            "Experience Level",
-            options=list(EXP_LEVEL_MAP.keys()),
-            index=2,
-            help="Select the experience level that best describes your seniority.",
-        )
-        experience_code = EXP_LEVEL_MAP[exp_label]
-
-        # Job title
-        job_title = st.selectbox(
-            "Job Title",
-            options=JOB_TITLES,
-            index=JOB_TITLES.index("Data Scientist") if "Data Scientist" in JOB_TITLES else 0,
-            help=f"Choose from {len(JOB_TITLES)} unique job titles in the dataset.",
-        )
+        # Main salary card
+        st.markdown(f"""
+        <div style="background:#161b22; border:1px solid #30363d; border-radius:8px;
+                    padding:28px 24px; text-align:center; margin-bottom:12px;">
+            <div style="font-family:'Inter',system-ui,sans-serif; font-size:0.72rem;
+                        font-weight:500; color:#8b949e; letter-spacing:0.05em;
+                        text-transform:uppercase; margin-bottom:10px;">
+                Predicted Annual Salary
+            </div>
+            <div style="font-family:'Inter',system-ui,sans-serif; font-size:2.4rem;
+                        font-weight:700; color:#e6edf3; line-height:1;
+                        letter-spacing:-0.02em; margin-bottom:4px;">
+                ${predicted_salary:,.0f}
+            </div>
+            <div style="font-size:0.75rem; color:#484f58;">USD per year</div>
+        </div>
+        """, unsafe_allow_html=True)
 
-        # Remote ratio
-        remote_ratio = st.select_slider(
-            "Work Arrangement",
-            options=[0, 50, 100],
-            value=100,
-            format_func=lambda v: REMOTE_MAP_EMOJI[v],
-            help="0 = fully on-site  ·  50 = hybrid  ·  100 = fully remote",
-        )
+        # Range cards
+        r1, r2, r3 = st.columns(3)
+        for col, label, val, is_mid in [
+            (r1, "Low (P10)",   low,              False),
+            (r2, "Predicted",   predicted_salary, True),
+            (r3, "High (P90)",  high,             False),
+        ]:
+            with col:
+                border = "#58a6ff" if is_mid else "#21262d"
+                val_color = "#e6edf3" if is_mid else "#8b949e"
+                st.markdown(f"""
+                <div style="background:#161b22; border:1px solid {border};
+                            border-radius:6px; padding:12px 8px; text-align:center;">
+                    <div style="font-size:0.65rem; font-weight:500; color:#484f58;
+                                text-transform:uppercase; letter-spacing:0.04em; margin-bottom:5px;">
+                        {label}
+                    </div>
+                    <div style="font-size:0.95rem; font-weight:600; color:{val_color};
+                                font-family:'Inter',system-ui,sans-serif;">
+                        ${val:,.0f}
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
 
-        # Market context for chosen experience level
-        avg_for_exp = df[df["experience_level"] == experience_code]["salary_in_usd"].mean()
-        avg_for_title = df[df["job_title"] == job_title]["salary_in_usd"].mean()
-        median_overall = df["salary_in_usd"].median()
-
-        ctx1, ctx2, ctx3 = st.columns(3)
-        with ctx1:
-            st.metric(
-                f"{experience_code} Avg",
-                f"${avg_for_exp:,.0f}",
-                help="Average salary for your selected experience level across all jobs.",
-            )
-        with ctx2:
-            st.metric(
-                "Role Avg",
-                f"${avg_for_title:,.0f}" if not pd.isna(avg_for_title) else "N/A",
-                help="Average salary for this specific job title.",
+        # Market comparison bar
+        market_avg = aggs.overall["mean"]
+        pct_vs_market = ((predicted_salary - market_avg) / market_avg) * 100
+        direction     = "above" if pct_vs_market >= 0 else "below"
+        badge_color   = "#3fb950" if pct_vs_market >= 0 else "#f85149"
+        arrow         = "+" if pct_vs_market >= 0 else "-"
+
+        badge_bg = "#1a2b1f" if pct_vs_market >= 0 else "#2b1a1f"
+        st.markdown(f"""
+        <div style="background:#161b22; border:1px solid #21262d; border-radius:6px;
+                    padding:14px 16px; margin-bottom:12px; display:flex;
+                    align-items:center; gap:12px;">
+            <span style="display:inline-block; background:{badge_bg}; color:{badge_color};
+                         font-size:0.8rem; font-weight:600; padding:3px 10px;
+                         border-radius:4px; white-space:nowrap;">
+                {arrow} {abs(pct_vs_market):.1f}% vs market
+            </span>
+            <span style="font-size:0.8rem; color:#8b949e;">
+                {direction} market average of ${market_avg:,.0f}
+            </span>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # Input summary card
+        location_rows = ""
+        if result.get("locations"):
+            location_rows = (
+                f'<tr><td style="color:#484f58; padding:3px 0;">Location</td>'
+                f'<td style="color:#e6edf3;">{result["locations"]["company_location"]} '
+                f'(resides in {result["locations"]["employee_residence"]})</td></tr>'
             )
-        with ctx3:
-            st.metric(
-                "Market Median",
-                f"${median_overall:,.0f}",
-                help="Overall median salary in the dataset.",
+        if result.get("segment"):
+            location_rows += (
+                f'<tr><td style="color:#484f58; padding:3px 0;">Model</td>'
+                f'<td style="color:#e6edf3;">{result["segment"].replace("=", ": ")}</td></tr>'
             )
+        exp_display = result["exp_label"].split(" - ")[1].strip() if " - " in result["exp_label"] else result["exp_label"]
+        st.markdown(f"""
+        <div style="background:#161b22; border:1px solid #21262d; border-radius:6px;
+                    padding:14px 16px; margin-bottom:14px;">
+            <p style="font-size:0.65rem; font-weight:600; color:#484f58;
+                      letter-spacing:0.05em; text-transform:uppercase; margin:0 0 10px 0;">
+                Input Summary
+            </p>
+            <table style="width:100%; border-collapse:collapse; font-size:0.8rem;">
+                <tr><td style="color:#484f58; padding:3px 0; width:80px;">Role</td>
+                    <td style="color:#e6edf3;">{result["job_title"]}</td></tr>
+                <tr><td style="color:#484f58; padding:3px 0;">Level</td>
+                    <td style="color:#e6edf3;">{result["experience_code"]} &mdash; {exp_display}</td></tr>
+                <tr><td style="color:#484f58; padding:3px 0;">Remote</td>
+                    <td style="color:#e6edf3;">{REMOTE_MAP[result["remote_ratio"]]}</td></tr>
+                {location_rows}
+            </table>
+        </div>
+        """, unsafe_allow_html=True)
 
-        st.markdown("<br>", unsafe_allow_html=True)
-        predict_clicked = st.button("Predict Salary", use_container_width=True)
-
-    # ── RIGHT : Results ───────────────────────────────────────────────────────
-    with pred_right:
-        st.markdown('<p style="font-size:0.72rem; font-weight:600; color:#484f58; letter-spacing:0.06em; text-transform:uppercase; margin:0 0 14px 0;">Prediction Result</p>', unsafe_allow_html=True)
-
-        if not predict_clicked:
-            # Placeholder state
-            st.markdown("""
-            <div style="background:#161b22; border:1px solid #21262d; border-radius:8px;
-                        padding:48px 24px; text-align:center; margin-top:8px;">
-                <div style="font-size:1.5rem; color:#30363d; margin-bottom:12px; font-weight:300;">&#11835;</div>
-                <div style="font-family:'Inter',system-ui,sans-serif; font-size:0.9rem;
-                            font-weight:500; color:#484f58; margin-bottom:6px;">
-                    No prediction yet
-                </div>
-                <div style="font-family:'Inter',system-ui,sans-serif; font-size:0.8rem; color:#30363d;">
-                    Select your profile and click Predict Salary
-                </div>
+        # Explanation – precomputed tree-path contributions (baseline + Σ = prediction)
+        baseline, contributions = split_contributions(result)
+        if contributions:
+            scale = max(abs(value) for value in contributions.values()) or 1.0
+            driver_rows = ""
+            for feature, amount in sorted(contributions.items(), key=lambda item: -abs(item[1])):
+                color = "#3fb950" if amount >= 0 else "#f85149"
+                driver_rows += f"""
+                <tr><td style="color:#484f58; padding:3px 0; width:130px;">{FEATURE_LABELS.get(feature, feature)}</td>
+                    <td><div style="background:{color}; height:6px; border-radius:3px;
+                                    width:{abs(amount) / scale * 100:.0f}%;"></div></td>
+                    <td style="color:{color}; text-align:right; width:90px;">{'+' if amount >= 0 else '−'}${abs(amount):,.0f}</td></tr>"""
+            st.markdown(f"""
+            <div style="background:#161b22; border:1px solid #21262d; border-radius:6px;
+                        padding:14px 16px; margin-bottom:14px;">
+                <p style="font-size:0.65rem; font-weight:600; color:#484f58;
+                          letter-spacing:0.05em; text-transform:uppercase; margin:0 0 10px 0;">
+                    What moved the estimate &nbsp;&middot;&nbsp; baseline ${baseline:,.0f}
+                </p>
+                <table style="width:100%; border-collapse:collapse; font-size:0.8rem;">{driver_rows}
+                </table>
             </div>
             """, unsafe_allow_html=True)
 
+        # Comparable records – real salaries of the closest peer group
+        peers = peer_index().lookup({
+            "experience_level": result["experience_code"],
+            "job_title":        result["job_title"],
+            "remote_ratio":     result["remote_ratio"],
+        })
+        if peers is not None:
+            with st.expander(f"Comparable records: {peers['count']:,} ({peers['level'].lower()})", expanded=False):
+                pct = peers["percentiles"]
+                peer_cols = st.columns(3)
+                peer_cols[0].metric("P25", f"${pct[25]:,.0f}")
+                peer_cols[1].metric("Median", f"${pct[50]:,.0f}")
+                peer_cols[2].metric("P75", f"${pct[75]:,.0f}")
+                st.caption(f"P10 ${pct[10]:,.0f} · P90 ${pct[90]:,.0f} · mean ${peers['mean']:,.0f}")
+                st.dataframe(
+                    peers["sample"][EXPLORER_COLUMNS],
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "salary_in_usd": st.column_config.NumberColumn("Salary (USD)", format="$%d"),
+                        "remote_ratio":  st.column_config.NumberColumn("Remote %",     format="%d%%"),
+                    },
+                )
+
+        # What-if panel – all 12 experience × remote combinations from one cached batch
+        with st.expander("What-if: experience level × work arrangement", expanded=False):
+            locations    = result.get("locations") or {}
+            location_key = tuple(locations[column] for column in LOCATION_COLUMNS) if locations else ()
+            bundle       = artifact_store().current()
+            sensitivity, top_titles = what_if_panel(
+                result["experience_code"], result["job_title"], result["remote_ratio"],
+                location_key, result.get("segment"), bundle.version, bundle,
+            )
+            level_names = {code: label.split(" - ")[1] for label, code in EXP_LEVEL_MAP.items()}
+            st.dataframe(
+                sensitivity
+                .rename(index=level_names, columns=REMOTE_MAP)
+                .style.format("${:,.0f}"),
+                use_container_width=True,
+            )
+            st.caption(
+                f"Top {len(top_titles)} predicted titles · {result['experience_code']} · "
+                f"{REMOTE_MAP[result['remote_ratio']]}"
+            )
+            st.dataframe(
+                top_titles.rename("Predicted (USD)").to_frame().style.format("${:,.0f}"),
+                use_container_width=True,
+            )
+
+
+def render_cache_stats() -> None:
+    """Memo / disk cache / PDF pool / segment counters under the result card."""
+    memo_stats = get_prediction_memo().stats()
+    disk_stats = get_disk_cache().stats()
+    pdf_stats  = get_pdf_pool().stats()
+    render_ms  = f"{pdf_stats['last_seconds'] * 1000:,.0f} ms last / {pdf_stats['p50_seconds'] * 1000:,.0f} ms p50" \
+        if pdf_stats["completed"] else "no reports yet"
+    st.markdown(f"""
+    <div style="font-size:0.7rem; color:#484f58; line-height:1.7; margin-top:8px;">
+        Prediction cache: {memo_stats['hits']:,} hits / {memo_stats['misses']:,} misses<br>
+        Hit rate: {memo_stats['hit_rate'] * 100:.1f}% &nbsp;&middot;&nbsp; {memo_stats['size']:,}/{memo_stats['maxsize']:,} entries<br>
+        Disk cache: {disk_stats['hits']:,} hits / {disk_stats['misses']:,} misses &nbsp;&middot;&nbsp;
+        {(disk_stats['size_bytes'] or 0) / 1024 ** 2:,.0f}/{disk_stats['max_bytes'] / 1024 ** 2:,.0f} MB &nbsp;&middot;&nbsp;
+        {disk_stats['evictions']:,} evictions<br>
+        PDF pool: {pdf_stats['queued']} queued &nbsp;&middot;&nbsp; {pdf_stats['running']}/{pdf_stats['workers']} busy
+        &nbsp;&middot;&nbsp; render {render_ms}
+    </div>
+    """, unsafe_allow_html=True)
+
+    seg_stats = artifact_store().current().segments.stats()
+    if seg_stats["available"]:
+        load_times = ", ".join(f"{name} {secs * 1000:,.0f} ms" for name, secs in seg_stats["load_seconds"].items())
+        st.markdown(f"""
+        <div style="font-size:0.7rem; color:#484f58; line-height:1.7;">
+            Segment models: {len(seg_stats['resident'])}/{seg_stats['available']} resident &nbsp;&middot;&nbsp;
+            {seg_stats['resident_bytes'] / 1024 ** 2:,.0f}/{seg_stats['budget_bytes'] / 1024 ** 2:,.0f} MB &nbsp;&middot;&nbsp;
+            {seg_stats['evictions']:,} evictions<br>
+            Load times: {load_times or "none loaded yet"}
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def pdf_pending(result) -> bool:
+    """True while a result's PDF report is queued or rendering."""
+    return FPDF_AVAILABLE and result is not None and "pdf_bytes" not in result and "pdf_error" not in result
+
+
+def start_pdf_report(result: dict) -> None:
+    """Serve the report from the disk cache, or queue it on the background pool."""
+    if not FPDF_AVAILABLE:
+        return
+    baseline, contributions = split_contributions(result)
+    report_args = {
+        "job_title":        result["job_title"],
+        "experience":       result["experience_code"],
+        "remote_ratio":     result["remote_ratio"],
+        "predicted_salary": result["predicted"],
+        "low":              result["p10"],
+        "high":             result["p90"],
+        "baseline":         baseline,
+        "contributions":    contributions,
+        "training_rows":    result.get("training_rows"),
+    }
+    # Identical reports (same inputs, same chart images) come straight from disk
+    pdf_key   = pdf_cache_key(report_args)
+    pdf_bytes = get_disk_cache().get("pdf", pdf_key)
+    if pdf_bytes is not None:
+        result["pdf_bytes"] = pdf_bytes
+    else:
+        # None when the queue is full; the poller retries
+        result["pdf_job"] = get_pdf_pool().submit(partial(render_cached_pdf, get_disk_cache(), pdf_key), **report_args)
+
+
+def pdf_download_section() -> None:
+    """Download button of the current result's report, or its progress while pending."""
+    result = st.session_state.get("prediction")
+    if result is None:
+        return
+    if not FPDF_AVAILABLE:
+        st.warning("PDF export requires fpdf2. Install it with: pip install fpdf2")
+        return
+
+    if result.get("pdf_job") is None and pdf_pending(result):
+        start_pdf_report(result)
+
+    done, pdf_bytes, error = job_result(result.get("pdf_job"))
+    if done:
+        if error is None:
+            result["pdf_bytes"] = pdf_bytes
         else:
-            # ── PREDICTION PIPELINE ───────────────────────────────────────────
-            with st.spinner("Running model inference..."):
+            result["pdf_error"] = error
+        result["pdf_job"] = None
+
+    if "pdf_bytes" in result:
+        st.download_button(
+            label="Download PDF Report",
+            data=result["pdf_bytes"],
+            file_name="CareerScout_Report.pdf",
+            mime="application/pdf",
+            use_container_width=True,
+        )
+    elif "pdf_error" in result:
+        st.error(f"PDF report failed: {result['pdf_error']}")
+    else:
+        pool_stats = get_pdf_pool().stats()
+        st.button(
+            "Preparing PDF Report..." if result.get("pdf_job") is not None else "PDF queue full – retrying...",
+            disabled=True,
+            use_container_width=True,
+        )
+        st.caption(f"{pool_stats['queued']} queued · {pool_stats['running']}/{pool_stats['workers']} rendering")
 
-                # 1. Build 1-row input DataFrame
-                input_df = pd.DataFrame([{
-                    "experience_level": experience_code,
-                    "job_title":        job_title,
-                    "remote_ratio":     remote_ratio,
-                }])
 
-                # 2. Encode categoricals (same transform as training)
-                input_encoded = pd.get_dummies(input_df, drop_first=True)
+@st.fragment
+def render_pdf_download() -> None:
+    """PDF download area of a finished (or failed) report."""
+    pdf_download_section()
 
-                # 3. Align to the exact column schema the model was trained on
-                #    Missing columns → 0, extra columns → dropped
-                input_encoded = input_encoded.reindex(columns=model_columns, fill_value=0)
 
-                # 4. Run inference
-                predicted_salary = model.predict(input_encoded)[0]
+@st.fragment(run_every=PDF_POLL_SECONDS)
+def poll_pdf_download() -> None:
+    """
+    PDF download area of a pending report. Streamlit reruns it on a timer
+    without blocking the script thread; once the report is ready one app
+    rerun swaps it for render_pdf_download, which stops the polling.
+    """
+    pdf_download_section()
+    if not pdf_pending(st.session_state.get("prediction")):
+        st.rerun()
 
-            # ── RESULT DISPLAY ─────────────────────────────────────────────────
-            low   = predicted_salary * 0.85
-            high  = predicted_salary * 1.15
 
-            # Main salary card
-            st.markdown(f"""
-            <div style="background:#161b22; border:1px solid #30363d; border-radius:8px;
-                        padding:28px 24px; text-align:center; margin-bottom:12px;">
-                <div style="font-family:'Inter',system-ui,sans-serif; font-size:0.72rem;
-                            font-weight:500; color:#8b949e; letter-spacing:0.05em;
-                            text-transform:uppercase; margin-bottom:10px;">
-                    Predicted Annual Salary
-                </div>
-                <div style="font-family:'Inter',system-ui,sans-serif; font-size:2.4rem;
-                            font-weight:700; color:#e6edf3; line-height:1;
-                            letter-spacing:-0.02em; margin-bottom:4px;">
-                    ${predicted_salary:,.0f}
-                </div>
-                <div style="font-size:0.75rem; color:#484f58;">USD per year</div>
-            </div>
-            """, unsafe_allow_html=True)
+@st.fragment
+def render_predictor() -> None:
+    """
+    Predictor input form fragment (left column). Selectbox changes rerun only
+    this form; a Predict click stores the result, queues its PDF report and
+    reruns the app so the result card and the PDF poller pick it up.
+    """
+    st.markdown('<p style="font-size:0.72rem; font-weight:600; color:#484f58; letter-spacing:0.06em; text-transform:uppercase; margin:0 0 14px 0;">Input Profile</p>', unsafe_allow_html=True)
+
+    # Experience level
+    exp_label = st.selectbox(
+        "Experience Level",
+        options=list(EXP_LEVEL_MAP.keys()),
+        index=2,
+        help="Select the experience level that best describes your seniority.",
+    )
+    experience_code = EXP_LEVEL_MAP[exp_label]
 
-            # Range cards
-            r1, r2, r3 = st.columns(3)
-            for col, label, val, is_mid in [
-                (r1, "Low (-15%)",  low,              False),
-                (r2, "Predicted",   predicted_salary, True),
-                (r3, "High (+15%)", high,             False),
-            ]:
-                with col:
-                    border = "#58a6ff" if is_mid else "#21262d"
-                    val_color = "#e6edf3" if is_mid else "#8b949e"
-                    st.markdown(f"""
-                    <div style="background:#161b22; border:1px solid {border};
-                                border-radius:6px; padding:12px 8px; text-align:center;">
-                        <div style="font-size:0.65rem; font-weight:500; color:#484f58;
-                                    text-transform:uppercase; letter-spacing:0.04em; margin-bottom:5px;">
-                            {label}
-                        </div>
-                        <div style="font-size:0.95rem; font-weight:600; color:{val_color};
-                                    font-family:'Inter',system-ui,sans-serif;">
-                            ${val:,.0f}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+    # Job title – server-side search so only a few dozen candidates reach the browser
+    title_query = st.text_input(
+        "Search Job Titles",
+        placeholder="e.g. data sci, ML eng, analyst",
+        help=f"Prefix and fuzzy search over {len(title_index()):,} job titles, most common first.",
+    )
+    title_options = title_index().search(title_query, limit=TITLE_SEARCH_LIMIT)
+    if not title_options:
+        st.caption("No matching titles – showing the most common ones.")
+        title_options = title_index().search("", limit=TITLE_SEARCH_LIMIT)
+
+    job_title = st.selectbox(
+        "Job Title",
+        options=title_options,
+        index=title_options.index("Data Scientist") if "Data Scientist" in title_options else 0,
+        help=f"Top {len(title_options)} matches for your search.",
+    )
 
-            st.markdown("<br>", unsafe_allow_html=True)
+    # Remote ratio
+    remote_ratio = st.select_slider(
+        "Work Arrangement",
+        options=[0, 50, 100],
+        value=100,
+        format_func=lambda v: REMOTE_MAP_EMOJI[v],
+        help="0 = fully on-site  ·  50 = hybrid  ·  100 = fully remote",
+    )
 
-            # Market comparison bar
-            market_avg = df["salary_in_usd"].mean()
-            pct_vs_market = ((predicted_salary - market_avg) / market_avg) * 100
-            direction     = "above" if pct_vs_market >= 0 else "below"
-            badge_color   = "#3fb950" if pct_vs_market >= 0 else "#f85149"
-            arrow         = "+" if pct_vs_market >= 0 else "-"
+    # Locations – only when the model was trained with a location encoding
+    locations = None
+    if uses_locations(artifact_store().current().feature_config):
+        countries = location_options()
+        default   = countries.index("US") if "US" in countries else 0
+        loc_col1, loc_col2 = st.columns(2)
+        with loc_col1:
+            company_location = st.selectbox("Company Location", options=countries, index=default)
+        with loc_col2:
+            employee_residence = st.selectbox("Employee Residence", options=countries, index=default)
+        locations = {"company_location": company_location, "employee_residence": employee_residence}
+
+    # Segment-specific forests – loaded on first use, evicted under memory pressure
+    segment = None
+    segment_names = artifact_store().current().segments.names
+    if segment_names:
+        segment = st.selectbox(
+            "Model Segment",
+            options=[None] + segment_names,
+            format_func=lambda name: "Global model" if name is None else name.replace("=", ": "),
+            help="Use a model trained only on one region or work year.",
+        )
 
-            badge_bg = "#1a2b1f" if pct_vs_market >= 0 else "#2b1a1f"
-            st.markdown(f"""
-            <div style="background:#161b22; border:1px solid #21262d; border-radius:6px;
-                        padding:14px 16px; margin-bottom:12px; display:flex;
-                        align-items:center; gap:12px;">
-                <span style="display:inline-block; background:{badge_bg}; color:{badge_color};
-                             font-size:0.8rem; font-weight:600; padding:3px 10px;
-                             border-radius:4px; white-space:nowrap;">
-                    {arrow} {abs(pct_vs_market):.1f}% vs market
-                </span>
-                <span style="font-size:0.8rem; color:#8b949e;">
-                    {direction} market average of ${market_avg:,.0f}
-                </span>
-            </div>
-            """, unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
 
-            # Input summary card
-            exp_display = exp_label.split(" - ")[1].strip() if " - " in exp_label else exp_label
-            st.markdown(f"""
-            <div style="background:#161b22; border:1px solid #21262d; border-radius:6px;
-                        padding:14px 16px; margin-bottom:14px;">
-                <p style="font-size:0.65rem; font-weight:600; color:#484f58;
-                          letter-spacing:0.05em; text-transform:uppercase; margin:0 0 10px 0;">
-                    Input Summary
-                </p>
-                <table style="width:100%; border-collapse:collapse; font-size:0.8rem;">
-                    <tr><td style="color:#484f58; padding:3px 0; width:80px;">Role</td>
-                        <td style="color:#e6edf3;">{job_title}</td></tr>
-                    <tr><td style="color:#484f58; padding:3px 0;">Level</td>
-                        <td style="color:#e6edf3;">{experience_code} &mdash; {exp_display}</td></tr>
-                    <tr><td style="color:#484f58; padding:3px 0;">Remote</td>
-                        <td style="color:#e6edf3;">{REMOTE_MAP[remote_ratio]}</td></tr>
-                </table>
-            </div>
-            """, unsafe_allow_html=True)
+    # Market context for chosen experience level
+    avg_for_exp = aggs.value("experience_level", experience_code)
+    avg_for_title = aggs.value("job_title", job_title)
+    median_overall = overall_median()
+
+    ctx1, ctx2, ctx3 = st.columns(3)
+    with ctx1:
+        st.metric(
+            f"{experience_code} Avg",
+            f"${avg_for_exp:,.0f}",
+            help="Average salary for your selected experience level across all jobs.",
+        )
+    with ctx2:
+        st.metric(
+            "Role Avg",
+            f"${avg_for_title:,.0f}" if not pd.isna(avg_for_title) else "N/A",
+            help="Average salary for this specific job title.",
+        )
+    with ctx3:
+        st.metric(
+            "Market Median",
+            f"${median_overall:,.0f}",
+            help="Overall median salary in the dataset.",
+        )
 
-            # PDF download
-            if not FPDF_AVAILABLE:
-                st.warning("PDF export requires fpdf2. Install it with: pip install fpdf2")
-            else:
-                pdf_bytes = generate_pdf_report(
-                job_title        = job_title,
-                experience       = experience_code,
-                remote_ratio     = remote_ratio,
-                predicted_salary = predicted_salary,
-            )
+    st.markdown("<br>", unsafe_allow_html=True)
+    predict_clicked = st.button("Predict Salary", use_container_width=True)
+
+    # ── PREDICTION PIPELINE ───────────────────────────────────────────────
+    if predict_clicked:
+        with st.spinner("Running model inference..."):
+            prediction = predict_profile(experience_code, job_title, remote_ratio, locations, segment)
+
+        # Persist the result so later reruns (e.g. the PDF download) keep it
+        st.session_state["prediction"] = {
+            "experience_code": experience_code,
+            "exp_label":       exp_label,
+            "job_title":       job_title,
+            "remote_ratio":    remote_ratio,
+            "locations":       locations,
+            **prediction,
+        }
+        start_pdf_report(st.session_state["prediction"])
+        st.rerun()
 
-                st.download_button(
-                    label="Download PDF Report",
-                    data=pdf_bytes,
-                    file_name="CareerScout_Report.pdf",
-                    mime="application/pdf",
-                    use_container_width=True,
-                )
\ No newline at end of file
+
+with tab_predictor:
+    pred_left, pred_right = st.columns([1, 1], gap="large")
+    with pred_left:
+        render_predictor()
+    with pred_right:
+        render_prediction_result()
+        # Only a pending report mounts the polling fragment
+        if pdf_pending(st.session_state.get("prediction")):
+            poll_pdf_download()
+        else:
+            render_pdf_download()
+        render_cache_stats()
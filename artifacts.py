@@ -0,0 +1,362 @@
+
+import gc
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import joblib
+
+
+# ==============================================================================
+# VERSIONED ARTEFACT REGISTRY
+# ==============================================================================
+#
+# artifacts/
+# ├── manifest.json              {"current": "<version>", "history": [...]}
+# ├── 20250301-101500-1a2b3c4d/  immutable bundle written by 2_model_training.py
+# │   ├── model.pkl
+# │   ├── model_columns.pkl
+# │   ├── title_map.pkl                 raw → canonical job titles the model was trained on
+# │   ├── segments/work_year=2024.pkl   optional segment-specific forests
+# │   └── ...
+# └── ...
+#
+# Bundles are written to a temporary directory and renamed into place, and the
+# manifest is replaced atomically, so a reader never sees a half-written model.
+
+ARTIFACTS_DIR  = "artifacts"
+MANIFEST_PATH  = os.path.join(ARTIFACTS_DIR, "manifest.json")
+SEGMENTS_DIR   = "segments"
+
+DEFAULT_SEGMENT_BUDGET_BYTES = 512 * 1024 ** 2
+
+BUNDLE_FILES   = {
+    "model":            "model.pkl",
+    "model_columns":    "model_columns.pkl",
+    "feature_config":   "feature_config.pkl",
+    "prediction_table": "prediction_table.pkl",
+    "title_map":        "title_map.pkl",
+}
+
+# Top-level files used when no manifest exists yet
+LEGACY_FILES   = {
+    "model":            "salary_predictor.pkl",
+    "model_columns":    "model_columns.pkl",
+    "feature_config":   "feature_config.pkl",
+    "prediction_table": "prediction_table.pkl",
+    "title_map":        "title_map.json",
+}
+
+
+def _load_file(path: str):
+    """A bundle file (joblib, or JSON for the legacy title map); None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return joblib.load(path)
+
+
+def _write_json_atomic(path: str, payload: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path: str = MANIFEST_PATH) -> dict:
+    """Current manifest, or {} if nothing has been published yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def publish_bundle(
+    artefacts: dict,
+    metadata: dict = None,
+    segments: dict = None,
+    root: str = ARTIFACTS_DIR,
+) -> str:
+    """
+    Write `artefacts` ({name: object}, names from BUNDLE_FILES) and optional
+    segment models ({segment_name: model}) as a new immutable bundle and point
+    the manifest at it. Returns the new version.
+    """
+    os.makedirs(root, exist_ok=True)
+    stamp   = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    tmp_dir = os.path.join(root, f".tmp-{stamp}-{os.getpid()}")
+    os.makedirs(os.path.join(tmp_dir, SEGMENTS_DIR))
+
+    files = [(os.path.join(tmp_dir, BUNDLE_FILES[name]), obj) for name, obj in artefacts.items() if obj is not None]
+    files += [(os.path.join(tmp_dir, SEGMENTS_DIR, f"{name}.pkl"), model) for name, model in sorted((segments or {}).items())]
+
+    digest = hashlib.sha256()
+    for path, obj in files:
+        joblib.dump(obj, path)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+
+    version = f"{stamp}-{digest.hexdigest()[:8]}"
+    os.rename(tmp_dir, os.path.join(root, version))
+
+    manifest = read_manifest(os.path.join(root, "manifest.json"))
+    history  = manifest.get("history", [])
+    history.append({
+        "version":  version,
+        "created":  datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files":    sorted(name for name, obj in artefacts.items() if obj is not None),
+        "segments": sorted(segments or {}),
+        **(metadata or {}),
+    })
+    _write_json_atomic(os.path.join(root, "manifest.json"), {"current": version, "history": history})
+    return version
+
+
+def prune_bundles(keep: int = 3, root: str = ARTIFACTS_DIR) -> list:
+    """
+    Delete all but the newest `keep` bundles; returns removed versions. The
+    current bundle and the one before it are never removed: a running app
+    serves the previous version until its next poll and loads segment files
+    from it lazily.
+    """
+    manifest = read_manifest(os.path.join(root, "manifest.json"))
+    versions = [entry["version"] for entry in manifest.get("history", [])]
+    current  = manifest.get("current")
+    serving  = {current}
+    if current in versions and versions.index(current) > 0:
+        serving.add(versions[versions.index(current) - 1])
+    removed  = []
+    for version in versions[:-keep]:
+        path = os.path.join(root, version)
+        if version not in serving and os.path.isdir(path):
+            shutil.rmtree(path)
+            removed.append(version)
+    return removed
+
+
+# ==============================================================================
+# SEGMENT MODELS  –  lazily loaded, memory-budgeted LRU
+# ==============================================================================
+
+def forest_nbytes(model) -> int:
+    """Resident size of a fitted forest's node and value arrays."""
+    total = 0
+    for tree in getattr(model, "estimators_", []):
+        state  = tree.tree_.__getstate__()
+        total += state["nodes"].nbytes + state["values"].nbytes
+    return total
+
+
+class SegmentModelRegistry:
+    """
+    Segment forests of one bundle. A model is loaded from disk on first use
+    and kept in an LRU; the least recently used ones are evicted whenever the
+    resident total exceeds `budget_bytes` (the model just loaded always stays).
+    """
+
+    def __init__(self, directory: str, budget_bytes: int = DEFAULT_SEGMENT_BUDGET_BYTES):
+        self.directory    = directory
+        self.budget_bytes = budget_bytes
+        self.names        = sorted(
+            file[:-4] for file in os.listdir(directory) if file.endswith(".pkl")
+        ) if os.path.isdir(directory) else []
+
+        self.hits         = 0
+        self.misses       = 0
+        self.evictions    = 0
+        self.load_seconds = {}
+        self._models      = OrderedDict()     # name → (model, nbytes)
+        self._lock        = threading.Lock()
+        self._load_locks  = {}
+
+    def get(self, name: str):
+        """The forest for segment `name`, loading (and evicting) as needed."""
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                self.hits += 1
+                return self._models[name][0]
+            self.misses += 1
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # One loader per segment; concurrent requests for it wait and reuse the result
+        with load_lock:
+            with self._lock:
+                if name in self._models:
+                    return self._models[name][0]
+
+            start = time.perf_counter()
+            model = joblib.load(os.path.join(self.directory, f"{name}.pkl"))
+            self.load_seconds[name] = time.perf_counter() - start
+
+            with self._lock:
+                self._models[name] = (model, forest_nbytes(model))
+                evicted = self._evict()
+        if evicted:
+            gc.collect()
+        return model
+
+    def _evict(self) -> int:
+        evicted = 0
+        while len(self._models) > 1 and self.resident_bytes() > self.budget_bytes:
+            self._models.popitem(last=False)
+            self.evictions += 1
+            evicted += 1
+        return evicted
+
+    def resident_bytes(self) -> int:
+        return sum(nbytes for _, nbytes in self._models.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "available":      len(self.names),
+                "resident":       list(self._models),
+                "resident_bytes": self.resident_bytes(),
+                "budget_bytes":   self.budget_bytes,
+                "hits":           self.hits,
+                "misses":         self.misses,
+                "evictions":      self.evictions,
+                "load_seconds":   dict(self.load_seconds),
+            }
+
+
+# ==============================================================================
+# LOADED BUNDLE + HOT-SWAPPING STORE
+# ==============================================================================
+
+class ModelBundle:
+    """Everything one model version needs at inference time."""
+
+    def __init__(self, version: str, files: dict, segments_dir: str = None,
+                 segment_budget_bytes: int = DEFAULT_SEGMENT_BUDGET_BYTES, metadata: dict = None):
+        self.version   = version
+        self.loaded_at = time.time()
+        self.metadata  = metadata or {}         # the version's manifest entry (rows, MAE, ...)
+        loaded = {name: _load_file(path) for name, path in files.items()}
+        self.model            = loaded["model"]
+        self.model_columns    = loaded["model_columns"]
+        self.feature_config   = loaded["feature_config"] or {"location_encoding": "none"}
+        self.prediction_table = loaded["prediction_table"]
+        # Bundles published before the title map was bundled use the top-level one
+        if loaded["title_map"] is None:
+            loaded["title_map"] = _load_file(LEGACY_FILES["title_map"])
+        self.title_map        = loaded["title_map"] or {}
+        self.segments         = SegmentModelRegistry(segments_dir or "", segment_budget_bytes)
+
+    @classmethod
+    def from_version(cls, version: str, root: str = ARTIFACTS_DIR, **kwargs) -> "ModelBundle":
+        directory = os.path.join(root, version)
+        history   = read_manifest(os.path.join(root, "manifest.json")).get("history", [])
+        return cls(
+            version,
+            {name: os.path.join(directory, file) for name, file in BUNDLE_FILES.items()},
+            segments_dir=os.path.join(directory, SEGMENTS_DIR),
+            metadata=next((entry for entry in history if entry["version"] == version), None),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_legacy_files(cls, **kwargs) -> "ModelBundle":
+        stat = os.stat(LEGACY_FILES["model"])
+        return cls(f"legacy-{stat.st_mtime_ns}", dict(LEGACY_FILES), **kwargs)
+
+
+class ArtifactStore:
+    """
+    Serves the current ModelBundle and swaps in new versions without a restart.
+
+    current() stats the manifest at most every `poll_interval` seconds. When it
+    names a new version the bundle is loaded on a background thread while the
+    old one keeps serving; the swap itself is a single reference assignment.
+    Callers take one bundle reference per request, so in-flight requests finish
+    on the version they started with and the old bundle is freed once the last
+    of them drops it.
+    """
+
+    def __init__(self, root: str = ARTIFACTS_DIR, poll_interval: float = 5.0,
+                 segment_budget_bytes: int = DEFAULT_SEGMENT_BUDGET_BYTES):
+        self.root          = root
+        self.poll_interval = poll_interval
+        self.segment_budget_bytes = segment_budget_bytes
+        self.swaps         = 0
+        self.last_error    = None
+        self._lock         = threading.Lock()
+        self._loading      = None
+        self._last_poll    = 0.0
+        self._manifest_mtime = None
+
+        manifest = read_manifest(self._manifest_path)
+        if manifest.get("current"):
+            self._bundle = ModelBundle.from_version(manifest["current"], root, segment_budget_bytes=segment_budget_bytes)
+            self._manifest_mtime = os.stat(self._manifest_path).st_mtime_ns
+        else:
+            self._bundle = ModelBundle.from_legacy_files(segment_budget_bytes=segment_budget_bytes)
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root, "manifest.json")
+
+    def current(self) -> ModelBundle:
+        """The bundle to use for this request (checks for a newer one first)."""
+        self._poll()
+        return self._bundle
+
+    def _poll(self) -> None:
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return
+        self._last_poll = now
+
+        try:
+            mtime = os.stat(self._manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+
+        version = read_manifest(self._manifest_path).get("current")
+        with self._lock:
+            if version is None or version == self._bundle.version or self._loading == version:
+                self._manifest_mtime = mtime
+                return
+            self._loading = version
+
+        threading.Thread(target=self._load, args=(version, mtime), daemon=True).start()
+
+    def _load(self, version: str, mtime: int) -> None:
+        try:
+            bundle = ModelBundle.from_version(version, self.root, segment_budget_bytes=self.segment_budget_bytes)
+        except Exception as exc:            # keep serving the old version
+            self.last_error = f"{version}: {exc}"
+            with self._lock:
+                # Not retried until the manifest changes again
+                self._manifest_mtime = mtime
+                self._loading = None
+            return
+
+        with self._lock:
+            old, self._bundle = self._bundle, bundle
+            self._manifest_mtime = mtime
+            self._loading = None
+            self.swaps += 1
+        del old
+        gc.collect()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "version":    self._bundle.version,
+                "loaded_at":  self._bundle.loaded_at,
+                "loading":    self._loading,
+                "swaps":      self.swaps,
+                "last_error": self.last_error,
+            }
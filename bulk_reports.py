@@ -0,0 +1,236 @@
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from artifacts import ArtifactStore
+from dataset import read_dataset
+from model_utils import (
+    EXPERIENCE_LEVELS,
+    FEATURE_COLUMNS,
+    LOCATION_COLUMNS,
+    REMOTE_RATIOS,
+    predict_profiles,
+    split_contributions,
+    uses_locations,
+)
+from report import FPDF_AVAILABLE, generate_pdf_report, render_chart_pages, render_prediction_page
+from title_normalization import canonicalize
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+
+DEFAULT_OUTPUT       = "CareerScout_Reports.zip"
+CLEAN_DATA_PATH      = "clean_salary_dataset.csv"
+CHUNK_ROWS           = 1_000   # profiles read and predicted per batch
+IN_FLIGHT_PER_WORKER = 4       # submitted-but-unwritten reports per worker
+
+ID_COLUMN            = "candidate_id"   # optional; the row number is used otherwise
+ERRORS_MEMBER        = "errors.csv"     # archive member listing the rows that were skipped
+
+
+# ==============================================================================
+# WORKER PROCESS
+# ==============================================================================
+#
+# Pages 2–5 (market charts) are the same for every candidate, so each worker
+# renders them once and appends the parsed pages to every personalised page 1.
+# Without pypdf the worker falls back to rendering the full report each time.
+
+_CHART_PAGES = None
+
+
+def _init_worker() -> None:
+    global _CHART_PAGES
+    if PYPDF_AVAILABLE:
+        _CHART_PAGES = PdfReader(io.BytesIO(render_chart_pages()))
+
+
+def render_candidate(profile: dict) -> bytes:
+    """Full report for one candidate (arguments as for generate_pdf_report)."""
+    if _CHART_PAGES is None:
+        return generate_pdf_report(**profile)
+
+    writer = PdfWriter()
+    writer.append(PdfReader(io.BytesIO(render_prediction_page(**profile))))
+    writer.append(_CHART_PAGES)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+def log(message: str) -> None:
+    """Progress goes to stderr so the ZIP can be streamed to stdout."""
+    print(message, file=sys.stderr, flush=True)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a CareerScout PDF report for every profile in a CSV")
+    parser.add_argument(
+        "profiles",
+        help=f"CSV with {', '.join(FEATURE_COLUMNS)} (+ location columns for location models, optional {ID_COLUMN})",
+    )
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT,
+        help=f"ZIP archive to write, or '-' for stdout (default {DEFAULT_OUTPUT})",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(),
+        help="render processes (default: all CPU cores)",
+    )
+    parser.add_argument(
+        "--chunk-rows", type=int, default=CHUNK_ROWS,
+        help=f"profiles read and predicted per batch (default {CHUNK_ROWS:,})",
+    )
+    return parser.parse_args()
+
+
+def report_name(candidate, used: set) -> str:
+    """File-system safe, unique archive member name for a candidate."""
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(candidate)).strip("_") or "candidate"
+    name, n = f"{stem}_CareerScout_Report.pdf", 1
+    while name in used:
+        n   += 1
+        name = f"{stem}_{n}_CareerScout_Report.pdf"
+    used.add(name)
+    return name
+
+
+def trained_titles(bundle) -> set:
+    """Canonical job titles the bundle's model was trained on."""
+    if bundle.title_map:
+        return set(bundle.title_map.values())
+    # Raw-title model: its job_title_* columns miss the dropped-first title, the data has them all
+    return set(read_dataset(columns=["job_title"], fallback_csv=CLEAN_DATA_PATH)["job_title"])
+
+
+def validate_profiles(features: pd.DataFrame, titles: set) -> pd.Series:
+    """Per-row reason a profile cannot be scored ('' when it is valid); titles must be canonical."""
+    remote = pd.to_numeric(features["remote_ratio"], errors="coerce")
+    checks = [
+        (~features["experience_level"].isin(EXPERIENCE_LEVELS), f"experience_level not in {EXPERIENCE_LEVELS}"),
+        (~remote.isin(REMOTE_RATIOS),                           f"remote_ratio not in {REMOTE_RATIOS}"),
+        (~features["job_title"].isin(titles),                   "job_title unknown to the model"),
+    ]
+    checks += [(features[column].isna(), f"{column} missing") for column in LOCATION_COLUMNS if column in features]
+
+    reasons = pd.Series("", index=features.index)
+    for failed, reason in checks:
+        reasons[failed] = reasons[failed].where(reasons[failed] == "", reasons[failed] + "; ") + reason
+    return reasons
+
+
+def drain(pending: dict, archive: zipfile.ZipFile, return_when) -> int:
+    """Write finished reports into the archive; returns how many were written."""
+    done, _ = wait(pending, return_when=return_when)
+    for future in done:
+        archive.writestr(pending.pop(future), future.result())
+    return len(done)
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+
+def main(args: argparse.Namespace) -> None:
+    if not FPDF_AVAILABLE:
+        log("❌  PDF generation requires fpdf2. Run: pip install fpdf2")
+        sys.exit(1)
+    if not PYPDF_AVAILABLE:
+        log("⚠  pypdf not installed – chart pages are re-rendered for every report (pip install pypdf).")
+
+    bundle    = ArtifactStore(poll_interval=float("inf")).current()
+    titles    = trained_titles(bundle)
+    required  = FEATURE_COLUMNS + (LOCATION_COLUMNS if uses_locations(bundle.feature_config) else [])
+    log(f"Model version {bundle.version}  ·  {args.workers} worker(s)")
+
+    # Checked before the archive is opened, so a bad CSV leaves no truncated ZIP behind
+    header  = pd.read_csv(args.profiles, nrows=0).columns
+    missing = [column for column in required if column not in header]
+    if missing:
+        log(f"❌  '{args.profiles}' is missing column(s): {missing}")
+        sys.exit(1)
+
+    output  = contextlib.nullcontext(sys.stdout.buffer) if args.output == "-" else open(args.output, "wb")
+    max_in_flight = args.workers * IN_FLIGHT_PER_WORKER
+    pending, used = {}, set()
+    written, errors = 0, []
+    start   = time.perf_counter()
+
+    with output as stream, \
+         zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+         ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+
+        for chunk in pd.read_csv(args.profiles, chunksize=args.chunk_rows):
+            # Invalid rows are skipped and listed in the archive instead of failing the run
+            features = chunk[required].copy()
+            features["job_title"] = canonicalize(features["job_title"], bundle.title_map)
+            reasons    = validate_profiles(features, titles)
+            candidates = chunk[ID_COLUMN] if ID_COLUMN in chunk.columns else chunk.index.to_series() + 1
+            invalid    = reasons != ""
+            errors    += [
+                {"row": row + 1, "candidate": candidate, "error": reason}
+                for row, candidate, reason in zip(chunk.index[invalid], candidates[invalid], reasons[invalid])
+            ]
+            chunk, features, candidates = chunk[~invalid], features[~invalid], candidates[~invalid]
+            if chunk.empty:
+                continue
+            features["remote_ratio"] = pd.to_numeric(features["remote_ratio"]).astype(int)
+
+            # One vectorised prediction per chunk, on canonical titles
+            predictions = predict_profiles(
+                bundle.model, bundle.model_columns, features,
+                feature_config=bundle.feature_config, table=bundle.prediction_table,
+            )
+
+            for candidate, profile, prediction in zip(candidates, chunk.itertuples(index=False), predictions.itertuples(index=False)):
+                # Bounded window of in-flight reports keeps memory flat
+                if len(pending) >= max_in_flight:
+                    written += drain(pending, archive, FIRST_COMPLETED)
+
+                baseline, contributions = split_contributions(prediction._asdict())
+                future = pool.submit(render_candidate, {
+                    "job_title":        profile.job_title,
+                    "experience":       profile.experience_level,
+                    "remote_ratio":     int(profile.remote_ratio),
+                    "predicted_salary": float(prediction.predicted),
+                    "low":              float(prediction.p10),
+                    "high":             float(prediction.p90),
+                    "baseline":         baseline,
+                    "contributions":    {feature: float(value) for feature, value in contributions.items()},
+                    "training_rows":    bundle.metadata.get("train_rows"),
+                })
+                pending[future] = report_name(candidate, used)
+
+            log(f"  {written:,} reports written, {len(pending):,} in flight, {len(errors):,} skipped ...")
+
+        written += drain(pending, archive, ALL_COMPLETED) if pending else 0
+        if errors:
+            archive.writestr(ERRORS_MEMBER, pd.DataFrame(errors).to_csv(index=False))
+            log(f"⚠  {len(errors):,} invalid row(s) skipped – see '{ERRORS_MEMBER}' in the archive")
+
+    elapsed = time.perf_counter() - start
+    log(f"✓ {written:,} reports → '{args.output}' in {elapsed:.1f}s ({written / max(elapsed, 1e-9):,.1f} reports/s)")
+
+
+# ==============================================================================
+# ENTRY POINT
+# ==============================================================================
+
+if __name__ == "__main__":
+    main(parse_args())
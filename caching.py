@@ -0,0 +1,52 @@
+
+import threading
+from collections import OrderedDict
+
+
+# ==============================================================================
+# PREDICTION MEMO  –  process-wide bounded LRU shared by every session
+# ==============================================================================
+
+class PredictionMemo:
+    """
+    Thread-safe LRU memo of prediction results with hit / miss counters.
+    Keys are (experience_code, job_title, remote_ratio, model_version) tuples.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits    = 0
+        self.misses  = 0
+        self._items  = OrderedDict()
+        self._lock   = threading.Lock()
+
+    def get_or_compute(self, key: tuple, compute):
+        """Return the memoised value for `key`, calling `compute()` only on a miss."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+
+        # Computed outside the lock so a slow miss never blocks cache hits
+        value = compute()
+
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        """Snapshot of the counters for display / monitoring."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits":     self.hits,
+                "misses":   self.misses,
+                "size":     len(self._items),
+                "maxsize":  self.maxsize,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
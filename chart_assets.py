@@ -0,0 +1,132 @@
+
+import io
+import json
+import os
+import threading
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+# ==============================================================================
+# CHART VARIANTS  –  one source figure, one file per delivery target
+# ==============================================================================
+#
+# chart_assets/
+# ├── manifest.json                               {"fig1_salary_distribution.png": {...}, ...}
+# ├── fig1_salary_distribution-w480.png           palette PNGs for the dashboard,
+# ├── fig1_salary_distribution-w960.png           one per WEB_WIDTHS
+# ├── fig1_salary_distribution-print.png          PRINT_DPI palette PNG for FPDF
+# └── ...
+#
+# 1_data_prep_and_eda.py renders every figure once at print resolution and
+# derives the variants from it. The dashboard picks the smallest web variant
+# that covers its column; the PDF embeds the print variant, which FPDF stores
+# as an indexed, flate-compressed image – smaller than a JPEG of the same
+# chart and without compression artifacts around the text.
+# Without Pillow the variants are plain PNGs rendered by matplotlib at the
+# target sizes. Readers fall back to the original fig*.png if a chart has no
+# variants.
+
+CHART_ASSETS_DIR = "chart_assets"
+MANIFEST_PATH    = os.path.join(CHART_ASSETS_DIR, "manifest.json")
+WEB_WIDTHS       = [480, 960, 1440]
+DASHBOARD_WIDTH  = 960      # pixels of a half-width dashboard column on a 2× display
+PRINT_WIDTH_MM   = 180      # image width on the PDF page
+PRINT_DPI        = 200
+WEB_COLORS       = 256      # palette size of the web variants
+PRINT_COLORS     = 256      # palette size of the print variant
+
+_MANIFEST      = (None, {})   # (mtime_ns, manifest) of the last read
+_MANIFEST_LOCK = threading.Lock()
+
+
+def _print_width_px() -> int:
+    return round(PRINT_WIDTH_MM / 25.4 * PRINT_DPI)
+
+
+def export_chart(fig, source_path: str, directory: str = CHART_ASSETS_DIR) -> dict:
+    """Write the web and print variants of a matplotlib figure; returns its manifest entry."""
+    os.makedirs(directory, exist_ok=True)
+    stem  = os.path.splitext(os.path.basename(source_path))[0]
+    width = fig.get_figwidth()
+    entry = {"web": []}
+
+    if PIL_AVAILABLE:
+        # One render at print resolution, every variant resized from it
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=_print_width_px() / width)
+        master = Image.open(buffer).convert("RGB")
+
+        for target in WEB_WIDTHS:
+            path  = os.path.join(directory, f"{stem}-w{target}.png")
+            image = master.resize((target, round(master.height * target / master.width)), Image.LANCZOS)
+            image.quantize(colors=WEB_COLORS, method=Image.Quantize.MEDIANCUT).save(path, optimize=True)
+            entry["web"].append({"width": target, "path": path, "bytes": os.path.getsize(path)})
+
+        path = os.path.join(directory, f"{stem}-print.png")
+        master.quantize(colors=PRINT_COLORS, method=Image.Quantize.MEDIANCUT).save(
+            path, optimize=True, dpi=(PRINT_DPI, PRINT_DPI)
+        )
+    else:
+        for target in WEB_WIDTHS:
+            path = os.path.join(directory, f"{stem}-w{target}.png")
+            fig.savefig(path, dpi=target / width)
+            entry["web"].append({"width": target, "path": path, "bytes": os.path.getsize(path)})
+
+        path = os.path.join(directory, f"{stem}-print.png")
+        fig.savefig(path, dpi=_print_width_px() / width)
+
+    entry["print"] = {"path": path, "dpi": PRINT_DPI, "bytes": os.path.getsize(path)}
+    if os.path.exists(source_path):
+        entry["source_bytes"] = os.path.getsize(source_path)
+    return entry
+
+
+def write_chart_manifest(entries: dict, path: str = MANIFEST_PATH) -> None:
+    """Atomically replace the manifest with {source_path: entry}."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_chart_manifest(path: str = MANIFEST_PATH) -> dict:
+    """The manifest, re-read only when the file changes; empty if it does not exist."""
+    global _MANIFEST
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    with _MANIFEST_LOCK:
+        if _MANIFEST[0] != mtime:
+            with open(path, encoding="utf-8") as f:
+                _MANIFEST = (mtime, json.load(f))
+        return _MANIFEST[1]
+
+
+def pick_web_variant(variants: list, display_width: int = DASHBOARD_WIDTH) -> dict:
+    """Smallest variant at least `display_width` pixels wide, else the widest one."""
+    wide_enough = [variant for variant in variants if variant["width"] >= display_width]
+    if wide_enough:
+        return min(wide_enough, key=lambda variant: variant["width"])
+    return max(variants, key=lambda variant: variant["width"])
+
+
+def web_chart(source_path: str, display_width: int = DASHBOARD_WIDTH) -> str:
+    """Path of the web variant of a chart to serve at `display_width`, or the source image."""
+    variants = [
+        variant for variant in read_chart_manifest().get(source_path, {}).get("web", [])
+        if os.path.exists(variant["path"])
+    ]
+    return pick_web_variant(variants, display_width)["path"] if variants else source_path
+
+
+def print_chart(source_path: str) -> str:
+    """Print variant of a chart for PDF embedding, or the source image."""
+    variant = read_chart_manifest().get(source_path, {}).get("print")
+    return variant["path"] if variant and os.path.exists(variant["path"]) else source_path
@@ -0,0 +1,176 @@
+
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from model_utils import FEATURE_COLUMNS, LOCATION_COLUMNS, encode_profiles, uses_locations
+from title_normalization import canonicalize
+
+
+# ==============================================================================
+# OUT-OF-CORE FOREST TRAINING
+# ==============================================================================
+#
+# The clean CSV is streamed in fixed-size partitions and never held in memory
+# as a whole:
+#
+#   pass 1  schema  – distinct experience levels / titles → fixed model_columns
+#   pass 2  fit     – each partition grows the forest by a share of the trees
+#                     proportional to its training rows (warm_start)
+#   pass 3  score   – holdout rows of each partition are predicted and folded
+#                     into running MAE / R² sums
+#
+# Peak memory is one encoded partition plus the trees. The holdout is a hash
+# of the row number, so it is identical across runs and chunk sizes and can
+# be shared with an in-memory baseline for comparison.
+
+DEFAULT_CHUNK_ROWS = 20_000
+HOLDOUT_BUCKETS    = 1_000
+
+
+def holdout_mask(row_ids: np.ndarray, test_size: float) -> np.ndarray:
+    """Deterministic per-row split (Knuth multiplicative hash of the row number)."""
+    hashed = (row_ids.astype(np.uint64) * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    return (hashed % np.uint64(HOLDOUT_BUCKETS)) < int(test_size * HOLDOUT_BUCKETS)
+
+
+def iter_chunks(path: str, columns: list, chunk_rows: int, title_map: dict = None):
+    """Yield (row_ids, chunk) partitions with canonical job titles."""
+    first_row = 0
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_rows):
+        if title_map and "job_title" in chunk.columns:
+            chunk["job_title"] = canonicalize(chunk["job_title"], title_map)
+        row_ids    = np.arange(first_row, first_row + len(chunk))
+        first_row += len(chunk)
+        yield row_ids, chunk
+
+
+def scan_schema(path: str, chunk_rows: int, title_map: dict = None) -> dict:
+    """Pass 1: row counts and the category values that define the encoded columns."""
+    partition_rows, levels, titles = [], set(), set()
+    for _, chunk in iter_chunks(path, ["experience_level", "job_title"], chunk_rows, title_map):
+        partition_rows.append(len(chunk))
+        levels.update(chunk["experience_level"].unique())
+        titles.update(chunk["job_title"].unique())
+    return {
+        "rows":              sum(partition_rows),
+        "chunks":            len(partition_rows),
+        "partition_rows":    partition_rows,
+        "experience_levels": sorted(levels),
+        "job_titles":        sorted(titles),
+    }
+
+
+def schema_columns(schema: dict) -> list:
+    """The columns pd.get_dummies(drop_first=True) produces on the full dataset, without loading it."""
+    return (
+        ["remote_ratio"]
+        + [f"experience_level_{level}" for level in schema["experience_levels"][1:]]
+        + [f"job_title_{title}" for title in schema["job_titles"][1:]]
+    )
+
+
+def allocate_trees(partition_rows: list, n_trees: int, test_size: float = 0.20) -> list:
+    """
+    Trees per partition, proportional to its training rows (largest remainder),
+    summing to exactly `n_trees`. A short tail may get none and is skipped.
+    """
+    bounds = np.cumsum([0] + list(partition_rows))
+    train  = np.array([
+        int((~holdout_mask(np.arange(first, last), test_size)).sum()) for first, last in zip(bounds[:-1], bounds[1:])
+    ], dtype=np.float64)
+    if train.sum() == 0:
+        return [0] * len(partition_rows)
+
+    quota = train / train.sum() * n_trees
+    trees = np.floor(quota).astype(np.int64)
+    order = np.argsort(-(quota - trees), kind="stable")
+    trees[order[:n_trees - int(trees.sum())]] += 1
+    return trees.tolist()
+
+
+def fit_chunked(
+    path: str,
+    target: str,
+    model_columns: list,
+    schema: dict,
+    feature_config: dict = None,
+    title_map: dict = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    n_trees: int = 100,
+    test_size: float = 0.20,
+    random_state: int = 42,
+    log=print,
+) -> RandomForestRegressor:
+    """
+    Pass 2: grow one RandomForestRegressor of exactly `n_trees` trees over all
+    partitions. Each partition adds trees in proportion to its training rows
+    (see allocate_trees), fitted on those rows only.
+    """
+    columns = FEATURE_COLUMNS + (LOCATION_COLUMNS if uses_locations(feature_config) else []) + [target]
+    trees   = allocate_trees(schema["partition_rows"], n_trees, test_size)
+    model   = RandomForestRegressor(n_estimators=0, warm_start=True, random_state=random_state, n_jobs=-1)
+
+    for number, (row_ids, chunk) in enumerate(iter_chunks(path, columns, chunk_rows, title_map), start=1):
+        train     = chunk[~holdout_mask(row_ids, test_size)]
+        new_trees = trees[number - 1]
+        if new_trees == 0:
+            log(f"       partition {number:>3}/{schema['chunks']}  {len(train):>8,} rows  skipped (too small for a tree)")
+            continue
+        start = time.time()
+        model.set_params(n_estimators=model.n_estimators + new_trees)
+        model.fit(encode_profiles(train, model_columns, feature_config), train[target])
+        log(f"       partition {number:>3}/{schema['chunks']}  {len(train):>8,} rows  "
+            f"+{new_trees} trees → {model.n_estimators:>4}  ({time.time() - start:.1f}s)")
+    return model
+
+
+class StreamingMetrics:
+    """MAE and R² accumulated from running sums, one partition at a time."""
+
+    def __init__(self):
+        self.n = 0
+        self.abs_error = self.sq_error = self.y_sum = self.y_sq_sum = 0.0
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        y_true = np.asarray(y_true, dtype=np.float64)
+        error  = y_true - y_pred
+        self.n         += len(y_true)
+        self.abs_error += float(np.abs(error).sum())
+        self.sq_error  += float((error ** 2).sum())
+        self.y_sum     += float(y_true.sum())
+        self.y_sq_sum  += float((y_true ** 2).sum())
+
+    @property
+    def mae(self) -> float:
+        return self.abs_error / self.n
+
+    @property
+    def r2(self) -> float:
+        total = self.y_sq_sum - self.y_sum ** 2 / self.n
+        return 1 - self.sq_error / total
+
+
+def evaluate_holdout(
+    models: dict,
+    path: str,
+    target: str,
+    model_columns: list,
+    feature_config: dict = None,
+    title_map: dict = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    test_size: float = 0.20,
+) -> dict:
+    """Pass 3: score every model in `models` ({name: model}) on the shared holdout rows."""
+    columns = FEATURE_COLUMNS + (LOCATION_COLUMNS if uses_locations(feature_config) else []) + [target]
+    metrics = {name: StreamingMetrics() for name in models}
+    for row_ids, chunk in iter_chunks(path, columns, chunk_rows, title_map):
+        holdout = chunk[holdout_mask(row_ids, test_size)]
+        if holdout.empty:
+            continue
+        X = encode_profiles(holdout, model_columns, feature_config)
+        for name, model in models.items():
+            metrics[name].update(holdout[target].to_numpy(), model.predict(X))
+    return metrics
@@ -0,0 +1,134 @@
+
+import importlib.util
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# pandas' parquet engine; only its presence matters here
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+# ==============================================================================
+# PARTITIONED CLEAN DATASET
+# ==============================================================================
+#
+# clean_dataset/
+# ├── _partitions.json                       {"columns": [...], "partitions": [...]}
+# ├── work_year=2023/part.parquet
+# ├── work_year=2024/part.parquet            (part.csv without pyarrow)
+# └── ...
+#
+# Written by 1_data_prep_and_eda.py next to the flat CSV. Readers select files
+# from the partition list before touching the disk (predicate pushdown on the
+# partition columns), so loading a year window costs the rows of those years,
+# not the full history. Partition columns stay inside the files as well, so a
+# partition reads back as an ordinary slice of the clean dataset.
+
+DATASET_DIR       = "clean_dataset"
+PARTITION_COLUMNS = ["work_year"]              # optionally + ["experience_level"]
+PARTITIONS_FILE   = "_partitions.json"
+
+
+def write_partitioned(df: pd.DataFrame, directory: str = DATASET_DIR, partition_columns: list = PARTITION_COLUMNS) -> list:
+    """
+    Write one file per combination of `partition_columns` and the partition
+    list. The new tree is built next to the old one and swapped in by rename.
+    """
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    partitions = []
+    for key, part in df.groupby(partition_columns, sort=True):
+        key    = key if isinstance(key, tuple) else (key,)
+        values = {column: (value.item() if hasattr(value, "item") else value) for column, value in zip(partition_columns, key)}
+        folder = os.path.join(*(f"{column}={value}" for column, value in values.items()))
+        os.makedirs(os.path.join(tmp_dir, folder))
+
+        path = os.path.join(folder, "part.parquet" if PYARROW_AVAILABLE else "part.csv")
+        if PYARROW_AVAILABLE:
+            part.to_parquet(os.path.join(tmp_dir, path), index=False)
+        else:
+            part.to_csv(os.path.join(tmp_dir, path), index=False)
+        partitions.append({"values": values, "path": path, "rows": int(len(part))})
+
+    with open(os.path.join(tmp_dir, PARTITIONS_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "columns":    list(partition_columns),
+            "created":    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "partitions": partitions,
+        }, f, indent=2)
+
+    old_dir = f"{directory}.old-{os.getpid()}"
+    if os.path.isdir(directory):
+        os.rename(directory, old_dir)
+    os.rename(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return partitions
+
+
+def read_partitions(directory: str = DATASET_DIR) -> dict:
+    """The partition list, or an empty one if the dataset has not been written."""
+    try:
+        with open(os.path.join(directory, PARTITIONS_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"columns": [], "partitions": []}
+
+
+def partition_values(column: str, directory: str = DATASET_DIR) -> dict:
+    """{value: rows} of one partition column, e.g. rows per work_year."""
+    counts = {}
+    for partition in read_partitions(directory)["partitions"]:
+        if column in partition["values"]:
+            value = partition["values"][column]
+            counts[value] = counts.get(value, 0) + partition["rows"]
+    return dict(sorted(counts.items()))
+
+
+def select_partitions(filters: dict = None, directory: str = DATASET_DIR) -> list:
+    """Partitions whose values pass `filters` ({column: allowed values}); unfiltered columns pass."""
+    filters = {column: set(values) for column, values in (filters or {}).items()}
+    return [
+        partition for partition in read_partitions(directory)["partitions"]
+        if all(partition["values"][column] in allowed for column, allowed in filters.items() if column in partition["values"])
+    ]
+
+
+def _read_file(path: str, columns: list = None) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+def read_dataset(
+    filters: dict = None,
+    columns: list = None,
+    directory: str = DATASET_DIR,
+    fallback_csv: str = None,
+) -> pd.DataFrame:
+    """
+    Rows passing `filters`, reading only the matching partition files (and
+    only `columns`). Filters on non-partition columns are applied after the
+    read, so `columns` must include them. Without a partitioned dataset
+    `fallback_csv` is read and filtered instead.
+    """
+    filters = filters or {}
+    layout  = read_partitions(directory)
+    if layout["partitions"]:
+        selected = select_partitions(filters, directory)
+        frames   = [_read_file(os.path.join(directory, entry["path"]), columns) for entry in selected]
+        df = pd.concat(frames, ignore_index=True) if frames else _read_file(
+            os.path.join(directory, layout["partitions"][0]["path"]), columns
+        ).iloc[:0]
+        residual = {column: values for column, values in filters.items() if column not in layout["columns"]}
+    elif fallback_csv is not None:
+        df, residual = pd.read_csv(fallback_csv, usecols=columns), filters
+    else:
+        raise FileNotFoundError(f"No partitioned dataset in '{directory}'")
+
+    for column, values in residual.items():
+        df = df[df[column].isin(list(values))]
+    return df.reset_index(drop=True)
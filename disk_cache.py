@@ -0,0 +1,202 @@
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:                 # Windows
+    FCNTL_AVAILABLE = False
+
+
+# ==============================================================================
+# PERSISTENT DISK CACHE  –  shared by every worker process on the host
+# ==============================================================================
+#
+# .cache/
+# ├── .lock                          advisory lock held while sweeping
+# ├── aggregates/3f/3f9a…e1.pkl      one pickle per entry, named by the key hash
+# ├── predictions/…
+# └── pdf/…
+#
+# Keys include the content hash of the inputs (clean CSV, model bundle
+# version, chart images), so a new dataset or model simply stops matching and
+# stale entries age out. Entries are written to a temporary file and renamed
+# into place, so readers in other processes never see a partial file. When
+# the directory outgrows `max_bytes` the least recently used entries (by
+# mtime, refreshed on every hit) are deleted under an inter-process lock.
+
+CACHE_DIR         = ".cache"
+DEFAULT_MAX_BYTES = 1024 ** 3
+SWEEP_FRACTION    = 0.05    # bytes written between sweeps, as a share of max_bytes
+LOW_WATER         = 0.9     # a sweep trims the cache to this share of max_bytes
+
+_MISSING = object()
+
+_DIGESTS      = {}          # (path, size, mtime_ns) → sha256, so unchanged files are hashed once
+_DIGESTS_LOCK = threading.Lock()
+
+
+def file_digest(*paths: str) -> str:
+    """Content hash of one or more files; missing files hash as absent."""
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            digest.update(f"{path}:missing".encode())
+            continue
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with _DIGESTS_LOCK:
+            file_hash = _DIGESTS.get(memo_key)
+        if file_hash is None:
+            hasher = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    hasher.update(block)
+            file_hash = hasher.hexdigest()
+            with _DIGESTS_LOCK:
+                _DIGESTS[memo_key] = file_hash
+        digest.update(file_hash.encode())
+    return digest.hexdigest()
+
+
+def cache_key(*parts) -> str:
+    """Stable hex key for a tuple of plain values (str / int / float / tuple / None)."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Size-bounded pickle cache on the local disk. Safe to share between threads
+    and processes: writes are atomic renames and eviction is serialised by an
+    advisory file lock (without fcntl, concurrent sweeps only do extra work).
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory  = directory
+        self.max_bytes  = max_bytes
+        self.hits       = 0
+        self.misses     = 0
+        self.writes     = 0
+        self.evictions  = 0
+        self.errors     = 0
+        self.size_bytes = None               # as of the last sweep
+        self._written   = max_bytes          # sweep on the first write of the process
+        self._lock      = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.directory, namespace, key[:2], f"{key}.pkl")
+
+    def get(self, namespace: str, key: str, default=None):
+        path = self._path(namespace, key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            value = _MISSING
+        except Exception:                    # truncated / incompatible pickle → drop it
+            value = _MISSING
+            with self._lock:
+                self.errors += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+        try:
+            os.utime(path)                   # LRU: a hit refreshes the entry
+        except OSError:
+            pass
+        return value
+
+    def put(self, namespace: str, key: str, value) -> None:
+        path = self._path(namespace, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except OSError:                      # full / read-only disk: the cache is best effort
+            with self._lock:
+                self.errors += 1
+            return
+
+        with self._lock:
+            self.writes   += 1
+            self._written += size
+            sweep = self._written >= self.max_bytes * SWEEP_FRACTION
+            if sweep:
+                self._written = 0
+        if sweep:
+            self.sweep()
+
+    def get_or_compute(self, namespace: str, key: str, compute):
+        """Return the cached value for `key`, calling `compute()` and storing it only on a miss."""
+        value = self.get(namespace, key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(namespace, key, value)
+        return value
+
+    def sweep(self) -> int:
+        """Delete least recently used entries until the cache is under LOW_WATER; returns how many."""
+        with open(os.path.join(self.directory, ".lock"), "a") as lock:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entries = []
+                for root, _, names in os.walk(self.directory):
+                    for name in names:
+                        if name.endswith(".pkl"):
+                            try:
+                                stat = os.stat(os.path.join(root, name))
+                            except OSError:          # removed by another process meanwhile
+                                continue
+                            entries.append((stat.st_mtime, stat.st_size, os.path.join(root, name)))
+
+                total, removed = sum(size for _, size, _ in entries), 0
+                if total > self.max_bytes:
+                    for _, size, path in sorted(entries):
+                        if total <= self.max_bytes * LOW_WATER:
+                            break
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            continue
+                        total   -= size
+                        removed += 1
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+        with self._lock:
+            self.evictions += removed
+            self.size_bytes = total
+        return removed
+
+    def stats(self) -> dict:
+        """Counters for display / monitoring."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits":       self.hits,
+                "misses":     self.misses,
+                "hit_rate":   self.hits / total if total else 0.0,
+                "writes":     self.writes,
+                "evictions":  self.evictions,
+                "errors":     self.errors,
+                "size_bytes": self.size_bytes,
+                "max_bytes":  self.max_bytes,
+            }
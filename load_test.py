@@ -0,0 +1,423 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+import numpy as np
+
+from profiling import rss_bytes
+
+try:
+    from websockets.sync.client import connect
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+    CLIENT_AVAILABLE = True
+except ImportError:                 # websockets < 11 or no streamlit
+    CLIENT_AVAILABLE = False
+
+
+APP_PATH         = "app.py"
+SERVER_PORT      = 8599
+SERVER_TIMEOUT   = 60       # seconds the harness waits for its server to report healthy
+SESSION_COUNTS   = [1, 2, 4, 8]
+ACTIONS          = 20       # simulated user actions per session
+THINK_SECONDS    = 0.0      # pause between actions (0 = back-to-back reruns)
+RUN_TIMEOUT      = 120      # seconds one script run may take before it counts as failed
+PDF_TIMEOUT      = 60       # seconds a session waits for its PDF report
+OUTPUT_DIR       = "load_tests"
+
+# Share of actions per flow
+FLOWS            = {"filter": 0.5, "predict": 0.35, "pdf": 0.15}
+PERCENTILES      = (50, 90, 99)
+
+
+# ==============================================================================
+# LOAD TEST  –  concurrent browser-like sessions against a `streamlit run` server
+# ==============================================================================
+#
+# The harness starts `streamlit run app.py` (or uses the server given with
+# --url) and runs every simulated session in its own process, each holding
+# one websocket to /_stcore/stream. A session speaks the browser's protocol:
+# BackMsg rerun requests carrying the widget states, ForwardMsg deltas back
+# until script_finished. A widget inside a fragment reruns only that
+# fragment, and run_every fragments are re-triggered by the client at their
+# interval, exactly as the web frontend does – so the figures are the
+# latencies a browser sees. Throughput counts user actions only (the initial
+# page load is reported separately) and RSS is the server process's.
+#
+# Widget values use the wire format of the installed Streamlit (formatted
+# option strings); the protocol is internal and may change between releases.
+
+
+# ==============================================================================
+# WEBSOCKET CLIENT
+# ==============================================================================
+
+WIDGET_KINDS = ("selectbox", "multiselect", "slider", "button", "download_button")
+
+
+class AppClient:
+    """One browser tab: the widgets it has been sent and the widget states it reports back."""
+
+    def __init__(self, websocket):
+        self.websocket   = websocket
+        self.widgets     = {}       # label → (kind, proto, fragment_id)
+        self.states      = {}       # widget id → WidgetState sent with every rerun
+        self.auto_reruns = {}       # fragment_id → interval of mounted run_every fragments
+        self.downloads   = set()    # download_button labels rendered by the last request
+        self.errors      = []       # st.error bodies rendered by the last request
+        self.exception   = None     # first exception element of the last request
+
+    def rerun(self, fragment_id: str = "", trigger=None, auto: bool = False) -> float:
+        """Send one rerun request and read until its script run finishes; returns seconds."""
+        message = BackMsg()
+        state   = message.rerun_script
+        state.query_string = ""
+        if fragment_id:
+            state.fragment_id   = fragment_id
+            state.is_auto_rerun = auto
+        state.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            state.widget_states.widgets.append(trigger)
+
+        self.downloads, self.errors, self.exception = set(), [], None
+        start = time.perf_counter()
+        self.websocket.send(message.SerializeToString())
+        self._read_until_finished()
+        return time.perf_counter() - start
+
+    def _read_until_finished(self) -> None:
+        # st.rerun() ends a run early and starts the next one in the same request
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(self.websocket.recv(timeout=RUN_TIMEOUT))
+            kind = message.WhichOneof("type")
+            if kind == "new_session" and not message.new_session.fragment_ids_this_run:
+                self.auto_reruns.clear()        # a full run re-registers its fragments
+            elif kind == "auto_rerun":
+                self.auto_reruns[message.auto_rerun.fragment_id] = message.auto_rerun.interval
+            elif kind == "stop_auto_rerun":
+                for fragment_id in message.stop_auto_rerun.fragment_ids:
+                    self.auto_reruns.pop(fragment_id, None)
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                self._element(message.delta.new_element, message.delta.fragment_id)
+            elif kind == "script_finished" and message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return
+
+    def _element(self, element, fragment_id: str) -> None:
+        kind = element.WhichOneof("type")
+        if kind in WIDGET_KINDS:
+            proto = getattr(element, kind)
+            self.widgets[proto.label] = (kind, proto, fragment_id)
+            if kind == "download_button":
+                self.downloads.add(proto.label)
+        elif kind == "alert" and element.alert.format == element.alert.ERROR:
+            self.errors.append(element.alert.body)
+        elif kind == "exception" and self.exception is None:
+            self.exception = f"{element.exception.type}: {element.exception.message}"
+
+    def options(self, label: str) -> list:
+        return list(self.widgets[label][1].options)
+
+    def set_value(self, label: str, value) -> str:
+        """Record a widget's new value (sent with the next rerun); returns the widget's fragment id."""
+        kind, proto, fragment_id = self.widgets[label]
+        state = WidgetState(id=proto.id)
+        if kind == "selectbox":
+            state.string_value = value
+        elif kind == "multiselect":
+            state.string_array_value.data.extend(value)
+        elif kind == "slider":              # select_slider: formatted option strings
+            state.string_array_value.data.append(value)
+        else:
+            raise TypeError(f"cannot set a value on a {kind}")
+        self.states[proto.id] = state
+        return fragment_id
+
+    def click(self, label: str) -> float:
+        """Press a button: one trigger rerun of the button's fragment (or the app)."""
+        _, proto, fragment_id = self.widgets[label]
+        return self.rerun(fragment_id, trigger=WidgetState(id=proto.id, trigger_value=True))
+
+
+# ==============================================================================
+# SIMULATED SESSION
+# ==============================================================================
+
+class Session:
+    """One simulated user: an AppClient plus the latencies of its actions."""
+
+    def __init__(self, client: AppClient, seed: int):
+        self.client  = client
+        self.rng     = random.Random(seed)
+        self.samples = []           # [(flow, seconds)]
+        self.errors  = []
+
+    def record(self, flow: str, seconds: float) -> None:
+        if self.client.exception:
+            self.errors.append(f"{flow}: {self.client.exception}")
+        else:
+            self.samples.append((flow, seconds))
+
+    def run(self, actions: int, think_seconds: float) -> None:
+        flows, weights = zip(*FLOWS.items())
+        for _ in range(actions):
+            flow = self.rng.choices(flows, weights)[0]
+            getattr(self, flow)()
+            time.sleep(think_seconds)
+
+    # ── flows ───────────────────────────────────────────────────────────────
+    def filter(self) -> None:
+        """Change one Data Explorer control (a fragment rerun)."""
+        client = self.client
+        name   = self.rng.choice(["Filter by Experience Level", "Filter by Remote Ratio", "Filter by Work Year", "Sort by"])
+        if name == "Sort by":
+            fragment_id = client.set_value(name, self.rng.choice(client.options(name)))
+        else:
+            options     = client.options(name)
+            fragment_id = client.set_value(name, [option for option in options if self.rng.random() < 0.7] or options[:1])
+        self.record("filter", client.rerun(fragment_id))
+
+    def _choose_profile(self) -> None:
+        for name in ["Experience Level", "Job Title", "Work Arrangement"]:
+            self.client.set_value(name, self.rng.choice(self.client.options(name)))
+
+    def predict(self) -> None:
+        """Pick a random profile and press Predict Salary (fragment run + the app rerun it triggers)."""
+        self._choose_profile()
+        self.record("predict", self.client.click("Predict Salary"))
+
+    def pdf(self) -> None:
+        """Predict, then let the polling fragment rerun until the report is ready or has failed."""
+        client = self.client
+        self._choose_profile()
+        start    = time.perf_counter()
+        deadline = start + PDF_TIMEOUT
+        client.click("Predict Salary")
+        while "Download PDF Report" not in client.downloads:
+            failed = [error for error in client.errors if error.startswith("PDF report failed")]
+            if failed or client.exception:
+                self.errors.append(f"pdf: {failed[0] if failed else client.exception}")
+                return
+            if not client.auto_reruns:
+                self.errors.append("pdf: report pending but no polling fragment is mounted")
+                return
+            if time.perf_counter() > deadline:
+                self.errors.append(f"pdf: not ready after {PDF_TIMEOUT}s")
+                return
+            fragment_id, interval = next(iter(client.auto_reruns.items()))
+            time.sleep(interval)
+            client.rerun(fragment_id, auto=True)
+        self.record("pdf", time.perf_counter() - start)
+
+
+def ws_url(url: str) -> str:
+    return url.replace("http://", "ws://").replace("https://", "wss://").rstrip("/") + "/_stcore/stream"
+
+
+def session_process(url: str, seed: int, actions: int, think_seconds: float, barrier, results) -> None:
+    """Body of one session process: load the page, wait for the others, run the actions."""
+    outcome = {"samples": [], "errors": [], "started": None, "finished": None}
+    try:
+        with connect(ws_url(url), subprotocols=["streamlit"], max_size=None, open_timeout=RUN_TIMEOUT) as websocket:
+            client  = AppClient(websocket)
+            session = Session(client, seed)
+            session.record("load", client.rerun())
+            outcome["samples"], outcome["errors"] = session.samples, session.errors
+            if client.exception is None:
+                barrier.wait(timeout=RUN_TIMEOUT)
+                outcome["started"] = time.time()
+                session.run(actions, think_seconds)
+                outcome["finished"] = time.time()
+    except Exception as exc:        # a failed session must not stop the stage
+        outcome["errors"].append(f"{type(exc).__name__}: {exc}")
+        barrier.abort()
+    results.put(outcome)
+
+
+# ==============================================================================
+# SERVER
+# ==============================================================================
+
+def start_server(port: int):
+    """`streamlit run app.py` in headless mode; returns the process once it reports healthy."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH,
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + SERVER_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"streamlit did not become healthy within {SERVER_TIMEOUT}s")
+
+
+# ==============================================================================
+# STAGES
+# ==============================================================================
+
+def run_stage(url: str, sessions: int, actions: int, think_seconds: float, seed: int, server_pid: int = None) -> dict:
+    """Run `sessions` concurrent session processes once; returns latency / throughput / memory figures."""
+    rss_before = rss_bytes(server_pid) if server_pid else None
+
+    barrier   = multiprocessing.Barrier(sessions)
+    results   = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=session_process, args=(url, seed + number, actions, think_seconds, barrier, results), daemon=True)
+        for number in range(sessions)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = []
+    for _ in processes:
+        try:
+            outcomes.append(results.get(timeout=RUN_TIMEOUT + actions * (RUN_TIMEOUT + PDF_TIMEOUT)))
+        except Exception:
+            outcomes.append({"samples": [], "errors": ["session process did not report"], "started": None, "finished": None})
+    for process in processes:
+        process.join(timeout=5)
+
+    rss_after = rss_bytes(server_pid) if server_pid else None
+    samples   = [tuple(sample) for outcome in outcomes for sample in outcome["samples"]]
+    actioned  = [name for name, _ in samples if name != "load"]
+    started   = [outcome["started"] for outcome in outcomes if outcome["started"] is not None]
+    finished  = [outcome["finished"] for outcome in outcomes if outcome["finished"] is not None]
+    elapsed   = max(finished) - min(started) if started and finished else 0.0
+
+    latency = {}
+    for flow in ["load", *FLOWS]:
+        seconds = np.array([secs for name, secs in samples if name == flow])
+        if len(seconds):
+            latency[flow] = {
+                "count": int(len(seconds)),
+                **{f"p{p}": float(np.percentile(seconds, p)) for p in PERCENTILES},
+            }
+
+    return {
+        "sessions":               sessions,
+        "actions":                len(actioned),
+        "errors":                 [error for outcome in outcomes for error in outcome["errors"]],
+        "elapsed_seconds":        round(elapsed, 3),
+        "throughput_per_second":  round(len(actioned) / elapsed, 3) if elapsed else None,
+        "latency_seconds":        latency,
+        "rss_before_bytes":       rss_before,
+        "rss_after_bytes":        rss_after,
+        "rss_growth_per_session": (rss_after - rss_before) / sessions if rss_before and rss_after else None,
+    }
+
+
+def print_stage(stage: dict) -> None:
+    def mb(n) -> str:
+        return f"{n / 1024 ** 2:,.1f}" if n is not None else "n/a"
+
+    throughput = f"{stage['throughput_per_second']:.2f}" if stage["throughput_per_second"] is not None else "n/a"
+    print(f"\n── {stage['sessions']} concurrent session(s) " + "─" * 40)
+    print(f"  {stage['actions']:,} actions in {stage['elapsed_seconds']:.1f}s  →  "
+          f"{throughput} actions/s  ·  {len(stage['errors'])} error(s)")
+    print(f"  {'Flow':<10}{'Count':>7}" + "".join(f"{f'p{p} ms':>11}" for p in PERCENTILES))
+    for flow, figures in stage["latency_seconds"].items():
+        print(f"  {flow:<10}{figures['count']:>7,}" + "".join(f"{figures[f'p{p}'] * 1000:>11,.0f}" for p in PERCENTILES))
+    print(f"  Server RSS {mb(stage['rss_before_bytes'])} → {mb(stage['rss_after_bytes'])} MB  "
+          f"({mb(stage['rss_growth_per_session'])} MB per session)")
+    for error in stage["errors"][:5]:
+        print(f"  ❌  {error}")
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Drive concurrent browser-like sessions through a streamlit server and report latency")
+    parser.add_argument(
+        "--sessions", type=int, nargs="+", default=SESSION_COUNTS,
+        help=f"concurrent session counts to run, one stage each (default {' '.join(map(str, SESSION_COUNTS))})",
+    )
+    parser.add_argument(
+        "--actions", type=int, default=ACTIONS,
+        help=f"simulated actions per session (default {ACTIONS})",
+    )
+    parser.add_argument(
+        "--think", type=float, default=THINK_SECONDS, metavar="SECONDS",
+        help=f"pause between a session's actions (default {THINK_SECONDS})",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="seed of the simulated users' choices",
+    )
+    parser.add_argument(
+        "--url",
+        help="test an already running server (e.g. http://localhost:8501) instead of starting one; no RSS figures",
+    )
+    parser.add_argument(
+        "--port", type=int, default=SERVER_PORT,
+        help=f"port of the server the harness starts (default {SERVER_PORT})",
+    )
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> None:
+    if not CLIENT_AVAILABLE:
+        print("❌  The load test needs streamlit and websockets >= 11. Run: pip install -U streamlit websockets")
+        sys.exit(1)
+
+    print("=" * 70)
+    print(" CareerScout | Load Test")
+    print("=" * 70)
+
+    server = None
+    if args.url is None:
+        print(f"\nStarting streamlit run {APP_PATH} on port {args.port} ...")
+        server = start_server(args.port)
+    url        = args.url or f"http://localhost:{args.port}"
+    server_pid = server.pid if server else None
+
+    try:
+        # One untimed session fills the server's caches, like a warmed-up deployment
+        print("\nWarm-up session ...")
+        warmup = run_stage(url, 1, 3, 0.0, seed=args.seed - 1, server_pid=server_pid)
+        if warmup["errors"] or "load" not in warmup["latency_seconds"]:
+            print(f"❌  The app failed in the warm-up session: {warmup['errors'][:1]}")
+            sys.exit(1)
+        print(f"  cold start {warmup['latency_seconds']['load']['p50'] * 1000:,.0f} ms")
+
+        stages = []
+        for sessions in args.sessions:
+            stages.append(run_stage(url, sessions, args.actions, args.think, args.seed, server_pid))
+            print_stage(stages[-1])
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    path  = os.path.join(OUTPUT_DIR, f"load-{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created": stamp, "url": url, "flows": FLOWS, "actions": args.actions,
+                   "think_seconds": args.think, "warmup": warmup, "stages": stages}, f, indent=2)
+    print(f"\n✓ Report written → '{path}'")
+
+
+# ==============================================================================
+# ENTRY POINT
+# ==============================================================================
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,364 @@
+
+import weakref
+import zlib
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# ==============================================================================
+# CONSTANTS  –  shared by 2_model_training.py and app.py
+# ==============================================================================
+
+FEATURE_COLUMNS    = ["experience_level", "job_title", "remote_ratio"]
+CATEGORICAL_COLUMNS = ["experience_level", "job_title"]
+
+EXPERIENCE_LEVELS  = ["EN", "MI", "SE", "EX"]
+REMOTE_RATIOS      = [0, 50, 100]
+
+INTERVAL_QUANTILES = (10, 50, 90)   # percentiles of the per-tree outputs
+
+CONTRIBUTION_PREFIX = "contrib_"    # prediction-table columns holding per-feature contributions
+EXPLAIN_BATCH_ROWS  = 1_000         # profiles per decision-path batch
+FEATURE_LABELS      = {
+    "experience_level":   "Experience level",
+    "job_title":          "Job title",
+    "remote_ratio":       "Work arrangement",
+    "company_location":   "Company location",
+    "employee_residence": "Employee residence",
+}
+
+# High-cardinality location features (opt-in via --location-encoding)
+LOCATION_COLUMNS     = ["company_location", "employee_residence"]
+LOCATION_ENCODINGS   = ["none", "hash", "target"]
+DEFAULT_HASH_BUCKETS = 32
+TARGET_SMOOTHING     = 20     # pseudo-count pulling rare countries to the global mean
+TARGET_FOLDS         = 5
+
+# Segment-specific models (opt-in via --segments)
+SEGMENT_DIMENSIONS   = ["region", "work_year"]
+MIN_SEGMENT_ROWS     = 2_000
+
+REGIONS = {
+    "North America": ["US", "CA", "MX"],
+    "Europe":        ["GB", "DE", "FR", "ES", "NL", "IE", "IT", "PT", "PL", "AT", "CH", "BE",
+                      "SE", "DK", "NO", "FI", "GR", "CZ", "RO", "HU", "LT", "LV", "EE", "UA", "HR", "SI", "LU"],
+    "Asia-Pacific":  ["IN", "JP", "CN", "SG", "AU", "NZ", "KR", "HK", "PH", "PK", "VN", "TH", "MY", "ID"],
+    "Latin America": ["BR", "AR", "CO", "CL", "PE", "UY", "CR", "EC"],
+    "Middle East & Africa": ["AE", "SA", "IL", "TR", "EG", "ZA", "NG", "KE", "QA", "MA"],
+}
+_REGION_OF = {country: region for region, countries in REGIONS.items() for country in countries}
+
+
+# ==============================================================================
+# ENCODING
+# ==============================================================================
+
+def uses_locations(feature_config: dict) -> bool:
+    """True if the model was trained with encoded location features."""
+    return bool(feature_config) and feature_config.get("location_encoding", "none") != "none"
+
+
+def encode_profiles(profiles: pd.DataFrame, model_columns: list, feature_config: dict = None) -> pd.DataFrame:
+    """
+    One-hot encode raw profile rows and align them to the training schema.
+    Categories dropped as the training baseline (drop_first) become all-zero
+    rows, exactly as they were seen during fit. Location columns are added
+    with the fixed-width encoding recorded in `feature_config`.
+    """
+    encoded = pd.get_dummies(profiles[FEATURE_COLUMNS], columns=CATEGORICAL_COLUMNS)
+    if uses_locations(feature_config):
+        encoded = pd.concat([encoded, location_features(profiles[LOCATION_COLUMNS], feature_config)], axis=1)
+    return encoded.reindex(columns=model_columns, fill_value=0)
+
+
+# ==============================================================================
+# LOCATION ENCODING  –  width independent of the number of countries
+# ==============================================================================
+
+def _hash_bucket(column: str, value: str, n_buckets: int) -> int:
+    """Stable across processes and Python versions (unlike hash())."""
+    return zlib.crc32(f"{column}={value}".encode("utf-8")) % n_buckets
+
+
+def hash_location_features(locations: pd.DataFrame, n_buckets: int) -> pd.DataFrame:
+    """One-hot of crc32(value) mod n_buckets per location column – 2 × n_buckets columns."""
+    blocks = []
+    for column in LOCATION_COLUMNS:
+        uniques, inverse = np.unique(locations[column].astype(str).to_numpy(), return_inverse=True)
+        buckets = np.array([_hash_bucket(column, value, n_buckets) for value in uniques], dtype=np.int64)
+        blocks.append(pd.DataFrame(
+            np.eye(n_buckets, dtype=np.uint8)[buckets[inverse]],
+            columns=[f"{column}_hash_{b}" for b in range(n_buckets)],
+            index=locations.index,
+        ))
+    return pd.concat(blocks, axis=1)
+
+
+def fit_target_maps(locations: pd.DataFrame, y: pd.Series, smoothing: float = TARGET_SMOOTHING):
+    """Smoothed mean target per location value; returns (maps, prior)."""
+    prior = float(y.mean())
+    maps  = {}
+    for column in LOCATION_COLUMNS:
+        stats = y.groupby(locations[column].to_numpy()).agg(["sum", "count"])
+        maps[column] = ((stats["sum"] + smoothing * prior) / (stats["count"] + smoothing)).to_dict()
+    return maps, prior
+
+
+def target_location_features(locations: pd.DataFrame, maps: dict, prior: float) -> pd.DataFrame:
+    """One numeric column per location column; unseen values get the prior."""
+    return pd.DataFrame(
+        {f"{column}_target": locations[column].map(maps[column]).fillna(prior).astype(np.float64)
+         for column in LOCATION_COLUMNS},
+        index=locations.index,
+    )
+
+
+def out_of_fold_target_features(
+    locations: pd.DataFrame,
+    y: pd.Series,
+    folds: int = TARGET_FOLDS,
+    smoothing: float = TARGET_SMOOTHING,
+    random_state: int = 42,
+) -> pd.DataFrame:
+    """Target encoding where each row is encoded with maps fitted on the other folds only."""
+    fold_of = np.random.default_rng(random_state).permutation(len(locations)) % folds
+    parts   = []
+    for fold in range(folds):
+        held_out    = fold_of == fold
+        maps, prior = fit_target_maps(locations[~held_out], y[~held_out], smoothing)
+        parts.append(target_location_features(locations[held_out], maps, prior))
+    return pd.concat(parts).loc[locations.index]
+
+
+def location_features(locations: pd.DataFrame, feature_config: dict) -> pd.DataFrame:
+    """Inference-time location block for the encoding recorded in `feature_config`."""
+    if feature_config["location_encoding"] == "hash":
+        return hash_location_features(locations, feature_config["hash_buckets"])
+    return target_location_features(locations, feature_config["target_maps"], feature_config["target_prior"])
+
+
+# ==============================================================================
+# SEGMENTS
+# ==============================================================================
+
+def region_of(countries: pd.Series) -> pd.Series:
+    """Map ISO country codes to a coarse region ('Other' when unknown)."""
+    return countries.map(_REGION_OF).fillna("Other")
+
+
+def segment_values(df: pd.DataFrame, dimension: str) -> pd.Series:
+    """Per-row segment value for a SEGMENT_DIMENSIONS entry."""
+    if dimension == "region":
+        return region_of(df["company_location"])
+    return df[dimension]
+
+
+def segment_name(dimension: str, value) -> str:
+    """Stable identifier used for file names and in the app, e.g. 'work_year=2024'."""
+    return f"{dimension}={value}"
+
+
+# ==============================================================================
+# EXPLANATIONS  –  tree-path (Saabas) decomposition over all trees at once
+# ==============================================================================
+#
+# Along a root → leaf path every split moves the node mean from the parent's
+# value to the child's; that change is credited to the parent's split feature.
+# Summed over the path and averaged over trees:
+#
+#   prediction = mean root value (baseline) + Σ_features contribution
+#
+# model.decision_path() returns the visited nodes of every tree as one sparse
+# (rows × all_nodes) matrix, so the whole forest is one sparse product with a
+# (all_nodes × features) matrix of per-edge deltas.
+
+def contribution_groups(model_columns: list) -> list:
+    """Raw feature each encoded column belongs to (e.g. 'job_title_Data Analyst' → 'job_title')."""
+    groups = []
+    for column in model_columns:
+        owner = next((feature for feature in FEATURE_LABELS
+                      if column == feature or column.startswith(f"{feature}_")), column)
+        groups.append(owner)
+    return groups
+
+
+# model → {columns: (all_nodes × raw features) matrix}; built once per loaded forest
+_EDGE_MATRICES = weakref.WeakKeyDictionary()
+
+
+def _edge_matrix(model, n_features: int, node_ptr: np.ndarray):
+    """Sparse (all_nodes × features) matrix: child node → value delta on its parent's split feature."""
+    rows, cols, deltas = [], [], []
+    for offset, estimator in zip(node_ptr, model.estimators_):
+        tree     = estimator.tree_
+        value    = tree.value[:, 0, 0]
+        parent   = np.full(tree.node_count, -1, dtype=np.int64)
+        internal = np.flatnonzero(tree.children_left >= 0)
+        parent[tree.children_left[internal]]  = internal
+        parent[tree.children_right[internal]] = internal
+
+        child = np.flatnonzero(parent >= 0)
+        rows.append(child + offset)
+        cols.append(tree.feature[parent[child]])
+        deltas.append(value[child] - value[parent[child]])
+    return sparse.csr_matrix(
+        (np.concatenate(deltas), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(node_ptr[-1], n_features),
+    )
+
+
+def explain_profiles(model, X: pd.DataFrame, batch_rows: int = EXPLAIN_BATCH_ROWS):
+    """
+    Per-row contributions of every raw feature for an encoded matrix `X`.
+    Returns (baseline, DataFrame of contrib_<feature> columns aligned to X.index).
+    """
+    codes, names = pd.factorize(pd.Series(contribution_groups(list(X.columns))))
+    baseline     = float(np.mean([estimator.tree_.value[0, 0, 0] for estimator in model.estimators_]))
+    cached       = _EDGE_MATRICES.setdefault(model, {})
+    key          = tuple(X.columns)
+
+    parts = []
+    for start in range(0, len(X), batch_rows):
+        indicator, node_ptr = model.decision_path(X.iloc[start:start + batch_rows])
+        if key not in cached:
+            to_features = sparse.csr_matrix(
+                (np.ones(len(codes)), (np.arange(len(codes)), codes)),
+                shape=(len(codes), len(names)),
+            )
+            cached[key] = (_edge_matrix(model, X.shape[1], node_ptr) @ to_features).tocsr()
+        parts.append((indicator @ cached[key]).toarray() / len(model.estimators_))
+
+    contributions = np.vstack(parts) if parts else np.empty((0, len(names)))
+    return baseline, pd.DataFrame(
+        contributions,
+        columns=[f"{CONTRIBUTION_PREFIX}{name}" for name in names],
+        index=X.index,
+    )
+
+
+def split_contributions(prediction: dict):
+    """(baseline, {feature: contribution}) from a prediction dict, or (None, {}) if it has none."""
+    contributions = {key[len(CONTRIBUTION_PREFIX):]: value
+                     for key, value in prediction.items() if key.startswith(CONTRIBUTION_PREFIX)}
+    if not contributions:
+        return None, {}
+    return prediction["predicted"] - sum(contributions.values()), contributions
+
+
+# ==============================================================================
+# PREDICTION INTERVALS
+# ==============================================================================
+
+def per_tree_predictions(model, X: pd.DataFrame) -> np.ndarray:
+    """Return an (n_trees, n_rows) array with the output of every tree in the forest."""
+    values = X.to_numpy(dtype=np.float32)
+    return np.stack([tree.predict(values) for tree in model.estimators_])
+
+
+def build_prediction_table(
+    model,
+    model_columns: list,
+    job_titles: list,
+    experience_levels: list = EXPERIENCE_LEVELS,
+    remote_ratios: list = REMOTE_RATIOS,
+) -> pd.DataFrame:
+    """
+    Predict every (experience, title, remote) profile in one batch and keep the
+    forest mean plus the p10/p50/p90 spread of the individual trees, and the
+    per-feature contributions explaining each prediction.
+    Returns a compact float32 table indexed by the three profile keys.
+    """
+    index = pd.MultiIndex.from_product(
+        [experience_levels, job_titles, remote_ratios],
+        names=FEATURE_COLUMNS,
+    )
+    profiles = index.to_frame(index=False)
+    encoded  = encode_profiles(profiles, model_columns)
+
+    tree_preds = per_tree_predictions(model, encoded)
+    p_low, p_mid, p_high = np.percentile(tree_preds, INTERVAL_QUANTILES, axis=0)
+    _, contributions = explain_profiles(model, encoded)
+
+    return pd.DataFrame(
+        {
+            "predicted": tree_preds.mean(axis=0),
+            "p10":       p_low,
+            "p50":       p_mid,
+            "p90":       p_high,
+            **{column: contributions[column].to_numpy() for column in contributions.columns},
+        },
+        index=index,
+    ).astype(np.float32)
+
+
+def lookup_prediction(table: pd.DataFrame, experience: str, job_title: str, remote_ratio: int):
+    """Return the precomputed (predicted, p10, p50, p90, contrib_*) row for a profile, or None if absent."""
+    try:
+        row = table.loc[(experience, job_title, remote_ratio)]
+    except KeyError:
+        return None
+    return {key: float(value) for key, value in row.items()}
+
+
+def predict_profiles(
+    model,
+    model_columns: list,
+    profiles: pd.DataFrame,
+    feature_config: dict = None,
+    table: pd.DataFrame = None,
+    explain: bool = True,
+) -> pd.DataFrame:
+    """
+    Batch version of lookup_prediction + predict_with_interval. Profiles found
+    in the precomputed `table` are looked up, all others go through the forest
+    in a single call. Returns predicted/p10/p50/p90 (and, with `explain`, the
+    contrib_* columns) aligned to `profiles.index`.
+    """
+    encoded  = encode_profiles(profiles, model_columns, feature_config)
+    features = [f"{CONTRIBUTION_PREFIX}{name}" for name in dict.fromkeys(contribution_groups(model_columns))] if explain else []
+    columns  = ["predicted", "p10", "p50", "p90"] + features
+    result   = pd.DataFrame(np.nan, index=profiles.index, columns=columns)
+    if table is not None and not uses_locations(feature_config):
+        keys = pd.MultiIndex.from_frame(profiles[FEATURE_COLUMNS])
+        result[columns] = table.reindex(keys).reindex(columns=columns).to_numpy(dtype=np.float64)
+
+    missing = result[columns].isna().any(axis=1).to_numpy()
+    if missing.any():
+        tree_preds = per_tree_predictions(model, encoded[missing])
+        p_low, p_mid, p_high = np.percentile(tree_preds, INTERVAL_QUANTILES, axis=0)
+        result.loc[missing, columns[:4]] = np.column_stack([tree_preds.mean(axis=0), p_low, p_mid, p_high])
+        if explain:
+            _, contributions = explain_profiles(model, encoded[missing])
+            result.loc[missing, features] = contributions[features].to_numpy()
+    return result
+
+
+def predict_with_interval(
+    model,
+    model_columns: list,
+    experience: str,
+    job_title: str,
+    remote_ratio: int,
+    locations: dict = None,
+    feature_config: dict = None,
+) -> dict:
+    """Fallback for profiles missing from the table: same statistics computed live."""
+    profile = pd.DataFrame([{
+        "experience_level": experience,
+        "job_title":        job_title,
+        "remote_ratio":     remote_ratio,
+        **(locations or {}),
+    }])
+    encoded    = encode_profiles(profile, model_columns, feature_config)
+    tree_preds = per_tree_predictions(model, encoded)[:, 0]
+    p_low, p_mid, p_high = np.percentile(tree_preds, INTERVAL_QUANTILES)
+    _, contributions = explain_profiles(model, encoded)
+    return {
+        "predicted": float(tree_preds.mean()),
+        "p10":       float(p_low),
+        "p50":       float(p_mid),
+        "p90":       float(p_high),
+        **{column: float(value) for column, value in contributions.iloc[0].items()},
+    }
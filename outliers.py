@@ -0,0 +1,225 @@
+
+import numpy as np
+import pandas as pd
+
+from sketches import DEFAULT_K, GroupedSketches
+
+
+# ==============================================================================
+# PER-GROUP OUTLIER FENCES
+# ==============================================================================
+#
+# Salaries are judged against their own experience_level × job_title group
+# instead of one global cap. Each level of OUTLIER_LEVELS is factorised into
+# integer codes and sorted once by (code, value), so every group is a sorted
+# run and all group quantiles are read off by position in one vectorised step:
+#
+#   iqr  fences = [Q1 − k·IQR, Q3 + k·IQR]
+#   mad  fences = median ± k · 1.4826 · MAD        (robust z-score)
+#
+# Groups with fewer than `min_rows` rows (or zero spread) fall back to the next
+# coarser level, and finally to the whole column. Under chunked ingestion the
+# same fences are derived from per-group quantile sketches.
+
+OUTLIER_GROUPS  = ["experience_level", "job_title"]
+OUTLIER_LEVELS  = [OUTLIER_GROUPS, ["experience_level"]]  # finest first; the whole column is the last fallback
+OUTLIER_METHODS = {"iqr": 1.5, "mad": 3.5}                # method → default fence factor k
+MIN_GROUP_ROWS  = 30
+MAD_SCALE       = 1.4826                                  # MAD → standard deviation under normality
+
+
+def _grouped_quantiles(codes: np.ndarray, values: np.ndarray, n_groups: int, q) -> np.ndarray:
+    """(n_groups × len(q)) linear-interpolated quantiles from one sort by (code, value)."""
+    order  = np.lexsort((values, codes))
+    ranked = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    position = np.maximum(counts - 1, 0)[:, None] * np.asarray(q, dtype=np.float64)[None, :]
+    lower    = np.floor(position).astype(np.int64)
+    upper    = np.minimum(lower + 1, np.maximum(counts - 1, 0)[:, None])
+    low_val  = ranked[np.minimum(starts[:, None] + lower, len(ranked) - 1)]
+    high_val = ranked[np.minimum(starts[:, None] + upper, len(ranked) - 1)]
+    return low_val + (high_val - low_val) * (position - lower)
+
+
+def _fences(codes: np.ndarray, values: np.ndarray, n_groups: int, method: str, factor: float):
+    """Per-group (lower, upper, spread) for one grouping level."""
+    if method == "iqr":
+        q1, q3 = _grouped_quantiles(codes, values, n_groups, [0.25, 0.75]).T
+        spread = q3 - q1
+        return q1 - factor * spread, q3 + factor * spread, spread
+
+    median = _grouped_quantiles(codes, values, n_groups, [0.5])[:, 0]
+    spread = MAD_SCALE * _grouped_quantiles(codes, np.abs(values - median[codes]), n_groups, [0.5])[:, 0]
+    return median - factor * spread, median + factor * spread, spread
+
+
+def _sketch_fences(sketch, method: str, factor: float):
+    """(lower, upper, spread) of one QuantileSketch – same rules as _fences."""
+    if method == "iqr":
+        q1, q3 = sketch.quantile([0.25, 0.75])
+        return q1 - factor * (q3 - q1), q3 + factor * (q3 - q1), q3 - q1
+
+    median         = sketch.median()
+    items, weights = sketch.weighted_items()
+    deviation      = np.abs(items - median)
+    order          = np.argsort(deviation, kind="stable")
+    cumulative     = np.cumsum(weights[order])
+    mad            = deviation[order][np.searchsorted(cumulative, cumulative[-1] / 2)]
+    return median - factor * MAD_SCALE * mad, median + factor * MAD_SCALE * mad, MAD_SCALE * mad
+
+
+def _group_codes(df: pd.DataFrame, columns: list):
+    """(codes, uniques) of the `columns` groups; -1 for rows with a missing group value."""
+    codes, uniques = pd.MultiIndex.from_frame(df[columns]).factorize()
+    return np.where(df[columns].notna().all(axis=1).to_numpy() & (codes >= 0), codes, -1), uniques
+
+
+def _basis(level: list) -> str:
+    return " × ".join(level) if level else "all rows"
+
+
+class OutlierFences:
+    """
+    Effective [lower, upper] salary fences per group of `group_columns`, plus
+    the whole-column fences for groups not seen when the fences were fitted.
+    """
+
+    def __init__(self, group_columns: list, table: pd.DataFrame, default: tuple, method: str, factor: float):
+        self.group_columns = list(group_columns)
+        self.table         = table       # index = group key, columns = lower / upper / basis
+        self.default       = default     # (lower, upper)
+        self.method        = method
+        self.factor        = factor
+
+    def bounds(self, df: pd.DataFrame):
+        """Per-row (lower, upper) arrays for `df`."""
+        position = self.table.index.get_indexer(pd.MultiIndex.from_frame(df[self.group_columns]))
+        known    = position >= 0
+        lower    = np.where(known, self.table["lower"].to_numpy()[position], self.default[0])
+        upper    = np.where(known, self.table["upper"].to_numpy()[position], self.default[1])
+        return lower, upper
+
+    def keep(self, df: pd.DataFrame, value_column: str = "salary_in_usd") -> np.ndarray:
+        """Boolean mask of rows inside their group's fences; works chunk by chunk."""
+        lower, upper = self.bounds(df)
+        values = df[value_column].to_numpy(dtype=np.float64)
+        return (values >= lower) & (values <= upper)
+
+    def report(self, df: pd.DataFrame, keep: np.ndarray) -> pd.DataFrame:
+        """
+        Rows, rows removed and fences per group, most removals first. Rows with
+        a missing group value belong to no group and are not listed.
+        """
+        codes, uniques = _group_codes(df, self.group_columns)
+        valid   = codes >= 0
+        rows    = np.bincount(codes[valid], minlength=len(uniques))
+        removed = np.bincount(codes[valid], weights=(~keep[valid]).astype(np.float64), minlength=len(uniques)).astype(np.int64)
+        present = rows > 0
+
+        report = pd.DataFrame(
+            {"rows": rows[present], "removed": removed[present], "removed_pct": (removed[present] / rows[present] * 100).round(1)},
+            index=pd.MultiIndex.from_tuples(list(uniques[present]), names=self.group_columns),
+        )
+        report = report.join(self.table)
+        report["basis"] = report["basis"].fillna(_basis([]))
+        report[["lower", "upper"]] = report[["lower", "upper"]].fillna(
+            pd.Series({"lower": self.default[0], "upper": self.default[1]})
+        )
+        return report.sort_values(["removed", "rows"], ascending=False)
+
+
+def fit_fences(
+    df: pd.DataFrame,
+    value_column: str = "salary_in_usd",
+    method: str = "iqr",
+    factor: float = None,
+    min_rows: int = MIN_GROUP_ROWS,
+    levels: list = OUTLIER_LEVELS,
+) -> OutlierFences:
+    """
+    In-memory fences: one sort per level, no Python loop over groups or rows.
+    Rows with a missing group value skip that level (the whole-column fences at worst).
+    """
+    factor = OUTLIER_METHODS[method] if factor is None else factor
+    values = df[value_column].to_numpy(dtype=np.float64)
+
+    # Whole column first, then overwrite row by row with every finer level that qualifies
+    lower, upper, _ = _fences(np.zeros(len(df), dtype=np.int64), values, 1, method, factor)
+    default   = (float(lower[0]), float(upper[0]))
+    row_lower = np.full(len(df), default[0])
+    row_upper = np.full(len(df), default[1])
+    row_basis = np.full(len(df), len(levels), dtype=np.int64)
+
+    for depth in range(len(levels) - 1, -1, -1):
+        codes, uniques = _group_codes(df, levels[depth])
+        valid = np.flatnonzero(codes >= 0)
+        if not len(valid):
+            continue
+        lower, upper, spread = _fences(codes[valid], values[valid], len(uniques), method, factor)
+        usable = (np.bincount(codes[valid], minlength=len(uniques)) >= min_rows) & (spread > 0)
+        rows   = valid[usable[codes[valid]]]
+        row_lower[rows], row_upper[rows], row_basis[rows] = lower[codes[rows]], upper[codes[rows]], depth
+
+    # Fences are constant within a finest group → one table row per group
+    codes, uniques = _group_codes(df, levels[0])
+    valid          = np.flatnonzero(codes >= 0)
+    present, first = np.unique(codes[valid], return_index=True)
+    first    = valid[first]
+    names    = np.array([_basis(level) for level in levels] + [_basis([])], dtype=object)
+    table    = pd.DataFrame(
+        {"lower": row_lower[first], "upper": row_upper[first], "basis": names[row_basis[first]]},
+        index=pd.MultiIndex.from_tuples(list(uniques[present]), names=levels[0]),
+    )
+    return OutlierFences(levels[0], table, default, method, factor)
+
+
+def fences_from_sketches(
+    sketches: GroupedSketches,
+    method: str = "iqr",
+    factor: float = None,
+    min_rows: int = MIN_GROUP_ROWS,
+    levels: list = OUTLIER_LEVELS,
+) -> OutlierFences:
+    """
+    Fences from per-group quantile sketches (grouped by levels[0]), for data
+    that is only ever seen chunk by chunk. Coarser fallbacks merge the cells.
+    """
+    factor  = OUTLIER_METHODS[method] if factor is None else factor
+    lower, upper, _ = _sketch_fences(sketches.merged(), method, factor)
+    default = (float(lower), float(upper))
+    cached  = {}
+
+    def level_fences(depth: int, key: tuple):
+        level     = levels[depth]
+        level_key = tuple(key[sketches.group_columns.index(column)] for column in level)
+        if (depth, level_key) not in cached:
+            sketch = sketches.merged(**{column: [value] for column, value in zip(level, level_key)})
+            cached[(depth, level_key)] = (sketch.n,) + tuple(_sketch_fences(sketch, method, factor))
+        return cached[(depth, level_key)]
+
+    rows = []
+    for key in sketches.sketches:
+        fence = (default[0], default[1], _basis([]))
+        for depth in range(len(levels)):
+            n, lower, upper, spread = level_fences(depth, key)
+            if n >= min_rows and spread > 0:
+                fence = (float(lower), float(upper), _basis(levels[depth]))
+                break
+        rows.append(fence)
+
+    table = pd.DataFrame(
+        rows, columns=["lower", "upper", "basis"],
+        index=pd.MultiIndex.from_tuples(list(sketches.sketches), names=sketches.group_columns),
+    )
+    return OutlierFences(sketches.group_columns, table, default, method, factor)
+
+
+def fit_fences_chunked(chunks, value_column: str = "salary_in_usd", k: int = DEFAULT_K, **kwargs) -> OutlierFences:
+    """First pass over an iterable of DataFrame chunks; filter with fences.keep(chunk) in the second."""
+    levels   = kwargs.get("levels", OUTLIER_LEVELS)
+    sketches = GroupedSketches(levels[0], k)
+    for chunk in chunks:
+        sketches.update(chunk, value_column)
+    return fences_from_sketches(sketches, **kwargs)
@@ -0,0 +1,88 @@
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+# ==============================================================================
+# BACKGROUND PDF RENDERING  –  bounded worker pool shared by every session
+# ==============================================================================
+#
+# The app submits a render job right after the prediction is drawn and keeps
+# the returned Future in session state as the job handle. The result fragment
+# polls it and shows the download button once it is done, so the script
+# thread never waits on FPDF.
+
+DEFAULT_WORKERS     = 2
+DEFAULT_MAX_PENDING = 16     # queued + running jobs before new ones are refused
+
+
+class PdfJobPool:
+    """ThreadPoolExecutor with a cap on outstanding jobs and render-time stats."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self.workers      = workers
+        self.max_pending  = max_pending
+        self.submitted    = 0
+        self.completed    = 0
+        self.failed       = 0
+        self.rejected     = 0
+        self.running      = 0
+        self.render_seconds = []            # last 100 render times
+        self._pending     = 0
+        self._lock        = threading.Lock()
+        self._executor    = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf")
+
+    def submit(self, render, **kwargs):
+        """Queue `render(**kwargs)`; returns its Future, or None if the queue is full."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                return None
+            self._pending  += 1
+            self.submitted += 1
+        return self._executor.submit(self._run, render, kwargs)
+
+    def _run(self, render, kwargs: dict) -> bytes:
+        with self._lock:
+            self.running += 1
+        start = time.perf_counter()
+        try:
+            result = render(**kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+                self.render_seconds = (self.render_seconds + [time.perf_counter() - start])[-100:]
+            return result
+        finally:
+            with self._lock:
+                self.running  -= 1
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        """Queue depth and render times for display / pool sizing."""
+        with self._lock:
+            times = sorted(self.render_seconds)
+            return {
+                "workers":       self.workers,
+                "queued":        self._pending - self.running,
+                "running":       self.running,
+                "submitted":     self.submitted,
+                "completed":     self.completed,
+                "failed":        self.failed,
+                "rejected":      self.rejected,
+                "last_seconds":  self.render_seconds[-1] if times else None,
+                "p50_seconds":   times[len(times) // 2] if times else None,
+            }
+
+
+def job_result(job: Future):
+    """(done, pdf_bytes, error) for a job handle without blocking."""
+    if job is None or not job.done():
+        return False, None, None
+    error = job.exception()
+    return True, (None if error else job.result()), error
@@ -0,0 +1,94 @@
+
+import numpy as np
+import pandas as pd
+
+
+# ==============================================================================
+# COMPARABLE-RECORDS (PEER) INDEX
+# ==============================================================================
+#
+# For every grouping level the rows are sorted once by (group, salary), so each
+# group is a contiguous, already sorted slice of one array:
+#
+#   values  [ 52k 61k 75k | 90k 98k 120k 131k | ... ]
+#   offsets [ 0           3                   7  ... ]
+#
+# A profile lookup is one key lookup plus a slice; percentiles are read off the
+# sorted slice by position and samples are evenly spaced rows from it. Sparse
+# profiles fall back to the next coarser level.
+
+PEER_LEVELS = [
+    ("Same level, title & arrangement", ["experience_level", "job_title", "remote_ratio"]),
+    ("Same level & title",              ["experience_level", "job_title"]),
+    ("Same title",                      ["job_title"]),
+    ("Same level",                      ["experience_level"]),
+]
+MIN_PEERS        = 20
+PEER_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _sorted_percentiles(values: np.ndarray, percentiles) -> np.ndarray:
+    """Linear-interpolated percentiles of an already sorted array (no partition / sort)."""
+    position = np.asarray(percentiles, dtype=np.float64) / 100 * (len(values) - 1)
+    lower    = np.floor(position).astype(np.int64)
+    upper    = np.minimum(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class _PeerLevel:
+    """Sorted values + offsets for one grouping; rows with a missing group value are left out."""
+
+    def __init__(self, df: pd.DataFrame, value_column: str, columns: list):
+        codes, uniques = pd.MultiIndex.from_frame(df[columns]).factorize()
+        values = df[value_column].to_numpy(dtype=np.float64)
+        keep   = np.flatnonzero(df[columns].notna().all(axis=1).to_numpy() & (codes >= 0))
+        counts = np.bincount(codes[keep], minlength=len(uniques))
+
+        # Primary key: group code, secondary: salary → each group is a sorted run
+        order         = keep[np.lexsort((values[keep], codes[keep]))]
+        self.values   = values[order]
+        self.rows     = order
+        self.offsets  = np.concatenate([[0], np.cumsum(counts)])
+        self.group_of = {key: group for group, key in enumerate(uniques) if counts[group]}
+
+    def slice(self, key: tuple):
+        group = self.group_of.get(key)
+        if group is None:
+            return None
+        return slice(self.offsets[group], self.offsets[group + 1])
+
+
+class PeerIndex:
+    """Percentiles, counts and sample records of comparable profiles."""
+
+    def __init__(self, df: pd.DataFrame, value_column: str = "salary_in_usd", levels: list = PEER_LEVELS):
+        self.df           = df
+        self.value_column = value_column
+        self.levels       = [(name, columns, _PeerLevel(df, value_column, columns)) for name, columns in levels]
+
+    def lookup(self, profile: dict, min_peers: int = MIN_PEERS, sample_size: int = 5) -> dict:
+        """
+        Peers of `profile` ({column: value}) at the finest level with at least
+        `min_peers` records (or the largest group found if none reaches it).
+        """
+        found = []
+        for name, columns, level in self.levels:
+            span = level.slice(tuple(profile[column] for column in columns))
+            if span is not None:
+                found.append((name, columns, level, span.stop - span.start, span))
+                if found[-1][3] >= min_peers:
+                    break
+        if not found:
+            return None
+
+        name, columns, level, count, span = found[-1] if found[-1][3] >= min_peers else max(found, key=lambda f: f[3])
+        values = level.values[span]
+        picks  = np.unique(np.linspace(0, count - 1, min(sample_size, count)).round().astype(np.int64))
+        return {
+            "level":       name,
+            "columns":     columns,
+            "count":       int(count),
+            "mean":        float(values.mean()),
+            "percentiles": dict(zip(PEER_PERCENTILES, _sorted_percentiles(values, PEER_PERCENTILES).tolist())),
+            "sample":      self.df.iloc[level.rows[span][picks]],
+        }
@@ -0,0 +1,190 @@
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:                 # Windows
+    RESOURCE_AVAILABLE = False
+
+
+# ==============================================================================
+# OPT-IN PER-STEP PROFILING  –  used by the offline pipeline scripts
+# ==============================================================================
+#
+# Enabled with --profile (or PROFILE_ENV_VAR=1). Each numbered step records
+# wall and CPU time, Python heap (tracemalloc current / peak), process RSS
+# (before / after / sampled peak) and the source lines that allocated the most
+# memory during the step. The report is written as JSON to PROFILE_DIR.
+
+PROFILE_ENV_VAR    = "CAREERSCOUT_PROFILE"
+PROFILE_DIR        = "profiles"
+TOP_ALLOCATIONS    = 10
+RSS_SAMPLE_SECONDS = 0.05
+
+
+def profiling_requested(argv: list = None) -> bool:
+    """True if --profile is on the command line or PROFILE_ENV_VAR is set."""
+    argv = sys.argv[1:] if argv is None else argv
+    return "--profile" in argv or os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0")
+
+
+def rss_bytes(pid=None):
+    """Current resident set size of this process (or `pid`), or None if it cannot be read on this platform."""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process(pid).memory_info().rss
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _max_rss_bytes():
+    """Process-lifetime peak RSS reported by the OS."""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _RssSampler(threading.Thread):
+    """Polls RSS in the background so short spikes inside a step are caught."""
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak     = rss_bytes() or 0
+        self._halt    = threading.Event()
+
+    def reset(self) -> None:
+        self.peak = rss_bytes() or 0
+
+    def run(self) -> None:
+        while not self._halt.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes() or 0)
+
+    def stop(self) -> None:
+        self._halt.set()
+
+
+class StepProfiler:
+    """
+    Records one entry per step. start(name) closes the previous step, so flat
+    scripts only need one call at the top of each section; finish() closes the
+    last one and writes the report. Every method is a no-op when disabled.
+    """
+
+    def __init__(self, script: str, enabled: bool = False, top_allocations: int = TOP_ALLOCATIONS):
+        self.script          = script
+        self.enabled         = enabled
+        self.top_allocations = top_allocations
+        self.steps           = []
+        self._current        = None
+        self._sampler        = None
+
+    def start(self, name: str) -> None:
+        if not self.enabled:
+            return
+        if self._current is None and not self.steps:
+            tracemalloc.start()
+            if rss_bytes() is not None:
+                self._sampler = _RssSampler(RSS_SAMPLE_SECONDS)
+                self._sampler.start()
+        self._close()
+
+        tracemalloc.reset_peak()
+        if self._sampler:
+            self._sampler.reset()
+        self._current = {
+            "name":       name,
+            "wall":       time.perf_counter(),
+            "cpu":        time.process_time(),
+            "rss_before": rss_bytes(),
+            "snapshot":   tracemalloc.take_snapshot(),
+        }
+
+    def _close(self) -> None:
+        if self._current is None:
+            return
+        step, self._current = self._current, None
+        # Times and memory first, so the snapshot below does not count
+        wall, cpu = time.perf_counter() - step["wall"], time.process_time() - step["cpu"]
+        heap_current, heap_peak = tracemalloc.get_traced_memory()
+        rss_after = rss_bytes()
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        top = [
+            {
+                "location":   f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_bytes": stat.size_diff,
+                "count":      stat.count_diff,
+            }
+            for stat in snapshot.compare_to(step["snapshot"], "lineno")[:self.top_allocations]
+            if stat.size_diff > 0
+        ]
+
+        self.steps.append({
+            "name":               step["name"],
+            "wall_seconds":       round(wall, 4),
+            "cpu_seconds":        round(cpu, 4),
+            "heap_current_bytes": heap_current,
+            "heap_peak_bytes":    heap_peak,
+            "rss_before_bytes":   step["rss_before"],
+            "rss_after_bytes":    rss_after,
+            "rss_peak_bytes":     self._sampler.peak if self._sampler else None,
+            "top_allocations":    top,
+        })
+
+    def report(self) -> dict:
+        return {
+            "script":             self.script,
+            "created":            datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python":             sys.version.split()[0],
+            "max_rss_bytes":      _max_rss_bytes(),
+            "total_wall_seconds": round(sum(step["wall_seconds"] for step in self.steps), 4),
+            "steps":              self.steps,
+        }
+
+    def finish(self, directory: str = PROFILE_DIR):
+        """Close the last step, print a summary and write the JSON report; returns its path."""
+        if not self.enabled:
+            return None
+        self._close()
+        if self._sampler:
+            self._sampler.stop()
+        tracemalloc.stop()
+
+        report = self.report()
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        path  = os.path.join(directory, f"{self.script}-{stamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        def mb(n) -> str:
+            return f"{n / 1024 ** 2:,.1f}" if n is not None else "n/a"
+
+        print(f"\n── Profile ({self.script}) " + "─" * max(0, 52 - len(self.script)))
+        print(f"  {'Step':<34}{'Wall s':>8}{'CPU s':>8}{'Heap pk MB':>11}{'RSS pk MB':>10}")
+        for step in self.steps:
+            print(f"  {step['name'][:33]:<34}{step['wall_seconds']:>8.2f}{step['cpu_seconds']:>8.2f}"
+                  f"{mb(step['heap_peak_bytes']):>11}{mb(step['rss_peak_bytes']):>10}")
+        print(f"  Report written → '{path}'")
+        return path
@@ -0,0 +1,316 @@
+
+import os
+
+from chart_assets import PRINT_WIDTH_MM, print_chart
+from model_utils import FEATURE_LABELS
+
+try:
+    from fpdf import FPDF
+    FPDF_AVAILABLE = True
+except ImportError:
+    FPDF_AVAILABLE = False
+
+
+# ==============================================================================
+# PDF REPORT  –  shared by app.py (one report per click) and bulk_reports.py
+# ==============================================================================
+#
+# Page 1 is the personalised prediction; pages 2–5 are the market charts,
+# identical for every candidate. The pieces can be rendered separately so the
+# bulk command builds the chart pages once per worker and only re-renders page 1.
+
+EXPERIENCE_LABELS = {"EN": "Entry Level", "MI": "Mid Level", "SE": "Senior Level", "EX": "Executive / Director"}
+REMOTE_LABELS     = {0: "On-Site (0%)", 50: "Hybrid (50%)", 100: "Fully Remote (100%)"}
+
+CHARTS = [
+    ("fig1_salary_distribution.png",  "Salary Distribution",           "Distribution of salaries across the dataset after removing per-group outliers."),
+    ("fig2_experience_level_count.png","Experience Level Distribution", "Breakdown of the number of professionals at each experience level."),
+    ("fig3_top10_jobs.png",            "Top 10 Highest-Paying Roles",   "Average salary by job title - top 10 earners in the data science field."),
+    ("fig4_salary_vs_experience.png",  "Salary vs. Experience Level",   "Salary spread by experience level, showing medians, IQR, and outliers."),
+]
+
+MISSING_FPDF_MESSAGE = b"PDF generation requires fpdf2. Run: pip install fpdf2"
+
+
+def safe_text(text: str) -> str:
+    """Strip/replace any character outside latin-1 so Helvetica never throws."""
+    replacements = {
+        "–": "-",   # en dash  –
+        "—": "-",   # em dash  —
+        "’": "'",   # right single quote
+        "‘": "'",   # left single quote
+        "“": '"',   # left double quote
+        "”": '"',   # right double quote
+        "•": "*",   # bullet
+        "·": "*",   # middle dot
+        "→": "->",  # arrow right
+        "←": "<-",  # arrow left
+        "×": "x",   # multiplication sign
+        "…": "...", # ellipsis
+    }
+    for char, replacement in replacements.items():
+        text = text.replace(char, replacement)
+    # Final safety net: encode to latin-1, drop anything that still fails
+    return text.encode("latin-1", errors="replace").decode("latin-1")
+
+
+def new_pdf(page_offset: int = 0) -> "FPDF":
+    """Empty report document with the CareerScout header / footer; page numbers start after `page_offset`."""
+
+    class PDF(FPDF):
+        def header(self):
+            # Dark top bar
+            self.set_fill_color(7, 11, 20)
+            self.rect(0, 0, 210, 18, "F")
+            self.set_font("Helvetica", "B", 9)
+            self.set_text_color(0, 212, 180)
+            self.set_xy(10, 5)
+            self.cell(0, 8, "CAREERSCOUT  -  DATA SCIENCE SALARY INTELLIGENCE", ln=0)
+            self.set_text_color(100, 116, 139)
+            self.set_font("Helvetica", "", 8)
+            self.set_xy(0, 5)
+            self.cell(200, 8, "carerescout.ai", ln=0, align="R")
+
+        def footer(self):
+            self.set_y(-14)
+            self.set_fill_color(7, 11, 20)
+            self.rect(0, self.get_y(), 210, 20, "F")
+            self.set_font("Helvetica", "", 8)
+            self.set_text_color(100, 116, 139)
+            self.cell(0, 8, f"Page {self.page_no() + page_offset}  -  Generated by CareerScout  -  Powered by RandomForest ML", align="C")
+
+    pdf = PDF()
+    pdf.set_auto_page_break(auto=True, margin=20)
+    pdf.set_margins(left=15, top=22, right=15)
+    return pdf
+
+
+def add_prediction_page(
+    pdf: "FPDF",
+    job_title: str,
+    experience: str,
+    remote_ratio: int,
+    predicted_salary: float,
+    low: float,
+    high: float,
+    baseline: float = None,
+    contributions: dict = None,
+    training_rows: int = None,
+) -> None:
+    """Append the personalised prediction page (with the per-feature breakdown if given)."""
+    pdf.add_page()
+
+    # Hero title block
+    pdf.set_fill_color(14, 21, 37)
+    pdf.rect(15, 24, 180, 42, "F")
+    pdf.set_draw_color(0, 212, 180)
+    pdf.set_line_width(0.5)
+    pdf.rect(15, 24, 180, 42)
+    pdf.set_font("Helvetica", "B", 22)
+    pdf.set_text_color(0, 212, 180)
+    pdf.set_xy(15, 31)
+    pdf.cell(180, 10, safe_text("CareerScout Salary Report"), ln=1, align="C")
+    pdf.set_font("Helvetica", "", 10)
+    pdf.set_text_color(100, 116, 139)
+    pdf.set_xy(15, 45)
+    pdf.cell(180, 8, safe_text("Data Science Market Intelligence  -  2025 Dataset"), ln=1, align="C")
+
+    # Section: Your Profile
+    pdf.set_xy(15, 74)
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.set_text_color(0, 212, 180)
+    pdf.cell(0, 8, safe_text("YOUR INPUT PROFILE"), ln=1)
+    pdf.set_draw_color(0, 212, 180)
+    pdf.set_line_width(0.3)
+    pdf.line(15, pdf.get_y(), 195, pdf.get_y())
+    pdf.ln(4)
+
+    # Render profile rows properly
+    profile_data = [
+        ("Job Title",        safe_text(job_title)),
+        ("Experience Level", f"{experience}  -  {EXPERIENCE_LABELS.get(experience, experience)}"),
+        ("Remote Ratio",     f"{remote_ratio}%  -  {REMOTE_LABELS.get(remote_ratio, str(remote_ratio))}"),
+    ]
+    for label, value in profile_data:
+        x = pdf.get_x()
+        y = pdf.get_y()
+        pdf.set_fill_color(11, 17, 30)
+        pdf.rect(15, y, 180, 11, "F")
+        pdf.set_font("Helvetica", "B", 9)
+        pdf.set_text_color(100, 116, 139)
+        pdf.set_xy(20, y + 1.5)
+        pdf.cell(50, 8, label.upper())
+        pdf.set_font("Helvetica", "", 10)
+        pdf.set_text_color(226, 232, 240)
+        pdf.set_xy(70, y + 1.5)
+        pdf.cell(120, 8, value)
+        pdf.set_xy(15, y + 12)
+
+    # Predicted Salary hero box
+    pdf.ln(10)
+    y_salary = pdf.get_y()
+    pdf.set_fill_color(7, 11, 20)
+    pdf.rect(15, y_salary, 180, 48, "F")
+    pdf.set_draw_color(245, 158, 11)
+    pdf.set_line_width(1.0)
+    pdf.rect(15, y_salary, 180, 48)
+
+    pdf.set_font("Helvetica", "B", 10)
+    pdf.set_text_color(100, 116, 139)
+    pdf.set_xy(15, y_salary + 8)
+    pdf.cell(180, 8, safe_text("PREDICTED ANNUAL SALARY (USD)"), ln=1, align="C")
+
+    pdf.set_font("Helvetica", "B", 34)
+    pdf.set_text_color(245, 158, 11)
+    pdf.set_xy(15, y_salary + 17)
+    pdf.cell(180, 18, safe_text(f"${predicted_salary:,.0f}"), ln=1, align="C")
+
+    pdf.set_font("Helvetica", "", 9)
+    pdf.set_text_color(100, 116, 139)
+    pdf.set_xy(15, y_salary + 37)
+    trained_on = f" trained on {training_rows:,} real-world records" if training_rows else ""
+    pdf.cell(180, 8, safe_text(f"Estimated by RandomForestRegressor{trained_on}"), ln=1, align="C")
+
+    # Confidence range
+    pdf.ln(8)
+    pdf.set_font("Helvetica", "B", 10)
+    pdf.set_text_color(0, 212, 180)
+    pdf.cell(0, 8, safe_text("ESTIMATED MARKET RANGE  (P10 - P90 ACROSS TREES)"), ln=1)
+    pdf.set_line_width(0.3)
+    pdf.line(15, pdf.get_y(), 195, pdf.get_y())
+    pdf.ln(4)
+
+    range_data = [
+        ("Conservative (P10)",  f"${low:,.0f}"),
+        ("Predicted (Mid)",     f"${predicted_salary:,.0f}"),
+        ("Optimistic (P90)",    f"${high:,.0f}"),
+    ]
+    col_w = 57
+    x_start = 18
+    for i, (label, val) in enumerate(range_data):
+        bx = x_start + i * (col_w + 3)
+        by = pdf.get_y()
+        fill = (14, 21, 37) if i != 1 else (7, 11, 20)
+        border_c = (0, 212, 180) if i == 1 else (30, 45, 69)
+        pdf.set_fill_color(*fill)
+        pdf.rect(bx, by, col_w, 22, "F")
+        pdf.set_draw_color(*border_c)
+        pdf.set_line_width(0.5 if i != 1 else 1.0)
+        pdf.rect(bx, by, col_w, 22)
+        pdf.set_font("Helvetica", "", 7)
+        pdf.set_text_color(100, 116, 139)
+        pdf.set_xy(bx, by + 3)
+        pdf.cell(col_w, 6, safe_text(label), align="C")
+        c = (245, 158, 11) if i == 1 else (0, 212, 180)
+        pdf.set_font("Helvetica", "B", 11)
+        pdf.set_text_color(*c)
+        pdf.set_xy(bx, by + 10)
+        pdf.cell(col_w, 8, val, align="C")
+
+    # What moved the estimate – baseline + per-feature contributions
+    if contributions:
+        y_drivers = pdf.get_y() + 17
+        pdf.set_xy(15, y_drivers)
+        pdf.set_font("Helvetica", "B", 8)
+        pdf.set_text_color(0, 212, 180)
+        pdf.cell(0, 6, safe_text(f"WHAT MOVED THE ESTIMATE  (from a ${baseline:,.0f} baseline)"), ln=1)
+
+        col_w = 180 / len(contributions)
+        for i, (feature, amount) in enumerate(contributions.items()):
+            bx = 15 + i * col_w
+            pdf.set_fill_color(14, 21, 37)
+            pdf.rect(bx + 1, y_drivers + 7, col_w - 2, 13, "F")
+            pdf.set_font("Helvetica", "", 7)
+            pdf.set_text_color(100, 116, 139)
+            pdf.set_xy(bx, y_drivers + 8)
+            pdf.cell(col_w, 5, safe_text(FEATURE_LABELS.get(feature, feature)), align="C")
+            pdf.set_font("Helvetica", "B", 10)
+            pdf.set_text_color(*((0, 212, 180) if amount >= 0 else (239, 68, 68)))
+            pdf.set_xy(bx, y_drivers + 13)
+            pdf.cell(col_w, 6, f"{'+' if amount >= 0 else '-'}${abs(amount):,.0f}", align="C")
+        pdf.set_xy(15, y_drivers + 24)
+    else:
+        pdf.ln(32)
+
+    # Disclaimer
+    pdf.set_font("Helvetica", "I", 8)
+    pdf.set_text_color(51, 65, 85)
+    pdf.multi_cell(
+        0, 5,
+        safe_text("Disclaimer: This prediction is generated by a machine learning"
+                  " model trained on historical data. Actual salaries vary based"
+                  " on company, location, negotiation, and individual factors."
+                  " Use this as a market reference, not a guarantee."),
+    )
+
+
+def add_chart_pages(pdf: "FPDF") -> None:
+    """Append one page per market analysis chart (missing images get a placeholder)."""
+    for img_path, chart_title, chart_desc in CHARTS:
+        pdf.add_page()
+        pdf.set_font("Helvetica", "B", 14)
+        pdf.set_text_color(0, 212, 180)
+        pdf.set_xy(15, 26)
+        pdf.cell(0, 10, safe_text(f"MARKET ANALYSIS  -  {chart_title.upper()}"), ln=1)
+        pdf.set_draw_color(0, 212, 180)
+        pdf.set_line_width(0.3)
+        pdf.line(15, pdf.get_y(), 195, pdf.get_y())
+        pdf.ln(3)
+        pdf.set_font("Helvetica", "", 9)
+        pdf.set_text_color(100, 116, 139)
+        pdf.cell(0, 6, safe_text(chart_desc), ln=1)
+        pdf.ln(4)
+
+        # Print variant from chart_assets/ (a palette PNG, embedded indexed) when it exists
+        image_path = print_chart(img_path)
+        if os.path.exists(image_path):
+            pdf.image(image_path, x=15, y=pdf.get_y(), w=PRINT_WIDTH_MM)
+        else:
+            pdf.set_fill_color(14, 21, 37)
+            pdf.rect(15, pdf.get_y(), 180, 80, "F")
+            pdf.set_font("Helvetica", "I", 10)
+            pdf.set_text_color(100, 116, 139)
+            pdf.set_xy(15, pdf.get_y() + 36)
+            pdf.cell(180, 8, safe_text(f"[Chart file '{img_path}' not found in working directory]"), align="C")
+
+
+def generate_pdf_report(
+    job_title: str,
+    experience: str,
+    remote_ratio: int,
+    predicted_salary: float,
+    low: float,
+    high: float,
+    baseline: float = None,
+    contributions: dict = None,
+    training_rows: int = None,
+) -> bytes:
+    """
+    Build a multi-page PDF report with the user's salary prediction on page 1
+    and the four market analysis charts on the subsequent pages.
+    `low` / `high` are the p10 / p90 of the per-tree forest outputs;
+    `contributions` ({feature: USD}) explain the prediction relative to `baseline`;
+    `training_rows` is the model's training set size, shown under the salary.
+    Returns the PDF as raw bytes for st.download_button.
+    """
+    if not FPDF_AVAILABLE:
+        return MISSING_FPDF_MESSAGE
+
+    pdf = new_pdf()
+    add_prediction_page(pdf, job_title, experience, remote_ratio, predicted_salary, low, high, baseline, contributions, training_rows)
+    add_chart_pages(pdf)
+    return bytes(pdf.output())
+
+
+def render_prediction_page(**profile) -> bytes:
+    """Page 1 only, as a standalone PDF (arguments as for generate_pdf_report)."""
+    pdf = new_pdf()
+    add_prediction_page(pdf, **profile)
+    return bytes(pdf.output())
+
+
+def render_chart_pages() -> bytes:
+    """Pages 2–5 only, numbered as if they followed the prediction page."""
+    pdf = new_pdf(page_offset=1)
+    add_chart_pages(pdf)
+    return bytes(pdf.output())
@@ -0,0 +1,53 @@
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# ==============================================================================
+# STRATIFIED SAMPLING  –  fast-retrain mode of 2_model_training.py
+# ==============================================================================
+#
+# Strata are experience_level × job_title. Every stratum keeps at least
+# `min_per_stratum` rows, so every one-hot column still has training rows,
+# and the remaining budget is shared in proportion to stratum size.
+
+STRATA_COLUMNS = ["experience_level", "job_title"]
+PILOT_ROWS     = 2_000
+BUDGET_SAFETY  = 0.8   # aim below the budget; fit time grows slightly faster than linear
+
+
+def stratified_sample(
+    profiles: pd.DataFrame,
+    size: int,
+    min_per_stratum: int = 1,
+    random_state: int = 42,
+) -> pd.Index:
+    """Index labels of a stratified sample of about `size` rows of `profiles`."""
+    if size >= len(profiles):
+        return profiles.index
+
+    rng      = np.random.default_rng(random_state)
+    shuffled = profiles[STRATA_COLUMNS].iloc[rng.permutation(len(profiles))]
+    strata   = shuffled.groupby(STRATA_COLUMNS, sort=False).ngroup().to_numpy()
+
+    counts   = np.bincount(strata)
+    floor    = np.minimum(counts, min_per_stratum)
+    spare    = max(size - int(floor.sum()), 0)
+    extra    = np.floor((counts - floor) * spare / max(int((counts - floor).sum()), 1)).astype(np.int64)
+    quota    = floor + extra
+
+    # Position of each row within its (shuffled) stratum → keep the first `quota`
+    rank     = shuffled.groupby(strata, sort=False).cumcount().to_numpy()
+    return shuffled.index[rank < quota[strata]]
+
+
+def sample_size_for_budget(make_model, X: pd.DataFrame, y: pd.Series, budget_seconds: float,
+                           profiles: pd.DataFrame, random_state: int = 42) -> int:
+    """Rows a fit can use within `budget_seconds`, extrapolated from a timed pilot fit."""
+    pilot = stratified_sample(profiles, PILOT_ROWS, random_state=random_state)
+    start = time.perf_counter()
+    make_model().fit(X.loc[pilot], y.loc[pilot])
+    pilot_seconds = max(time.perf_counter() - start, 1e-3)
+    return int(len(pilot) * budget_seconds / pilot_seconds * BUDGET_SAFETY)
@@ -0,0 +1,183 @@
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+
+# ==============================================================================
+# KLL-STYLE QUANTILE SKETCH
+# ==============================================================================
+#
+# Items live in a stack of compactors; an item at level h stands for 2**h raw
+# values. When a level overflows it is sorted and every other item (random
+# offset) is promoted one level up. Rank error is O(1/k) of n, memory is
+# O(k log(n/k)) and two sketches merge by concatenating their levels.
+
+DEFAULT_K = 200
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch with bounded rank error."""
+
+    def __init__(self, k: int = DEFAULT_K, seed: int = 0):
+        self.k          = k
+        self.n          = 0
+        self.min        = np.inf
+        self.max        = -np.inf
+        self.compactors = [np.empty(0)]
+        self._rng       = np.random.default_rng(seed)
+
+    # ── building ────────────────────────────────────────────────────────────
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            if len(self.compactors[level]) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+
+                items = np.sort(self.compactors[level])
+                # An odd leftover stays behind so total weight is preserved
+                keep  = items[-1:] if len(items) % 2 else items[:0]
+                items = items[:-1] if len(items) % 2 else items
+
+                promoted = items[self._rng.integers(2)::2]
+                self.compactors[level]     = keep
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            level += 1
+
+    def update(self, values) -> "QuantileSketch":
+        """Add a batch (one chunk) of raw values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return self
+        self.n  += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold `other` into this sketch in place."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n  += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    # ── querying ────────────────────────────────────────────────────────────
+    def weighted_items(self):
+        """Sorted retained items and their weights."""
+        items   = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(c), 2.0 ** h) for h, c in enumerate(self.compactors)])
+        order   = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantile(self, q, between: tuple = None):
+        """
+        Approximate quantile(s) `q` in [0, 1]. `between=(lo, hi)` restricts the
+        query to values in that range, e.g. for a salary-range filter.
+        """
+        items, weights = self.weighted_items()
+        if between is not None:
+            inside  = (items >= between[0]) & (items <= between[1])
+            items, weights = items[inside], weights[inside]
+        if len(items) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+
+        cumulative = np.cumsum(weights)
+        ranks      = np.asarray(q, dtype=np.float64) * cumulative[-1]
+        positions  = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        result     = items[positions]
+
+        # The extremes are tracked exactly
+        if between is None:
+            result = np.where(np.asarray(q) <= 0, self.min, result)
+            result = np.where(np.asarray(q) >= 1, self.max, result)
+        return result if np.ndim(q) else float(result)
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def box_stats(self, label: str = "") -> dict:
+        """Matplotlib `bxp` stats: quartiles, 1.5·IQR whiskers and retained outliers."""
+        q1, med, q3 = self.quantile([0.25, 0.5, 0.75])
+        iqr   = q3 - q1
+        lo    = max(self.min, q1 - 1.5 * iqr)
+        hi    = min(self.max, q3 + 1.5 * iqr)
+        items = np.concatenate(self.compactors)
+        return {
+            "label":  label,
+            "q1":     q1,
+            "med":    med,
+            "q3":     q3,
+            "whislo": lo,
+            "whishi": hi,
+            "fliers": items[(items < lo) | (items > hi)],
+        }
+
+    def copy(self) -> "QuantileSketch":
+        return copy.deepcopy(self)
+
+
+# ==============================================================================
+# GROUPED SKETCHES  –  one sketch per group cell, merged on demand for filters
+# ==============================================================================
+
+class GroupedSketches:
+    """
+    One QuantileSketch per combination of `group_columns`. Any filter that
+    selects whole cells (e.g. experience level × remote ratio) is answered by
+    merging the matching cells – no rescan of the raw data.
+    """
+
+    def __init__(self, group_columns: list, k: int = DEFAULT_K):
+        self.group_columns = list(group_columns)
+        self.k             = k
+        self.sketches      = {}
+
+    def update(self, df: pd.DataFrame, value_column: str) -> "GroupedSketches":
+        """Add one chunk of rows; call repeatedly for chunked ingestion."""
+        for key, values in df.groupby(self.group_columns, sort=False)[value_column]:
+            key = key if isinstance(key, tuple) else (key,)
+            if key not in self.sketches:
+                self.sketches[key] = QuantileSketch(self.k, seed=len(self.sketches))
+            self.sketches[key].update(values.to_numpy())
+        return self
+
+    def merge(self, other: "GroupedSketches") -> "GroupedSketches":
+        """Fold another (e.g. per-chunk) set of sketches into this one."""
+        for key, sketch in other.sketches.items():
+            if key in self.sketches:
+                self.sketches[key].merge(sketch)
+            else:
+                self.sketches[key] = sketch.copy()
+        return self
+
+    def merged(self, **filters) -> QuantileSketch:
+        """
+        Single sketch over every cell whose keys match `filters`, given as
+        column=list_of_allowed_values. No filters → the overall distribution.
+        """
+        positions = [self.group_columns.index(column) for column in filters]
+        allowed   = [set(values) for values in filters.values()]
+
+        result = QuantileSketch(self.k)
+        for key, sketch in self.sketches.items():
+            if all(key[pos] in ok for pos, ok in zip(positions, allowed)):
+                result.merge(sketch)
+        return result
+
+
+def build_grouped_sketches(df: pd.DataFrame, value_column: str, group_columns: list, k: int = DEFAULT_K) -> GroupedSketches:
+    """Convenience wrapper for the in-memory (single chunk) case."""
+    return GroupedSketches(group_columns, k).update(df, value_column)
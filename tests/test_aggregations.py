@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregations import aggregate, factorize_columns
+
+
+@pytest.fixture
+def salaries() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n   = 2_000
+    return pd.DataFrame({
+        "experience_level": rng.choice(["EN", "MI", "SE", "EX"], n),
+        "remote_ratio":     rng.choice([0, 50, 100], n),
+        "job_title":        rng.choice(["Data Scientist", "ML Engineer", "Analyst", None], n),
+        "salary_in_usd":    rng.lognormal(11.5, 0.4, n),
+    })
+
+
+def test_matches_pandas_groupby(salaries):
+    columns = ["experience_level", "remote_ratio", "job_title"]
+    result  = aggregate(salaries, "salary_in_usd", columns)
+    for column in columns:
+        expected = salaries.groupby(column)["salary_in_usd"].agg(["count", "sum", "mean", "min", "max"])
+        pd.testing.assert_frame_equal(result[column], expected, check_dtype=False, check_names=False)
+
+
+def test_missing_category_only_leaves_that_dimension(salaries):
+    result = aggregate(salaries, "salary_in_usd", ["experience_level", "job_title"])
+    assert result["experience_level"]["count"].sum() == len(salaries)
+    assert result["job_title"]["count"].sum() == salaries["job_title"].notna().sum()
+
+
+def test_precomputed_codes_and_overall(salaries):
+    codes  = factorize_columns(salaries, ["remote_ratio"])
+    result = aggregate(salaries, "salary_in_usd", ["remote_ratio"], codes=codes)
+    assert result.overall["count"] == len(salaries)
+    assert result.overall["mean"] == pytest.approx(salaries["salary_in_usd"].mean())
+    assert result.overall["max"] == salaries["salary_in_usd"].max()
+
+
+def test_top_and_value(salaries):
+    result   = aggregate(salaries, "salary_in_usd", ["experience_level"])
+    expected = salaries.groupby("experience_level")["salary_in_usd"].mean().sort_values(ascending=False)
+    assert list(result.top("experience_level", n=2).index) == list(expected.index[:2])
+    assert result.value("experience_level", "SE") == pytest.approx(expected["SE"])
+    assert np.isnan(result.value("experience_level", "XX"))
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+import artifacts
+from artifacts import ArtifactStore, ModelBundle, SegmentModelRegistry, prune_bundles, publish_bundle, read_manifest
+
+
+def publish(root: str, model, **metadata) -> str:
+    return publish_bundle(
+        {"model": model, "model_columns": ["remote_ratio"], "title_map": {"DS": "Data Scientist"}},
+        metadata=metadata, segments={"work_year=2024": {"segment": model}}, root=root,
+    )
+
+
+def wait_for(store: ArtifactStore, condition, timeout: float = 5.0) -> None:
+    """Keep serving requests (each one polls the manifest) until `condition()` holds."""
+    deadline = time.monotonic() + timeout
+    while store.current() is not None and not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def root(tmp_path) -> str:
+    return str(tmp_path / "artifacts")
+
+
+def test_publish_writes_an_immutable_bundle(root):
+    version  = publish(root, "model-1", rows=10)
+    manifest = read_manifest(os.path.join(root, "manifest.json"))
+    assert manifest["current"] == version
+    assert manifest["history"][-1]["segments"] == ["work_year=2024"]
+
+    bundle = ModelBundle.from_version(version, root)
+    assert (bundle.model, bundle.title_map) == ("model-1", {"DS": "Data Scientist"})
+    assert bundle.metadata["rows"] == 10
+    assert bundle.segments.get("work_year=2024") == {"segment": "model-1"}
+    assert not [name for name in os.listdir(root) if name.startswith(".tmp-")]
+
+
+def test_store_swaps_to_a_newly_published_version(root):
+    publish(root, "model-1")
+    store = ArtifactStore(root, poll_interval=0)
+    old   = store.current()
+
+    new_version = publish(root, "model-2")
+    wait_for(store, lambda: store.current().version == new_version)
+    assert store.current().model == "model-2"
+    assert store.status()["swaps"] == 1
+    # A request that took the old bundle keeps a consistent view of it
+    assert old.model == "model-1"
+
+
+def test_failed_load_is_not_retried_until_the_manifest_changes(root, monkeypatch):
+    first = publish(root, "model-1")
+    store = ArtifactStore(root, poll_interval=0)
+
+    calls = []
+    def broken(version, *args, **kwargs):
+        calls.append(version)
+        raise OSError("truncated bundle")
+    monkeypatch.setattr(artifacts.ModelBundle, "from_version", broken)
+
+    publish(root, "model-2")
+    wait_for(store, lambda: store.status()["last_error"] is not None and store.status()["loading"] is None)
+    for _ in range(5):
+        store.current()
+    time.sleep(0.05)
+    assert len(calls) == 1
+    assert store.current().version == first
+
+    publish(root, "model-3")
+    wait_for(store, lambda: len(calls) == 2)
+
+
+def test_prune_keeps_the_current_and_previous_bundle(root):
+    versions = [publish(root, f"model-{n}") for n in range(5)]
+    removed  = prune_bundles(keep=1, root=root)
+    assert removed == versions[:3]
+    assert sorted(os.listdir(root)) == sorted(versions[3:] + ["manifest.json"])
+
+
+def test_segment_registry_evicts_least_recently_used(tmp_path, monkeypatch):
+    directory = tmp_path / "segments"
+    directory.mkdir()
+    for name in ["a", "b", "c"]:
+        artifacts.joblib.dump(name, directory / f"{name}.pkl")
+    monkeypatch.setattr(artifacts, "forest_nbytes", lambda model: 100)
+
+    registry = SegmentModelRegistry(str(directory), budget_bytes=250)
+    assert registry.names == ["a", "b", "c"]
+    registry.get("a"), registry.get("b"), registry.get("a"), registry.get("c")
+    stats = registry.stats()
+    assert stats["resident"] == ["a", "c"]
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
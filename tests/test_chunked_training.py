@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import mean_absolute_error, r2_score
+
+from chunked_training import (
+    StreamingMetrics,
+    allocate_trees,
+    evaluate_holdout,
+    fit_chunked,
+    holdout_mask,
+    scan_schema,
+    schema_columns,
+)
+from model_utils import EXPERIENCE_LEVELS, REMOTE_RATIOS
+
+
+@pytest.fixture
+def clean_csv(tmp_path):
+    rng = np.random.default_rng(4)
+    n   = 3_000
+    df  = pd.DataFrame({
+        "experience_level": rng.choice(EXPERIENCE_LEVELS, n),
+        "job_title":        rng.choice(["Data Analyst", "Data Scientist", "ML Engineer"], n),
+        "remote_ratio":     rng.choice(REMOTE_RATIOS, n),
+        "salary_in_usd":    rng.normal(120_000, 30_000, n),
+    })
+    path = tmp_path / "clean.csv"
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+def test_holdout_mask_is_deterministic_and_sized():
+    rows = np.arange(100_000)
+    mask = holdout_mask(rows, 0.2)
+    assert mask.mean() == pytest.approx(0.2, abs=0.01)
+    # Same rows, any chunking → same split
+    np.testing.assert_array_equal(np.concatenate([holdout_mask(part, 0.2) for part in np.array_split(rows, 7)]), mask)
+
+
+def test_allocate_trees_sums_to_n_trees():
+    trees = allocate_trees([20_000, 20_000, 20_000, 7], 100)
+    assert sum(trees) == 100
+    assert max(trees[:3]) - min(trees[:3]) <= 1
+    assert trees[3] == 0
+
+
+def test_allocate_trees_is_proportional_to_training_rows():
+    trees = allocate_trees([30_000, 10_000], 40)
+    assert trees == [30, 10]
+    assert allocate_trees([0, 0], 10) == [0, 0]
+
+
+def test_schema_columns_match_get_dummies(clean_csv):
+    path, df = clean_csv
+    schema   = scan_schema(path, chunk_rows=700)
+    expected = pd.get_dummies(df[["experience_level", "job_title", "remote_ratio"]], drop_first=True).columns
+    assert sorted(schema_columns(schema)) == sorted(expected)
+    assert schema["rows"] == len(df) and schema["chunks"] == 5
+
+
+def test_fit_chunked_grows_exactly_n_trees(clean_csv):
+    path, df = clean_csv
+    schema   = scan_schema(path, chunk_rows=1_000)
+    columns  = schema_columns(schema)
+    model    = fit_chunked(path, "salary_in_usd", columns, schema, chunk_rows=1_000, n_trees=12, log=lambda _: None)
+    assert len(model.estimators_) == 12
+
+    metrics = evaluate_holdout({"Chunked": model}, path, "salary_in_usd", columns, chunk_rows=1_000)
+    assert metrics["Chunked"].n == holdout_mask(np.arange(len(df)), 0.2).sum()
+
+
+def test_streaming_metrics_match_sklearn():
+    rng    = np.random.default_rng(5)
+    y_true = rng.normal(size=1_000)
+    y_pred = y_true + rng.normal(scale=0.3, size=1_000)
+    metrics = StreamingMetrics()
+    for part in range(0, 1_000, 300):
+        metrics.update(y_true[part:part + 300], y_pred[part:part + 300])
+    assert metrics.mae == pytest.approx(mean_absolute_error(y_true, y_pred))
+    assert metrics.r2 == pytest.approx(r2_score(y_true, y_pred))
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from disk_cache import LOW_WATER, DiskCache, cache_key, file_digest
+
+
+def entry_path(cache: DiskCache, namespace: str, key: str) -> str:
+    return os.path.join(cache.directory, namespace, key[:2], f"{key}.pkl")
+
+
+def age(cache: DiskCache, namespace: str, key: str, seconds: float) -> None:
+    """Set an entry's mtime (the LRU clock) to `seconds` after the epoch."""
+    os.utime(entry_path(cache, namespace, key), (seconds, seconds))
+
+
+@pytest.fixture
+def cache(tmp_path) -> DiskCache:
+    return DiskCache(str(tmp_path / "cache"), max_bytes=10 ** 9)
+
+
+def test_round_trip_and_counters(cache):
+    assert cache.get("pdf", cache_key("a")) is None
+    cache.put("pdf", cache_key("a"), b"report")
+    assert cache.get("pdf", cache_key("a")) == b"report"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+
+
+def test_get_or_compute_only_computes_on_a_miss(cache):
+    calls = []
+    def compute():
+        calls.append(1)
+        return {"predicted": 1.0}
+    for _ in range(3):
+        assert cache.get_or_compute("predictions", cache_key("p"), compute) == {"predicted": 1.0}
+    assert len(calls) == 1
+
+
+def test_corrupt_entry_is_dropped(cache):
+    key = cache_key("broken")
+    cache.put("pdf", key, b"x")
+    with open(entry_path(cache, "pdf", key), "wb") as f:
+        f.write(b"not a pickle")
+    assert cache.get("pdf", key, "default") == "default"
+    assert not os.path.exists(entry_path(cache, "pdf", key))
+    assert cache.stats()["errors"] == 1
+
+
+def test_sweep_evicts_least_recently_used_to_low_water(cache):
+    keys = [cache_key(n) for n in range(10)]
+    for n, key in enumerate(keys):
+        cache.put("pdf", key, b"x" * 1_000)
+        age(cache, "pdf", key, 1_000_000 + n)
+    entry_bytes = os.path.getsize(entry_path(cache, "pdf", keys[0]))
+
+    # A hit refreshes the oldest entry, so the next two oldest go first
+    assert cache.get("pdf", keys[0]) is not None
+    cache.max_bytes = entry_bytes * 8
+    removed = cache.sweep()
+
+    assert removed == 10 - int(8 * LOW_WATER)
+    survivors = [key for key in keys if os.path.exists(entry_path(cache, "pdf", key))]
+    assert keys[0] in survivors and keys[1] not in survivors and keys[-1] in survivors
+    assert cache.stats()["size_bytes"] <= cache.max_bytes * LOW_WATER
+    assert cache.stats()["evictions"] == removed
+
+
+def test_writes_trigger_a_sweep(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=20_000)
+    for n in range(60):
+        cache.put("pdf", cache_key(n), b"x" * 1_000)
+    assert cache.stats()["evictions"] > 0
+    assert cache.stats()["size_bytes"] <= cache.max_bytes
+
+
+def test_file_digest_follows_content(tmp_path):
+    path = tmp_path / "chart.png"
+    path.write_bytes(b"one")
+    first = file_digest(str(path))
+    path.write_bytes(b"two!")
+    assert file_digest(str(path)) != first
+    assert file_digest(str(tmp_path / "missing.png")) == file_digest(str(tmp_path / "missing.png"))
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from model_utils import (
+    CONTRIBUTION_PREFIX,
+    EXPERIENCE_LEVELS,
+    REMOTE_RATIOS,
+    build_prediction_table,
+    encode_profiles,
+    explain_profiles,
+    predict_profiles,
+    split_contributions,
+)
+
+TITLES = ["Data Analyst", "Data Engineer", "Data Scientist", "ML Engineer"]
+
+
+@pytest.fixture(scope="module")
+def trained():
+    rng = np.random.default_rng(3)
+    n   = 1_500
+    profiles = pd.DataFrame({
+        "experience_level": rng.choice(EXPERIENCE_LEVELS, n),
+        "job_title":        rng.choice(TITLES, n),
+        "remote_ratio":     rng.choice(REMOTE_RATIOS, n),
+    })
+    salary = (
+        60_000
+        + 30_000 * profiles["experience_level"].map({"EN": 0, "MI": 1, "SE": 2, "EX": 3})
+        + 15_000 * (profiles["job_title"] == "ML Engineer")
+        + rng.normal(0, 10_000, n)
+    )
+    model_columns = list(pd.get_dummies(profiles, columns=["experience_level", "job_title"], drop_first=True).columns)
+    model = RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0)
+    model.fit(encode_profiles(profiles, model_columns), salary)
+    return model, model_columns, profiles
+
+
+def test_contributions_add_up_to_the_prediction(trained):
+    model, model_columns, profiles = trained
+    X = encode_profiles(profiles.head(200), model_columns)
+    baseline, contributions = explain_profiles(model, X, batch_rows=64)
+
+    assert set(contributions.columns) == {f"{CONTRIBUTION_PREFIX}{name}" for name in ["experience_level", "job_title", "remote_ratio"]}
+    assert contributions.index.equals(X.index)
+    np.testing.assert_allclose(baseline + contributions.sum(axis=1), model.predict(X), rtol=1e-9)
+
+
+def test_split_contributions_recovers_the_baseline(trained):
+    model, model_columns, profiles = trained
+    prediction = predict_profiles(model, model_columns, profiles.head(1)).iloc[0].to_dict()
+    baseline, contributions = split_contributions(prediction)
+    expected, _ = explain_profiles(model, encode_profiles(profiles.head(1), model_columns))
+
+    assert baseline == pytest.approx(expected)
+    assert set(contributions) == {"experience_level", "job_title", "remote_ratio"}
+    assert split_contributions({"predicted": 1.0}) == (None, {})
+
+
+def test_table_lookup_matches_the_live_forest(trained):
+    model, model_columns, profiles = trained
+    table = build_prediction_table(model, model_columns, job_titles=TITLES)
+    sample = profiles.drop_duplicates().head(12)
+
+    looked_up = predict_profiles(model, model_columns, sample, table=table)
+    live      = predict_profiles(model, model_columns, sample)
+    pd.testing.assert_frame_equal(looked_up, live, rtol=1e-4)
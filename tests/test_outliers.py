@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from outliers import MAD_SCALE, fences_from_sketches, fit_fences, fit_fences_chunked
+from sketches import GroupedSketches
+
+
+@pytest.fixture
+def salaries() -> pd.DataFrame:
+    rng    = np.random.default_rng(6)
+    groups = [("SE", "Data Scientist", 4_000, 150_000), ("EN", "Data Scientist", 3_000, 80_000),
+              ("SE", "ML Engineer", 2_000, 170_000), ("SE", "Rare Title", 10, 400_000)]
+    frames = [
+        pd.DataFrame({"experience_level": level, "job_title": title, "salary_in_usd": rng.normal(centre, centre / 5, n)})
+        for level, title, n, centre in groups
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_iqr_fences_per_group(salaries):
+    fences = fit_fences(salaries)
+    values = salaries.loc[salaries["job_title"] == "ML Engineer", "salary_in_usd"]
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    lower, upper, basis = fences.table.loc[("SE", "ML Engineer")]
+    assert (lower, upper) == pytest.approx((q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)))
+    assert basis == "experience_level × job_title"
+
+
+def test_mad_fences_per_group(salaries):
+    fences = fit_fences(salaries, method="mad", factor=3.0)
+    values = salaries.loc[salaries["experience_level"] == "EN", "salary_in_usd"].to_numpy()
+    median = np.median(values)
+    spread = MAD_SCALE * np.median(np.abs(values - median))
+    assert tuple(fences.table.loc[("EN", "Data Scientist"), ["lower", "upper"]]) == pytest.approx(
+        (median - 3.0 * spread, median + 3.0 * spread)
+    )
+
+
+def test_small_groups_fall_back_to_the_coarser_level(salaries):
+    fences = fit_fences(salaries)
+    senior = salaries.loc[salaries["experience_level"] == "SE", "salary_in_usd"]
+    q1, q3 = np.quantile(senior, [0.25, 0.75])
+    lower, upper, basis = fences.table.loc[("SE", "Rare Title")]
+    assert basis == "experience_level"
+    assert lower == pytest.approx(q1 - 1.5 * (q3 - q1))
+
+
+def test_unseen_and_missing_groups_use_the_whole_column(salaries):
+    fences = fit_fences(salaries)
+    probe  = pd.DataFrame({"experience_level": ["MI", None], "job_title": ["Data Scientist", "Data Scientist"]})
+    lower, upper = fences.bounds(probe)
+    assert (lower[0], upper[0]) == fences.default
+    assert (lower[1], upper[1]) == fences.default
+
+    with_missing = salaries.assign(job_title=salaries["job_title"].where(salaries.index % 50 != 0))
+    table = fit_fences(with_missing).table
+    assert not table.index.to_frame()["job_title"].isna().any()
+
+
+@pytest.mark.parametrize("method", ["iqr", "mad"])
+def test_fences_from_sketches_match_fit_fences(salaries, method):
+    exact    = fit_fences(salaries, method=method)
+    sketched = fit_fences_chunked((salaries.iloc[start:start + 1_000] for start in range(0, len(salaries), 1_000)), method=method)
+
+    table = sketched.table.loc[exact.table.index]
+    assert list(table["basis"]) == list(exact.table["basis"])
+    np.testing.assert_allclose(table[["lower", "upper"]], exact.table[["lower", "upper"]], rtol=0.03)
+    assert sketched.default == pytest.approx(exact.default, rel=0.03)
+
+
+def test_keep_and_report(salaries):
+    outlier = pd.DataFrame({"experience_level": ["SE"], "job_title": ["ML Engineer"], "salary_in_usd": [5_000_000.0]})
+    df      = pd.concat([salaries, outlier], ignore_index=True)
+    fences  = fences_from_sketches(GroupedSketches(["experience_level", "job_title"]).update(df, "salary_in_usd"))
+    keep    = fences.keep(df)
+    assert not keep[-1]
+
+    report = fences.report(df, keep)
+    assert report["rows"].sum() == len(df)
+    assert report.loc[("SE", "ML Engineer"), "removed"] >= 1
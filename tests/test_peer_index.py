@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from peer_index import MIN_PEERS, PeerIndex
+
+
+@pytest.fixture
+def records() -> pd.DataFrame:
+    rng  = np.random.default_rng(7)
+    rows = (
+        [("SE", "Data Scientist", 100)] * 60
+        + [("SE", "Data Scientist", 0)] * 5
+        + [("SE", "Rare Title", 0)] * 3
+        + [("EN", "Data Analyst", 0)] * 40
+        + [(None, "Data Scientist", 100)] * 10
+    )
+    df = pd.DataFrame(rows, columns=["experience_level", "job_title", "remote_ratio"])
+    df["salary_in_usd"] = rng.normal(120_000, 25_000, len(df)).round()
+    return df
+
+
+def test_finest_level_with_enough_peers(records):
+    peers  = PeerIndex(records).lookup({"experience_level": "SE", "job_title": "Data Scientist", "remote_ratio": 100})
+    expect = records.loc[(records["experience_level"] == "SE") & (records["job_title"] == "Data Scientist")
+                         & (records["remote_ratio"] == 100), "salary_in_usd"]
+    assert peers["level"] == "Same level, title & arrangement"
+    assert peers["count"] == len(expect) == 60
+    assert peers["percentiles"][50] == pytest.approx(expect.median())
+    assert peers["percentiles"][90] == pytest.approx(np.percentile(expect, 90))
+
+
+def test_falls_back_below_min_peers(records):
+    index = PeerIndex(records)
+    # 5 on-site senior data scientists < MIN_PEERS → same level & title (65 rows)
+    assert MIN_PEERS > 5
+    peers = index.lookup({"experience_level": "SE", "job_title": "Data Scientist", "remote_ratio": 0})
+    assert peers["level"] == "Same level & title" and peers["count"] == 65
+
+    # 3 rows of a rare title, same title only has those 3 → same level
+    peers = index.lookup({"experience_level": "SE", "job_title": "Rare Title", "remote_ratio": 0})
+    assert peers["level"] == "Same level" and peers["count"] == 68
+
+
+def test_largest_group_when_none_reaches_min_peers(records):
+    peers = PeerIndex(records).lookup({"experience_level": "SE", "job_title": "Rare Title", "remote_ratio": 0}, min_peers=1_000)
+    assert peers["level"] == "Same level" and peers["count"] == 68
+
+
+def test_missing_group_values_only_leave_their_own_levels(records):
+    index = PeerIndex(records)
+    # Rows without an experience level still count for "Same title" ...
+    peers = index.lookup({"experience_level": "XX", "job_title": "Data Scientist", "remote_ratio": 100})
+    assert peers["level"] == "Same title" and peers["count"] == 75
+    # ... but never form a group of their own
+    peers = index.lookup({"experience_level": None, "job_title": "Nope", "remote_ratio": 100})
+    assert peers is None
+    assert index.lookup({"experience_level": "XX", "job_title": "Nope", "remote_ratio": 50}) is None
+
+
+def test_sample_rows_are_spread_over_the_group(records):
+    peers  = PeerIndex(records).lookup({"experience_level": "EN", "job_title": "Data Analyst", "remote_ratio": 0}, sample_size=5)
+    sample = peers["sample"]["salary_in_usd"]
+    assert len(sample) == 5 and sample.is_monotonic_increasing
+    assert sample.iloc[0] == records.loc[records["job_title"] == "Data Analyst", "salary_in_usd"].min()
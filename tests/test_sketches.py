@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sketches import GroupedSketches, QuantileSketch
+
+QUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def rank_error(sketch: QuantileSketch, values: np.ndarray) -> float:
+    """Largest |rank(estimate) − q·n| / n over QUANTILES."""
+    ordered   = np.sort(values)
+    estimates = sketch.quantile(QUANTILES)
+    ranks     = np.searchsorted(ordered, estimates, side="right")
+    return float(np.max(np.abs(ranks - QUANTILES * len(values))) / len(values))
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    return np.random.default_rng(1).lognormal(11.5, 0.5, 50_000)
+
+
+def test_rank_error_is_bounded(values):
+    sketch = QuantileSketch(k=200)
+    for chunk in np.array_split(values, 25):
+        sketch.update(chunk)
+    assert sketch.n == len(values)
+    assert rank_error(sketch, values) < 0.02
+    assert sum(len(c) for c in sketch.compactors) < len(values) / 10
+
+
+def test_extremes_are_exact(values):
+    sketch = QuantileSketch().update(values)
+    assert sketch.quantile(0.0) == values.min()
+    assert sketch.quantile(1.0) == values.max()
+
+
+def test_merge_matches_one_sketch(values):
+    left, right = QuantileSketch(seed=1), QuantileSketch(seed=2)
+    left.update(values[:20_000])
+    right.update(values[20_000:])
+    merged = left.copy().merge(right)
+
+    assert merged.n == len(values)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+    assert rank_error(merged, values) < 0.02
+    # merge works in place on a copy; the source sketches are unchanged
+    assert left.n == 20_000
+
+
+def test_between_restricts_the_range(values):
+    sketch = QuantileSketch().update(values)
+    lo, hi = np.quantile(values, [0.25, 0.75])
+    inside = values[(values >= lo) & (values <= hi)]
+    assert sketch.quantile(0.5, between=(lo, hi)) == pytest.approx(np.median(inside), rel=0.02)
+    assert np.isnan(sketch.quantile(0.5, between=(-2, -1)))
+
+
+def test_grouped_sketches_merge_the_filtered_cells():
+    rng = np.random.default_rng(2)
+    df  = pd.DataFrame({
+        "experience_level": rng.choice(["EN", "SE"], 10_000),
+        "remote_ratio":     rng.choice([0, 100], 10_000),
+        "salary_in_usd":    rng.normal(100_000, 20_000, 10_000),
+    })
+    grouped = GroupedSketches(["experience_level", "remote_ratio"])
+    for start in range(0, len(df), 2_500):
+        grouped.update(df.iloc[start:start + 2_500], "salary_in_usd")
+
+    subset = grouped.merged(experience_level=["SE"])
+    assert subset.n == (df["experience_level"] == "SE").sum()
+    expected = df.loc[df["experience_level"] == "SE", "salary_in_usd"].median()
+    assert subset.median() == pytest.approx(expected, rel=0.02)
+    assert grouped.merged().n == len(df)
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from title_search import TitleSearchIndex
+
+
+@pytest.fixture
+def index() -> TitleSearchIndex:
+    return TitleSearchIndex(pd.Series({
+        "Data Scientist":            900,
+        "Data Engineer":             700,
+        "Machine Learning Engineer": 500,
+        "Data Analyst":              400,
+        "Senior Data Scientist":     50,
+        "Research Scientist":        30,
+    }))
+
+
+def test_empty_query_returns_the_most_common_titles(index):
+    assert index.search("", limit=2) == ["Data Scientist", "Data Engineer"]
+
+
+def test_prefix_matches_are_ranked_by_record_count(index):
+    assert index.search("data", limit=3) == ["Data Scientist", "Data Engineer", "Data Analyst"]
+
+
+def test_prefix_matches_any_word(index):
+    # "Scientist" starts a word of three titles, most common first
+    assert index.search("scien") == ["Data Scientist", "Senior Data Scientist", "Research Scientist"]
+    assert index.search("learning") == ["Machine Learning Engineer"]
+
+
+def test_fuzzy_matches_fill_the_remaining_slots(index):
+    results = index.search("enginer")
+    assert results[:2] == ["Data Engineer", "Machine Learning Engineer"]
+
+
+def test_normalises_case_and_punctuation(index):
+    assert index.search("  DATA-sci ") == index.search("data sci")
+    assert index.search("nothing like it", min_score=0.9) == []
@@ -0,0 +1,135 @@
+
+import json
+import os
+import re
+
+import pandas as pd
+
+
+# ==============================================================================
+# JOB-TITLE CANONICALISATION
+# ==============================================================================
+#
+# raw title ──normalise──▶ alias map ──▶ rare-title clustering ──▶ canonical
+#
+# The resulting raw → canonical map is written by 1_data_prep_and_eda.py and
+# applied by both 2_model_training.py and the app's predictor, so the one-hot
+# job_title block only has one column per canonical title.
+
+TITLE_MAP_PATH     = "title_map.json"
+TITLE_ALIASES_PATH = "title_aliases.json"   # optional user overrides
+
+MIN_TITLE_COUNT    = 20     # titles rarer than this are clustered
+MIN_SIMILARITY     = 0.5    # token Jaccard needed to join a frequent title
+OTHER_TITLE        = "Other"
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+ABBREVIATIONS = {
+    "sr":   "senior",
+    "jr":   "junior",
+    "mgr":  "manager",
+    "eng":  "engineer",
+    "engr": "engineer",
+    "dev":  "developer",
+    "ml":   "machine learning",
+    "bi":   "business intelligence",
+}
+
+# Normalised title → canonical display title
+TITLE_ALIASES = {
+    "ai developer":                      "AI Engineer",
+    "ai programmer":                     "AI Engineer",
+    "ai software development engineer":  "AI Engineer",
+    "ai software engineer":              "AI Engineer",
+    "machine learning developer":        "Machine Learning Engineer",
+    "machine learning software engineer":"Machine Learning Engineer",
+    "data science engineer":             "Data Scientist",
+    "data science practitioner":         "Data Scientist",
+    "data analytics specialist":         "Data Analyst",
+    "data analytics engineer":           "Analytics Engineer",
+}
+
+
+def normalize_title(title: str) -> str:
+    """Lower-case, strip punctuation and expand common abbreviations."""
+    words = _NON_ALNUM.sub(" ", title.lower()).split()
+    return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+
+def load_aliases(path: str = TITLE_ALIASES_PATH) -> dict:
+    """Built-in aliases, extended / overridden by an optional JSON file."""
+    aliases = dict(TITLE_ALIASES)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            aliases.update({normalize_title(k): v for k, v in json.load(f).items()})
+    return aliases
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def build_title_map(
+    title_counts: pd.Series,
+    aliases: dict = None,
+    min_count: int = MIN_TITLE_COUNT,
+    min_similarity: float = MIN_SIMILARITY,
+) -> dict:
+    """
+    Map every raw title in `title_counts` (title → record count) to a canonical
+    title. Titles that share a normalised form or alias are merged; groups that
+    remain rarer than `min_count` join the most similar frequent group, or
+    OTHER_TITLE when nothing is similar enough.
+    """
+    aliases = TITLE_ALIASES if aliases is None else aliases
+
+    # 1. Normalisation + aliases: each group is keyed by its normalised name
+    alias_display = {normalize_title(canonical): canonical for canonical in aliases.values()}
+    by_count      = title_counts.sort_values(ascending=False).index
+
+    group_of = {}
+    for raw in by_count:
+        key = normalize_title(raw)
+        group_of[raw] = normalize_title(aliases.get(key, key))
+    groups = pd.Series(title_counts).groupby(pd.Series(group_of)).sum()
+
+    # Alias targets keep their configured spelling, other groups their most common one
+    display = {}
+    for raw in by_count:
+        display.setdefault(group_of[raw], alias_display.get(group_of[raw], raw))
+
+    # 2. Cluster rare groups into the most similar frequent one
+    frequent = {g: set(g.split()) for g in groups.index if groups[g] >= min_count}
+    target   = {}
+    for group, count in groups.items():
+        if count >= min_count:
+            target[group] = display[group]
+            continue
+        tokens = set(group.split())
+        best, best_score = None, 0.0
+        for candidate, candidate_tokens in frequent.items():
+            score = _jaccard(tokens, candidate_tokens)
+            if score > best_score:
+                best, best_score = candidate, score
+        target[group] = display[best] if best is not None and best_score >= min_similarity else OTHER_TITLE
+
+    return {raw: target[group] for raw, group in group_of.items()}
+
+
+def canonicalize(titles: pd.Series, title_map: dict) -> pd.Series:
+    """Apply a title map; titles missing from it are kept unchanged."""
+    return titles.map(title_map).fillna(titles)
+
+
+def save_title_map(title_map: dict, path: str = TITLE_MAP_PATH) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(title_map, f, indent=2, sort_keys=True)
+
+
+def load_title_map(path: str = TITLE_MAP_PATH) -> dict:
+    """Raw → canonical map written by 1_data_prep_and_eda.py ({} if it does not exist)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,88 @@
+
+import bisect
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# ==============================================================================
+# JOB-TITLE TYPEAHEAD INDEX
+# ==============================================================================
+#
+# Built once from the dataset. A query is answered with
+#   1. prefix matches on the full title or on any word in it (two bisects over
+#      a sorted key list), ranked by record count, then
+#   2. if that leaves room, fuzzy matches scored by trigram overlap
+#      (posting lists accumulated with one bincount), ranked by score × count.
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _normalise(text: str) -> str:
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleSearchIndex:
+    """Prefix + fuzzy search over job titles, ranked by how many records use each title."""
+
+    def __init__(self, title_counts: pd.Series):
+        ranked       = title_counts.sort_values(ascending=False, kind="stable")
+        self.titles  = ranked.index.tolist()
+        self.counts  = ranked.to_numpy(dtype=np.int64)
+
+        # Prefix keys: the whole normalised title plus every word suffix of it
+        keys = []
+        for title_id, title in enumerate(self.titles):
+            words = _normalise(title).split()
+            for start in range(len(words)):
+                keys.append((" ".join(words[start:]), title_id))
+        keys.sort()
+        self._keys     = [key for key, _ in keys]
+        self._key_ids  = np.array([title_id for _, title_id in keys], dtype=np.int64)
+
+        # Trigram → title ids posting lists for fuzzy matching
+        postings = {}
+        for title_id, title in enumerate(self.titles):
+            for gram in _trigrams(_normalise(title)):
+                postings.setdefault(gram, []).append(title_id)
+        self._postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def _prefix_ids(self, query: str) -> np.ndarray:
+        lo = bisect.bisect_left(self._keys, query)
+        hi = bisect.bisect_left(self._keys, query + "\uffff")
+        # Lower id == higher record count, so unique() also ranks the hits
+        return np.unique(self._key_ids[lo:hi])
+
+    def _fuzzy_ids(self, query: str, min_score: float) -> np.ndarray:
+        grams = [self._postings[g] for g in _trigrams(query) if g in self._postings]
+        if not grams:
+            return np.empty(0, dtype=np.int64)
+        overlap = np.bincount(np.concatenate(grams), minlength=len(self.titles))
+        score   = overlap / len(_trigrams(query))
+        ids     = np.flatnonzero(score >= min_score)
+        return ids[np.argsort(-(score[ids] * np.log1p(self.counts[ids])), kind="stable")]
+
+    def search(self, query: str, limit: int = 30, min_score: float = 0.35) -> list:
+        """Return up to `limit` titles for `query`; the most common titles if it is empty."""
+        query = _normalise(query)
+        if not query:
+            return self.titles[:limit]
+
+        ids = self._prefix_ids(query)[:limit].tolist()
+        if len(ids) < limit:
+            seen = set(ids)
+            for title_id in self._fuzzy_ids(query, min_score):
+                if title_id not in seen:
+                    ids.append(int(title_id))
+                    if len(ids) == limit:
+                        break
+        return [self.titles[title_id] for title_id in ids]